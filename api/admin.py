@@ -12,7 +12,7 @@ class PersonAdmin(admin.ModelAdmin):
     list_display = ["id", "first_name", "last_name", "email", "created_at"]
     list_filter = ["created_at"]
     search_fields = ["first_name", "last_name", "email"]
-    readonly_fields = ["id", "created_at"]
+    readonly_fields = ["id", "created_at", "updated_at"]
 
 
 @admin.register(Product)
@@ -20,5 +20,5 @@ class ProductAdmin(admin.ModelAdmin):
     list_display = ["id", "name", "sku", "price", "owner", "created_at"]
     list_filter = ["created_at", "owner"]
     search_fields = ["name", "sku"]
-    readonly_fields = ["id", "created_at"]
+    readonly_fields = ["id", "created_at", "updated_at"]
     autocomplete_fields = ["owner"]
@@ -0,0 +1,223 @@
+"""
+Bulk write services for the API app.
+"""
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .cache import bump_model_version, get_object_cache
+from .models import Person, Product
+from .serializers import PersonBulkSerializer, ProductBulkSerializer
+
+
+class Conflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A concurrent write conflicted with this batch; retry the request."
+    default_code = "conflict"
+
+
+class BulkCreate:
+    """
+    Validate and insert a batch of rows with a constant number of queries.
+
+    Every row is validated on its own with ``serializer_class`` (minus its per-row
+    uniqueness queries), then uniqueness of ``unique_field`` is checked for the whole
+    batch with one ``IN`` query and the surviving rows are inserted with batched
+    ``bulk_create`` in a single transaction. Invalid rows are reported by index and
+    never fail the rest of the batch.
+    """
+
+    model = None
+    serializer_class = None
+    unique_field = None
+    unique_message = None
+
+    def __init__(self, rows, context=None):
+        self.rows = rows
+        self.context = context or {}
+        self.errors = {}
+
+    def validate(self):
+        """Return ``{index: validated_data}`` for the rows that passed every check."""
+        if not isinstance(self.rows, list):
+            raise ValidationError({"non_field_errors": ["Expected a list of objects."]})
+        if not self.rows:
+            raise ValidationError({"non_field_errors": ["Expected at least one object."]})
+        if len(self.rows) > settings.API_BULK_MAX_ROWS:
+            raise ValidationError(
+                {
+                    "non_field_errors": [
+                        f"A bulk request accepts at most {settings.API_BULK_MAX_ROWS} objects."
+                    ]
+                }
+            )
+
+        valid = {}
+        for index, row in enumerate(self.rows):
+            serializer = self.serializer_class(data=row, context=self.context)
+            if serializer.is_valid():
+                valid[index] = dict(serializer.validated_data)
+            else:
+                self.errors[index] = serializer.errors
+        self.check_unique(valid)
+        self.resolve_relations(valid)
+        return valid
+
+    def reject(self, valid, index, field, message):
+        """Move row ``index`` from ``valid`` to the error report."""
+        valid.pop(index, None)
+        self.errors.setdefault(index, {}).setdefault(field, []).append(message)
+
+    def check_batch_duplicates(self, valid):
+        """Reject repeated ``unique_field`` values; return ``{value: index}`` of the rest."""
+        seen = {}
+        for index, data in list(valid.items()):
+            value = data[self.unique_field]
+            if value in seen:
+                self.reject(
+                    valid,
+                    index,
+                    self.unique_field,
+                    f"Duplicates the value of row {seen[value]} in this request.",
+                )
+            else:
+                seen[value] = index
+        return seen
+
+    def check_unique(self, valid):
+        seen = self.check_batch_duplicates(valid)
+        existing = self.model.objects.filter(**{f"{self.unique_field}__in": list(seen)})
+        for value in existing.values_list(self.unique_field, flat=True):
+            self.reject(valid, seen[value], self.unique_field, self.unique_message)
+
+    def resolve_relations(self, valid):
+        """Hook for subclasses to check foreign keys of the valid rows in bulk."""
+
+    def get_error_report(self):
+        return [{"index": index, "errors": self.errors[index]} for index in sorted(self.errors)]
+
+    def save(self):
+        """Insert the valid rows and return ``(response data, status code)``."""
+        valid = self.validate()
+        objs = [self.model(**data) for data in valid.values()]
+        if objs:
+            try:
+                with transaction.atomic():
+                    self.model.objects.bulk_create(objs, batch_size=settings.API_BULK_BATCH_SIZE)
+            except IntegrityError:
+                raise Conflict() from None
+            # bulk_create does not send post_save, so invalidate cached data here.
+            bump_model_version(self.model)
+
+        data = {
+            "created": len(objs),
+            "failed": len(self.errors),
+            "results": [
+                {"index": index, "id": str(obj.pk)} for index, obj in zip(valid, objs, strict=True)
+            ],
+            "errors": self.get_error_report(),
+        }
+        if not objs:
+            return data, status.HTTP_400_BAD_REQUEST
+        if self.errors:
+            return data, status.HTTP_207_MULTI_STATUS
+        return data, status.HTTP_201_CREATED
+
+
+class PersonBulkCreate(BulkCreate):
+    model = Person
+    serializer_class = PersonBulkSerializer
+    unique_field = "email"
+    unique_message = "person with this email already exists."
+
+
+class ProductBulkCreate(BulkCreate):
+    model = Product
+    serializer_class = ProductBulkSerializer
+    unique_field = "sku"
+    unique_message = "A product with this SKU already exists."
+
+    def resolve_relations(self, valid):
+        """Check every referenced owner with a single ``IN`` query."""
+        owner_ids = {data["owner_id"] for data in valid.values() if data.get("owner_id")}
+        if not owner_ids:
+            return
+        found = set(Person.objects.filter(id__in=owner_ids).values_list("id", flat=True))
+        for index, data in list(valid.items()):
+            if data.get("owner_id") and data["owner_id"] not in found:
+                self.reject(valid, index, "owner_id", "Person with this ID does not exist.")
+
+
+class ProductUpsert(ProductBulkCreate):
+    """
+    Insert-or-update products keyed on their unique SKU.
+
+    Each chunk of ``API_BULK_BATCH_SIZE`` rows costs one ``SELECT ... FOR UPDATE`` (to
+    tell inserts from updates) and one ``INSERT ... ON CONFLICT (sku) DO UPDATE`` per
+    owner mode, and replaying a request leaves the table unchanged apart from
+    ``updated_at``. ``created_at`` of existing rows is preserved, and rows that omit
+    ``owner_id`` keep their current owner.
+    """
+
+    update_fields = ["name", "price", "updated_at"]
+
+    def check_unique(self, valid):
+        # Existing SKUs are expected; only a SKU repeated within the request is ambiguous.
+        self.check_batch_duplicates(valid)
+
+    def save(self):
+        valid = self.validate()
+        rows = list(valid.values())
+        inserted = updated = 0
+        updated_ids = []
+        if rows:
+            batch_size = settings.API_BULK_BATCH_SIZE
+            try:
+                with transaction.atomic():
+                    for start in range(0, len(rows), batch_size):
+                        chunk = rows[start : start + batch_size]
+                        existing = self.lock_existing(data["sku"] for data in chunk)
+                        updated_ids += existing.values()
+                        updated += sum(1 for data in chunk if data["sku"] in existing)
+                        inserted += sum(1 for data in chunk if data["sku"] not in existing)
+                        self.upsert(
+                            [data for data in chunk if "owner_id" in data],
+                            self.update_fields + ["owner"],
+                        )
+                        self.upsert(
+                            [data for data in chunk if "owner_id" not in data],
+                            self.update_fields,
+                        )
+            except IntegrityError:
+                raise Conflict() from None
+            bump_model_version(self.model)
+            get_object_cache(self.model).invalidate(*updated_ids)
+
+        data = {
+            "inserted": inserted,
+            "updated": updated,
+            "failed": len(self.errors),
+            "errors": self.get_error_report(),
+        }
+        if not rows:
+            return data, status.HTTP_400_BAD_REQUEST
+        if self.errors:
+            return data, status.HTTP_207_MULTI_STATUS
+        return data, status.HTTP_200_OK
+
+    def lock_existing(self, skus):
+        """Return ``{sku: id}`` of the ``skus`` already stored, locking those rows."""
+        queryset = self.model.objects.select_for_update().filter(sku__in=list(skus))
+        return dict(queryset.order_by().values_list("sku", "id"))
+
+    def upsert(self, rows, update_fields):
+        if not rows:
+            return
+        self.model.objects.bulk_create(
+            [self.model(**data) for data in rows],
+            update_conflicts=True,
+            unique_fields=["sku"],
+            update_fields=update_fields,
+        )
@@ -0,0 +1,395 @@
+"""
+Cache helpers for the API app.
+"""
+
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from urllib import parse
+
+from django.conf import settings
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.filebased import FileBasedCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from health.metrics import (
+    api_coalesced_requests_total,
+    api_object_cache_evictions_total,
+    api_object_cache_requests_total,
+)
+
+VERSION_KEY = "api:version:{label}"
+
+
+def get_model_version(model):
+    """
+    Return the current data version of ``model``.
+
+    Versions are bumped on every write (see ``api.signals``), so any cache key that
+    embeds the version is implicitly invalidated by the next write. A missing version is
+    seeded from the clock so that an evicted counter never falls back to a value that
+    older keys were built with.
+    """
+    key = VERSION_KEY.format(label=model._meta.label_lower)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        version = cache.get(key, 0)
+    return version
+
+
+def bump_model_version(*models):
+    """Invalidate every cached value derived from ``models``."""
+    for model in models:
+        key = VERSION_KEY.format(label=model._meta.label_lower)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def normalize_query_params(query_params, ignore=(), keep_empty=False):
+    """
+    Return a stable digest of ``query_params``.
+
+    Parameter order does not change the result, so ``?b=2&a=1`` and ``?a=1&b=2`` map to
+    the same cache entry. The values of a repeated parameter keep their request order:
+    ``query_params.get()`` reads the last one, so ``?a=1&a=2`` and ``?a=2&a=1`` are
+    different requests. A parameter whose values are all empty is dropped (``?c=``
+    filters nothing) unless ``keep_empty=True``, for when a bare parameter matters
+    (``?cursor=`` switches to keyset pagination).
+    """
+    items = []
+    # Sorted by name only; sorted() is stable, so each name's values stay in order.
+    for key, values in sorted(query_params.lists(), key=lambda item: item[0]):
+        if key in ignore or not (keep_empty or any(values)):
+            continue
+        items.extend((key, value) for value in values)
+    normalized = parse.urlencode(items)
+    return hashlib.md5(normalized.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+
+class _Call:
+    """One in-flight computation and the callers waiting for it."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.ok = False
+        self.result = None
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent identical computations (single-flight).
+
+    Within a process, callers asking for a ``key`` that is already being computed
+    wait for that computation and share its result instead of running their own.
+    Across processes, the caller computing ``key`` holds a short ``cache.add`` lock;
+    callers in other workers see it and poll ``read()`` (the shared cache entry the
+    computation fills) instead of computing. A waiter that times out, or whose leader
+    failed, computes on its own: failures can be request-specific (a 304, a 404 that
+    a retry may not hit), so they are never shared.
+
+    The cross-process lock needs an ``add`` that is atomic and shared by every worker
+    (Redis, Memcached). ``FileBasedCache.add`` checks then writes, so two workers can
+    both take the lock, and ``LocMemCache`` is private to each process; with those
+    backends (the ones ``CACHE_BACKEND`` offers) only the in-process coalescing applies.
+    """
+
+    lock_template = "{key}:flight"
+    # Seconds between two reads of the shared cache while another worker computes.
+    poll_interval = 0.02
+    # Backends without an atomic, cross-process add (see above).
+    local_lock_backends = (FileBasedCache, LocMemCache)
+
+    def __init__(self, name):
+        self.name = name
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, compute, read):
+        """Return ``compute()`` for ``key``, or the result of an identical call in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+        if not leader:
+            if call.done.wait(settings.API_COALESCE_TIMEOUT) and call.ok:
+                api_coalesced_requests_total.labels(self.name, "process").inc()
+                return call.result
+            return compute()
+        try:
+            if self.uses_shared_lock():
+                call.result = self.run(key, compute, read)
+            else:
+                call.result = compute()
+            call.ok = True
+            return call.result
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def uses_shared_lock(self):
+        """Return whether the cache backend can coordinate workers with ``add``."""
+        return not isinstance(caches[DEFAULT_CACHE_ALIAS], self.local_lock_backends)
+
+    def run(self, key, compute, read):
+        lock = self.lock_template.format(key=key)
+        timeout = settings.API_COALESCE_TIMEOUT
+        if not cache.add(lock, 1, timeout):
+            deadline = time.monotonic() + timeout
+            while time.monotonic() < deadline:
+                time.sleep(self.poll_interval)
+                value = read()
+                if value is not None:
+                    api_coalesced_requests_total.labels(self.name, "shared").inc()
+                    return value
+                if cache.get(lock) is None:
+                    break
+            return compute()
+        try:
+            return compute()
+        finally:
+            cache.delete(lock)
+
+
+class ResponseCache:
+    """
+    Cache of computed response data, versioned by the models it is derived from.
+
+    Keys embed the current version of every model in ``models``, so a write to any of
+    them (see ``api.signals``) invalidates the entry immediately. The TTL only bounds
+    staleness from writes that skip the signals (``bulk_create``, raw SQL).
+
+    Entries stay fresh for ``ttl`` seconds and are then kept ``stale_ttl`` seconds
+    longer: the first request to find an expired entry recomputes it while concurrent
+    requests keep being served the stale copy (stale-while-revalidate). Concurrent
+    misses for the same key are coalesced into one computation (``SingleFlight``).
+    """
+
+    key_template = "api:response:{resource}:{versions}:{request}"
+    flight = SingleFlight("list")
+
+    def __init__(self, resource, models, ttl, stale_ttl):
+        self.resource = resource
+        self.models = models
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+
+    def get_key(self, request):
+        """Return the cache key of ``request``: absolute path plus normalized parameters."""
+        location = request.build_absolute_uri(request.path)
+        params = normalize_query_params(request.query_params, keep_empty=True)
+        digest = hashlib.md5(f"{location}?{params}".encode(), usedforsecurity=False)
+        return self.key_template.format(
+            resource=self.resource,
+            versions=".".join(str(get_model_version(model)) for model in self.models),
+            request=digest.hexdigest(),
+        )
+
+    def fetch(self, request, compute):
+        """
+        Return ``(data, result)`` for ``request``, calling ``compute()`` when needed.
+
+        ``result`` is ``"hit"`` (fresh entry), ``"stale"`` (expired entry served while
+        another request refreshes it), ``"revalidate"`` (expired entry recomputed by
+        this request) or ``"miss"`` (no entry). Exceptions from ``compute`` propagate
+        and are not cached.
+        """
+        key = self.get_key(request)
+        entry = cache.get(key)
+        if entry is None:
+            data = self.flight.do(key, lambda: self.fill(key, compute), lambda: self.read(key))
+            return data, "miss"
+        fresh_until, data = entry
+        if time.time() < fresh_until:
+            return data, "hit"
+        if not cache.add(f"{key}:lock", 1, self.ttl):
+            return data, "stale"
+        try:
+            return self.fill(key, compute), "revalidate"
+        finally:
+            cache.delete(f"{key}:lock")
+
+    def fill(self, key, compute):
+        data = compute()
+        cache.set(key, (time.time() + self.ttl, data), self.ttl + self.stale_ttl)
+        return data
+
+    def read(self, key):
+        entry = cache.get(key)
+        return None if entry is None else entry[1]
+
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU mapping whose entries expire."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if time.monotonic() >= expires:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl, maxsize):
+        """Store ``value`` and return how many entries were evicted to make room."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > maxsize:
+                self._entries.popitem(last=False)
+                evicted += 1
+            return evicted
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class ObjectCache:
+    """
+    Two-tier read-through cache of ``model`` instances keyed by primary key.
+
+    Lookups try a per-process LRU (``API_OBJECT_CACHE_LOCAL_SIZE`` entries, kept
+    ``API_OBJECT_CACHE_LOCAL_TTL`` seconds), then the Django cache
+    (``API_OBJECT_CACHE_TTL`` seconds), then the database. Writes invalidate both tiers
+    of the process handling them (see ``api.signals``); the short local TTL bounds how
+    long other workers may still serve their LRU copy.
+
+    Forward foreign keys are not stored with the instance: they are loaded with
+    ``select_related`` on a miss, cached under their own model, and re-attached from
+    that cache on every lookup, so a change to the related object never leaves a stale
+    copy inside this one. Callers get their own copy of the instance. Concurrent
+    misses for the same object run a single query (``SingleFlight``).
+    """
+
+    key_template = "api:object:{label}:{pk}"
+
+    def __init__(self, model):
+        self.model = model
+        self.label = model._meta.label_lower
+        self.relations = [field for field in model._meta.concrete_fields if field.many_to_one]
+        self.local = LRUCache()
+        self.flight = SingleFlight(self.label)
+
+    def get_key(self, pk):
+        return self.key_template.format(label=self.label, pk=pk)
+
+    def get(self, pk):
+        """
+        Return the instance with primary key ``pk``.
+
+        Raises ``model.DoesNotExist`` when there is none, and ``ValidationError`` when
+        ``pk`` is not a valid primary key value. Misses are not cached.
+        """
+        pk = self.model._meta.pk.to_python(pk)
+        if not settings.API_OBJECT_CACHE_TTL:
+            return self.load(pk)
+        key = self.get_key(pk)
+        instance = self.local.get(key)
+        if instance is not None:
+            result = "local"
+        else:
+            instance = cache.get(key)
+            result = "shared"
+            if instance is None:
+                instance = self.flight.do(key, lambda: self.fill(pk, key), lambda: cache.get(key))
+                result = "miss"
+            self.store_local(key, instance)
+        api_object_cache_requests_total.labels(self.label, result).inc()
+        return self.attach(copy.copy(instance))
+
+    def fill(self, pk, key):
+        """Load ``pk`` and store it in the shared tier; return the detached instance."""
+        instance = self.detach(self.load(pk))
+        cache.set(key, instance, settings.API_OBJECT_CACHE_TTL)
+        return instance
+
+    def load(self, pk):
+        names = [field.name for field in self.relations]
+        instance = self.model._default_manager.select_related(*names).get(pk=pk)
+        for field in self.relations:
+            related = field.get_cached_value(instance, None)
+            if related is not None:
+                get_object_cache(field.related_model).prime(related)
+        return instance
+
+    def prime(self, instance):
+        """Store an instance loaded elsewhere (e.g. through ``select_related``)."""
+        if not settings.API_OBJECT_CACHE_TTL:
+            return
+        key = self.get_key(instance.pk)
+        detached = self.detach(instance)
+        cache.set(key, detached, settings.API_OBJECT_CACHE_TTL)
+        self.store_local(key, detached)
+
+    def store_local(self, key, instance):
+        evicted = self.local.set(
+            key,
+            instance,
+            settings.API_OBJECT_CACHE_LOCAL_TTL,
+            settings.API_OBJECT_CACHE_LOCAL_SIZE,
+        )
+        if evicted:
+            api_object_cache_evictions_total.labels(self.label).inc(evicted)
+
+    def detach(self, instance):
+        """Return a copy of ``instance`` without its cached related objects."""
+        detached = copy.copy(instance)
+        detached._state.fields_cache = {}
+        return detached
+
+    def attach(self, instance):
+        """Set the forward foreign keys of ``instance`` from their own object caches."""
+        for field in self.relations:
+            related_pk = getattr(instance, field.attname)
+            related = None
+            if related_pk is not None:
+                try:
+                    related = get_object_cache(field.related_model).get(related_pk)
+                except field.related_model.DoesNotExist:
+                    # Deleted by ON DELETE SET NULL, which sends no signal for this row.
+                    pass
+            field.set_cached_value(instance, related)
+        return instance
+
+    def invalidate(self, *pks):
+        """Drop the instances with primary keys ``pks`` from both tiers."""
+        keys = [self.get_key(self.model._meta.pk.to_python(pk)) for pk in pks]
+        for key in keys:
+            self.local.delete(key)
+        cache.delete_many(keys)
+
+
+_object_caches = {}
+
+
+def get_object_cache(model):
+    """Return the process-wide ``ObjectCache`` of ``model``."""
+    if model not in _object_caches:
+        _object_caches[model] = ObjectCache(model)
+    return _object_caches[model]
+
+
+def clear_object_caches():
+    """Empty the per-process tier of every object cache (the shared tier is ``cache``)."""
+    for object_cache in _object_caches.values():
+        object_cache.local.clear()
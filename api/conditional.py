@@ -0,0 +1,58 @@
+"""
+Conditional GET (``ETag`` / ``Last-Modified``) for the API resources.
+
+Validators are built from a few values that change whenever the representation does
+(``updated_at`` of the rows involved, the number of rows in a list) and from
+everything else the body depends on: absolute URL, normalized query string and the
+negotiated renderer. They are computed before serialization, so a client that already
+has the current representation gets a ``304`` without the serializer running.
+"""
+
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+from .cache import normalize_query_params
+
+
+class ConditionalResponse(Exception):
+    """A conditional request was answered without a body: ``response`` is the 304/412."""
+
+    def __init__(self, response):
+        super().__init__()
+        self.response = response
+
+
+class Validators:
+    """
+    ``ETag`` (and optionally ``Last-Modified``) of one representation.
+
+    ``values`` are the database values the representation depends on; ``modified`` the
+    datetimes among them that bound its last change, or None when they cannot (a list
+    also changes when rows are deleted, which no ``updated_at`` records).
+    """
+
+    def __init__(self, request, values, modified=None):
+        location = request.build_absolute_uri(request.path)
+        params = normalize_query_params(request.query_params, keep_empty=True)
+        payload = "|".join([location, params, request.accepted_renderer.format, *map(repr, values)])
+        digest = hashlib.md5(payload.encode(), usedforsecurity=False).hexdigest()
+        self.etag = quote_etag(digest)
+        modified = [value for value in modified or () if value is not None]
+        self.last_modified = int(max(modified).timestamp()) if modified else None
+
+    def check(self, request):
+        """Raise ``ConditionalResponse`` when the request's preconditions decide the response."""
+        response = get_conditional_response(
+            request, etag=self.etag, last_modified=self.last_modified
+        )
+        if response is not None:
+            raise ConditionalResponse(self.apply(response))
+
+    def apply(self, response):
+        """Set the validator headers on ``response`` and return it."""
+        response["ETag"] = self.etag
+        if self.last_modified is not None:
+            response["Last-Modified"] = http_date(self.last_modified)
+        return response
@@ -0,0 +1,87 @@
+"""
+Streaming exports for the API app.
+"""
+
+import csv
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+
+from .projection import PersonListProjection, ProductListProjection
+from .renderers import dumps
+
+
+class Echo:
+    """File-like object whose ``write`` returns the value instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+class Export:
+    """
+    Stream a queryset as NDJSON or CSV with constant memory.
+
+    Rows are read with ``projection_class`` (``values()`` plus SQL-computed columns)
+    through ``iterator(chunk_size=API_EXPORT_CHUNK_SIZE)`` (a server-side cursor on
+    PostgreSQL), so each exported row matches the list endpoint's ``results``. ``fields``
+    limits the exported columns.
+    """
+
+    projection_class = None
+    filename = None
+
+    def __init__(self, queryset, fields=None):
+        self.queryset = queryset
+        self.projection = self.projection_class(fields)
+        self.columns = self.projection.columns
+
+    def iter_rows(self):
+        rows = self.projection.project(self.queryset)
+        for row in rows.iterator(chunk_size=settings.API_EXPORT_CHUNK_SIZE):
+            yield self.projection.to_representation(row)
+
+    def iter_chunks(self, lines, empty=""):
+        """Group ``str`` lines (``bytes`` with ``empty=b""``) so each write carries many rows."""
+        buffer = []
+        for line in lines:
+            buffer.append(line)
+            if len(buffer) >= settings.API_EXPORT_CHUNK_SIZE:
+                yield empty.join(buffer)
+                buffer = []
+        if buffer:
+            yield empty.join(buffer)
+
+    def stream_ndjson(self):
+        return self.iter_chunks((dumps(row) + b"\n" for row in self.iter_rows()), b"")
+
+    def stream_csv(self):
+        writer = csv.writer(Echo())
+        header = writer.writerow(self.columns)
+        rows = (
+            writer.writerow(["" if row[c] is None else row[c] for c in self.columns])
+            for row in self.iter_rows()
+        )
+        yield header
+        yield from self.iter_chunks(rows)
+
+    def response(self, fmt):
+        if fmt == "csv":
+            response = StreamingHttpResponse(self.stream_csv(), content_type="text/csv")
+        else:
+            fmt = "ndjson"
+            response = StreamingHttpResponse(
+                self.stream_ndjson(), content_type="application/x-ndjson"
+            )
+        response["Content-Disposition"] = f'attachment; filename="{self.filename}.{fmt}"'
+        return response
+
+
+class PersonExport(Export):
+    projection_class = PersonListProjection
+    filename = "persons"
+
+
+class ProductExport(Export):
+    projection_class = ProductListProjection
+    filename = "products"
@@ -3,15 +3,96 @@ Filters for the API app.
 """
 
 import django_filters
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connections
+from django.db.models import F
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import SearchFilter
+from rest_framework.settings import api_settings
 
 from .models import Person, Product
+from .pagination import KeysetPagination
+
+
+class TrigramSearchFilter(SearchFilter):
+    """
+    ``SearchFilter`` whose default (unprefixed) lookup is ``trgm_icontains``.
+
+    Keeps ``?search=`` substring semantics while letting PostgreSQL answer it from the
+    pg_trgm indexes instead of a sequential scan.
+    """
+
+    def construct_search(self, field_name, queryset=None):
+        lookup = self.lookup_prefixes.get(field_name[0])
+        if lookup:
+            field_name = field_name[1:]
+        else:
+            lookup = "trgm_icontains"
+        return LOOKUP_SEP.join([field_name, lookup])
+
+
+class FullTextSearchFilter(TrigramSearchFilter):
+    """
+    Relevance-ranked ``?fulltext=`` over ``Product.search_vector``.
+
+    A separate parameter, so ``?search=`` keeps its substring semantics: full-text
+    matching works on whole words (``lapt`` does not match "Laptop").
+
+    On PostgreSQL the terms are parsed with ``websearch_to_tsquery`` and matched against
+    the stored, GIN-indexed tsvector, so no vector is computed per row at query time.
+    Unless the client asks for an explicit ``ordering``, results are sorted by
+    ``SearchRank`` (newest first among equal ranks); this backend must therefore run
+    after ``OrderingFilter``. Other databases fall back to trigram substring search.
+
+    Keyset pages (``?cursor=``) can only seek on an indexed column, not on the rank, so
+    a search in keyset mode must name its ``ordering``; otherwise it is rejected with
+    400 on every database rather than silently losing the relevance order.
+    """
+
+    search_param = "fulltext"
+    search_title = "Full-text search"
+    search_description = (
+        'Relevance-ranked word search: "quoted phrases", or, -excluded (PostgreSQL).'
+    )
+    # Must match the configuration used by the products_search_vector_update() trigger.
+    search_config = "simple"
+    ordering_param = api_settings.ORDERING_PARAM
+    cursor_param = KeysetPagination.cursor_query_param
+
+    def filter_queryset(self, request, queryset, view):
+        # Passed verbatim: websearch syntax understands "quoted phrases", OR and -term.
+        terms = request.query_params.get(self.search_param, "").strip()
+        ordered = bool(request.query_params.get(self.ordering_param))
+        if terms and not ordered and self.cursor_param in request.query_params:
+            raise ValidationError(
+                {
+                    self.search_param: [
+                        f"Relevance order cannot be paginated with ?{self.cursor_param}=; "
+                        f"pass ?{self.ordering_param}= or use page numbers."
+                    ]
+                }
+            )
+        if not terms or not self.is_full_text_available(queryset):
+            return super().filter_queryset(request, queryset, view)
+
+        query = SearchQuery(terms, search_type="websearch", config=self.search_config)
+        queryset = queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F("search_vector"), query)
+        )
+        if not ordered:
+            queryset = queryset.order_by("-search_rank", "-created_at")
+        return queryset
+
+    def is_full_text_available(self, queryset):
+        return connections[queryset.db].vendor == "postgresql"
 
 
 class PersonFilter(django_filters.FilterSet):
     """Filter for Person list view."""
 
-    email = django_filters.CharFilter(field_name="email", lookup_expr="icontains")
-    last_name = django_filters.CharFilter(field_name="last_name", lookup_expr="icontains")
+    email = django_filters.CharFilter(field_name="email", lookup_expr="trgm_icontains")
+    last_name = django_filters.CharFilter(field_name="last_name", lookup_expr="trgm_icontains")
     ordering = django_filters.OrderingFilter(
         fields=(("created_at", "created_at"),),
         field_labels={
@@ -27,11 +108,11 @@ class PersonFilter(django_filters.FilterSet):
 class ProductFilter(django_filters.FilterSet):
     """Filter for Product list view."""
 
-    sku = django_filters.CharFilter(field_name="sku", lookup_expr="icontains")
+    sku = django_filters.CharFilter(field_name="sku", lookup_expr="trgm_icontains")
     price_min = django_filters.NumberFilter(field_name="price", lookup_expr="gte")
     price_max = django_filters.NumberFilter(field_name="price", lookup_expr="lte")
     q = django_filters.CharFilter(
-        field_name="name", lookup_expr="icontains", label="Search by name"
+        field_name="name", lookup_expr="trgm_icontains", label="Search by name"
     )
     ordering = django_filters.OrderingFilter(
         fields=(
@@ -0,0 +1,96 @@
+"""
+High-throughput table loading for the API app.
+"""
+
+import csv
+import io
+
+from django.db import connections, transaction
+from django.db.models.constants import OnConflict
+
+
+class BulkLoader:
+    """
+    Insert already validated rows into ``model``'s table, skipping conflicting rows.
+
+    On PostgreSQL each batch is streamed with ``COPY`` into a temporary staging table
+    and merged with ``INSERT ... SELECT ... ON CONFLICT DO NOTHING``; COPY avoids the
+    per-row parse/bind cost of INSERT and the merge keeps unique constraints (and the
+    product search trigger) in force. Other databases fall back to batched
+    ``INSERT``s with their own "ignore conflicts" syntax.
+
+    Rows are tuples ordered like ``columns`` (model field names) and are written as
+    given: no defaults, ``auto_now_add`` or signals are applied.
+    """
+
+    def __init__(self, model, columns, using="default"):
+        self.model = model
+        self.fields = [model._meta.get_field(name) for name in columns]
+        self.connection = connections[using]
+        self.table = model._meta.db_table
+        self.column_sql = ", ".join(
+            self.connection.ops.quote_name(field.column) for field in self.fields
+        )
+
+    def load(self, rows):
+        """Insert ``rows`` in one transaction and return how many were inserted."""
+        if not rows:
+            return 0
+        with transaction.atomic(using=self.connection.alias):
+            if self.connection.vendor == "postgresql":
+                return self.copy_and_merge(rows)
+            return self.insert_ignore(rows)
+
+    def copy_and_merge(self, rows):
+        quote = self.connection.ops.quote_name
+        staging = quote(f"{self.table}_staging")
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f"CREATE TEMP TABLE IF NOT EXISTS {staging} "
+                f"(LIKE {quote(self.table)} INCLUDING DEFAULTS) ON COMMIT DROP"
+            )
+            self.copy(
+                cursor, f"COPY {staging} ({self.column_sql}) FROM STDIN WITH (FORMAT csv)", rows
+            )
+            cursor.execute(
+                f"INSERT INTO {quote(self.table)} ({self.column_sql}) "
+                f"SELECT {self.column_sql} FROM {staging} ON CONFLICT DO NOTHING"
+            )
+            inserted = cursor.rowcount
+            # Callers may load several batches inside one outer transaction.
+            cursor.execute(f"TRUNCATE {staging}")
+            return inserted
+
+    def copy(self, cursor, sql, rows):
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            # csv writes None as an unquoted empty field, which COPY reads as NULL.
+            writer.writerow(row)
+        buffer.seek(0)
+        raw = cursor.cursor
+        if hasattr(raw, "copy_expert"):  # psycopg2
+            raw.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with raw.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+    def insert_ignore(self, rows):
+        ops = self.connection.ops
+        placeholders = ", ".join(["%s"] * len(self.fields))
+        insert = ops.insert_statement(on_conflict=OnConflict.IGNORE)
+        suffix = ops.on_conflict_suffix_sql(self.fields, OnConflict.IGNORE, None, None)
+        sql = (
+            f"{insert} {ops.quote_name(self.table)} ({self.column_sql}) "
+            f"VALUES ({placeholders}) {suffix}"
+        )
+        params = [
+            [
+                field.get_db_prep_save(value, self.connection)
+                for field, value in zip(self.fields, row, strict=True)
+            ]
+            for row in rows
+        ]
+        with self.connection.cursor() as cursor:
+            cursor.executemany(sql, params)
+            return cursor.rowcount
@@ -0,0 +1,382 @@
+"""
+Concurrent load generation against the API.
+
+Virtual users run a closed loop (send a request, wait for the response, repeat) with
+asyncio, picking each request from a weighted mix of scenarios. Requests go to a
+running server over keep-alive HTTP/1.1 connections, one per virtual user, or straight
+into the ASGI application (no network; serialized, see ``ASGITransport``). Only the
+standard library is used.
+"""
+
+import asyncio
+import json
+import math
+import random
+import time
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from .stats import summarize
+
+# SKU prefix of the products created by the write scenarios.
+LOADTEST_SKU_PREFIX = "LOADTEST-"
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open.
+HISTOGRAM_BOUNDS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+
+
+class ASGITransport:
+    """
+    Call an ASGI application in-process.
+
+    A smoke test, not a load test: Django runs every sync view on its single
+    thread-sensitive executor, so requests are served one at a time whatever the
+    concurrency, and connection or worker contention never shows up.
+    """
+
+    def __init__(self, app, host="localhost"):
+        self.app = app
+        self.host = host
+
+    async def request(self, method, path, body=None):
+        path, _, query = path.partition("?")
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode("ascii"),
+            "query_string": query.encode("ascii"),
+            "root_path": "",
+            "headers": [
+                (b"host", self.host.encode("ascii")),
+                (b"accept", b"application/json"),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode("ascii")),
+            ],
+            "client": ("127.0.0.1", 0),
+            "server": (self.host, 80),
+        }
+        response = {"status": None, "body": []}
+        disconnect = asyncio.Event()
+        sent = False
+
+        async def receive():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": payload, "more_body": False}
+            await disconnect.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            disconnect.set()
+        return response["status"], b"".join(response["body"])
+
+    async def close(self):
+        pass
+
+
+class HTTPConnection:
+    """A minimal keep-alive HTTP/1.1 client connection (Content-Length or chunked)."""
+
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = self.writer = None
+
+    async def request(self, method, path, body=None):
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        head = (
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.port}\r\n"
+            "Accept: application/json\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(payload)}\r\n"
+            "Connection: keep-alive\r\n\r\n"
+        )
+        try:
+            self.writer.write(head.encode("ascii") + payload)
+            await self.writer.drain()
+            return await self.read_response()
+        except (OSError, asyncio.IncompleteReadError):
+            await self.close()
+            raise
+
+    async def read_response(self):
+        status_line = await self.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("server closed the connection")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                chunks.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            content = b"".join(chunks)
+        elif "content-length" in headers:
+            content = await self.reader.readexactly(int(headers["content-length"]))
+        else:
+            content = await self.reader.read()
+            headers["connection"] = "close"
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, content
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except OSError:
+                pass
+        self.reader = self.writer = None
+
+
+class HTTPTransport:
+    """Send requests to a running server; every virtual user keeps its own connection."""
+
+    def __init__(self, url):
+        parts = urlsplit(url)
+        if parts.scheme != "http":
+            raise ValueError("only http:// URLs are supported")
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.connections = {}
+
+    async def request(self, method, path, body=None):
+        task = asyncio.current_task()
+        connection = self.connections.get(task)
+        if connection is None:
+            connection = self.connections[task] = HTTPConnection(self.host, self.port)
+        return await connection.request(method, self.prefix + path, body)
+
+    async def close(self):
+        for connection in self.connections.values():
+            await connection.close()
+
+
+class Scenarios:
+    """
+    Request builders for the load mix, keyed by scenario name.
+
+    ``person_ids``/``product_ids`` are sampled from the database before the run so
+    read and update scenarios hit existing rows.
+    """
+
+    def __init__(self, person_ids, product_ids, rng):
+        self.person_ids = person_ids
+        self.product_ids = product_ids
+        self.rng = rng
+        self.counter = 0
+
+    @property
+    def available(self):
+        names = ["list", "list_filtered", "search", "persons_list", "create"]
+        if self.product_ids:
+            names += ["retrieve", "update"]
+        return names
+
+    def build(self, name):
+        """Return ``(method, path, body)`` for one request of scenario ``name``."""
+        return getattr(self, name)()
+
+    def list(self):
+        return "GET", f"/api/v1/products/?page={self.rng.randint(1, 50)}", None
+
+    def list_filtered(self):
+        low = self.rng.choice([0, 10, 20, 50, 100])
+        return "GET", f"/api/v1/products/?price_min={low}&price_max={low * 3 + 30}", None
+
+    def search(self):
+        term = self.rng.choice(["laptop", "wireless", "mouse", "pro", "desk"])
+        return "GET", f"/api/v1/products/?search={term}", None
+
+    def persons_list(self):
+        return "GET", f"/api/v1/persons/?page={self.rng.randint(1, 50)}", None
+
+    def retrieve(self):
+        return "GET", f"/api/v1/products/{self.rng.choice(self.product_ids)}/", None
+
+    def create(self):
+        self.counter += 1
+        body = {
+            "name": "Load test product",
+            "sku": f"{LOADTEST_SKU_PREFIX}{time.time_ns() % 10**12}-{self.counter}",
+            "price": f"{self.rng.uniform(1, 500):.2f}",
+        }
+        if self.person_ids:
+            body["owner_id"] = str(self.rng.choice(self.person_ids))
+        return "POST", "/api/v1/products/", body
+
+    def update(self):
+        product_id = self.rng.choice(self.product_ids)
+        body = {"price": f"{self.rng.uniform(1, 500):.2f}"}
+        return "PATCH", f"/api/v1/products/{product_id}/", body
+
+
+def parse_mix(text, available):
+    """Parse ``"list=90,create=10"`` into ``[(scenario, weight)]``."""
+    mix = []
+    for item in text.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in available:
+            raise ValueError(f"unknown scenario {name!r}; choose from {', '.join(available)}")
+        try:
+            mix.append((name, float(weight or 1)))
+        except ValueError:
+            raise ValueError(f"invalid weight in {item!r}") from None
+    if not mix or sum(weight for _name, weight in mix) <= 0:
+        raise ValueError("the mix needs at least one scenario with a positive weight")
+    return mix
+
+
+class Stats:
+    """Latency samples (seconds) and error counts, per scenario and per time window."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.errors = defaultdict(int)
+        self.window = []
+        self.window_errors = 0
+
+    def record(self, scenario, seconds, ok):
+        self.latencies[scenario].append(seconds)
+        self.window.append(seconds)
+        if not ok:
+            self.errors[scenario] += 1
+            self.window_errors += 1
+
+    def take_window(self):
+        window, errors = self.window, self.window_errors
+        self.window, self.window_errors = [], 0
+        return window, errors
+
+    @staticmethod
+    def summarize(samples, errors, seconds):
+        stats = summarize(samples, digits=2)
+        requests = stats["n"]
+        return {
+            "requests": requests,
+            "rps": round(requests / seconds, 1) if seconds else 0.0,
+            "error_rate": f"{errors / requests:.2%}" if requests else "0.00%",
+            "p50_ms": stats["p50_ms"],
+            "p95_ms": stats["p95_ms"],
+            "p99_ms": stats["p99_ms"],
+            "max_ms": stats["max_ms"],
+        }
+
+    def histogram(self):
+        """Return ``[(label, count)]`` over every scenario's latencies."""
+        counts = [0] * (len(HISTOGRAM_BOUNDS_MS) + 1)
+        for samples in self.latencies.values():
+            for seconds in samples:
+                ms = seconds * 1000
+                index = next(
+                    (i for i, bound in enumerate(HISTOGRAM_BOUNDS_MS) if ms < bound),
+                    len(HISTOGRAM_BOUNDS_MS),
+                )
+                counts[index] += 1
+        labels = [f"< {bound} ms" for bound in HISTOGRAM_BOUNDS_MS]
+        labels.append(f">= {HISTOGRAM_BOUNDS_MS[-1]} ms")
+        return list(zip(labels, counts, strict=True))
+
+
+class LoadTest:
+    """Run ``concurrency`` virtual users for ``duration`` seconds (or ``requests`` total)."""
+
+    def __init__(
+        self,
+        transport,
+        scenarios,
+        mix,
+        concurrency,
+        duration=None,
+        requests=None,
+        interval=5.0,
+        timeout=30.0,
+        report=print,
+        seed=None,
+    ):
+        self.transport = transport
+        self.scenarios = scenarios
+        self.names = [name for name, _weight in mix]
+        self.weights = [weight for _name, weight in mix]
+        self.concurrency = concurrency
+        self.duration = duration
+        self.requests = requests
+        self.interval = interval
+        self.timeout = timeout
+        self.report = report
+        self.rng = random.Random(seed)
+        self.stats = Stats()
+        self.issued = 0
+
+    async def user(self, deadline):
+        while time.monotonic() < deadline:
+            if self.requests is not None:
+                if self.issued >= self.requests:
+                    return
+                self.issued += 1
+            scenario = self.rng.choices(self.names, weights=self.weights)[0]
+            method, path, body = self.scenarios.build(scenario)
+            start = time.perf_counter()
+            try:
+                status, _content = await asyncio.wait_for(
+                    self.transport.request(method, path, body), self.timeout
+                )
+                ok = status < 400
+            except (TimeoutError, OSError, asyncio.IncompleteReadError, ValueError):
+                ok = False
+            self.stats.record(scenario, time.perf_counter() - start, ok)
+
+    async def reporter(self, started):
+        last = started
+        while True:
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            window, errors = self.stats.take_window()
+            self.report(
+                {"t_s": round(now - started, 1), **Stats.summarize(window, errors, now - last)}
+            )
+            last = now
+
+    async def run(self):
+        """Run the load and return ``(elapsed seconds, stats)``."""
+        started = time.monotonic()
+        deadline = started + self.duration if self.duration else math.inf
+        reporter = asyncio.create_task(self.reporter(started))
+        try:
+            await asyncio.gather(*(self.user(deadline) for _ in range(self.concurrency)))
+        finally:
+            reporter.cancel()
+            await self.transport.close()
+        return time.monotonic() - started, self.stats
@@ -0,0 +1,71 @@
+"""
+Custom lookups for the API app.
+"""
+
+from django.db.models import BooleanField, CharField, Expression, F
+from django.db.models.lookups import IContains
+
+
+@CharField.register_lookup
+class TrigramIContains(IContains):
+    """
+    Case-insensitive substring match that pg_trgm GIN indexes can serve.
+
+    Django compiles ``icontains`` on PostgreSQL to ``UPPER(col::text) LIKE UPPER(%s)``,
+    which no index on ``col`` can answer. This lookup emits ``col ILIKE %s`` instead, so
+    the ``gin_trgm_ops`` indexes created in ``0002_trigram_indexes`` are used. Other
+    databases get the stock ``icontains`` SQL.
+    """
+
+    lookup_name = "trgm_icontains"
+
+    def as_sql(self, compiler, connection):
+        return IContains(self.lhs, self.rhs).as_sql(compiler, connection)
+
+    def as_postgresql(self, compiler, connection):
+        if not self.rhs_is_direct_value():
+            return self.as_sql(compiler, connection)
+        lhs_sql, params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs_sql} ILIKE {rhs_sql}", params + rhs_params
+
+
+class RowCompare(Expression):
+    """
+    Row-value comparison ``(a, b, ...) < (x, y, ...)`` (or ``>``).
+
+    Filtering with ``Q(a__lt=x) | Q(a=x, b__lt=y)`` is equivalent, but the planner can
+    only apply that OR as a filter on every row read, so seeking deep into an index
+    still walks it from the start. A row value is a single range condition on a
+    composite ``(a, b, ...)`` index: PostgreSQL and SQLite (3.15+) start the index scan
+    right after ``(x, y, ...)``.
+    """
+
+    operators = {"lt": "<", "gt": ">"}
+
+    def __init__(self, fields, lookup, values):
+        super().__init__(output_field=BooleanField())
+        self.columns = [F(field) if isinstance(field, str) else field for field in fields]
+        self.lookup = lookup
+        self.values = list(values)
+
+    def get_source_expressions(self):
+        return self.columns
+
+    def set_source_expressions(self, exprs):
+        self.columns = exprs
+
+    def as_sql(self, compiler, connection):
+        columns, params = [], []
+        for column in self.columns:
+            sql, column_params = compiler.compile(column)
+            columns.append(sql)
+            params.extend(column_params)
+        # Each value is adapted by its column's field (UUID, datetime, decimal, ...).
+        params.extend(
+            column.output_field.get_db_prep_value(value, connection)
+            for column, value in zip(self.columns, self.values, strict=True)
+        )
+        placeholders = ", ".join(["%s"] * len(self.values))
+        operator = self.operators[self.lookup]
+        return f"({', '.join(columns)}) {operator} ({placeholders})", params
@@ -0,0 +1,86 @@
+"""
+Shared implementation of the ``import_*`` management commands.
+"""
+
+import csv
+import sys
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class ImportCommand(BaseCommand):
+    """Stream a CSV or NDJSON file through ``importer_class``."""
+
+    importer_class = None
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or NDJSON file to import, or - for stdin.")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "ndjson"],
+            help="File format (default: guessed from the file extension).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10000,
+            help="Rows validated and loaded per transaction (default: 10000).",
+        )
+        parser.add_argument(
+            "--rejects",
+            help="Write rejected rows (line number and errors) to this CSV file.",
+        )
+
+    def handle(self, *args, **options):
+        self.verbosity = options["verbosity"]
+        path = options["path"]
+        fmt = options["format"] or self.guess_format(path)
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+
+        rejects_file = None
+        rejects = None
+        if options["rejects"]:
+            rejects_file = open(options["rejects"], "w", newline="", encoding="utf-8")
+            rejects = csv.writer(rejects_file)
+            rejects.writerow(["line", "errors"])
+
+        importer = self.importer_class(batch_size=options["batch_size"], rejects=rejects)
+        try:
+            stream = sys.stdin if path == "-" else open(path, newline="", encoding="utf-8")
+        except OSError as exc:
+            if rejects_file:
+                rejects_file.close()
+            raise CommandError(str(exc)) from exc
+        try:
+            report = importer.run(stream, fmt, progress=self.progress)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+            if rejects_file:
+                rejects_file.close()
+
+        label = self.importer_class.model._meta.verbose_name_plural
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {report.inserted} {label} from {report.read} rows in "
+                f"{report.seconds:.1f}s ({report.rows_per_second:,.0f} rows/s); "
+                f"{report.rejected} rejected, {report.skipped} skipped as already existing."
+            )
+        )
+
+    def guess_format(self, path):
+        suffix = Path(path).suffix.lower()
+        if suffix == ".csv":
+            return "csv"
+        if suffix in (".ndjson", ".jsonl"):
+            return "ndjson"
+        raise CommandError("Cannot guess the file format; pass --format csv or --format ndjson.")
+
+    def progress(self, report):
+        if self.verbosity > 1:
+            self.stderr.write(
+                f"{report.read} rows read, {report.inserted} inserted "
+                f"({report.rows_per_second:,.0f} rows/s)"
+            )
@@ -0,0 +1,8 @@
+from api.importers import PersonImporter
+
+from ._import import ImportCommand
+
+
+class Command(ImportCommand):
+    help = "Bulk import persons from a CSV or NDJSON file."
+    importer_class = PersonImporter
@@ -0,0 +1,8 @@
+from api.importers import ProductImporter
+
+from ._import import ImportCommand
+
+
+class Command(ImportCommand):
+    help = "Bulk import products from a CSV or NDJSON file."
+    importer_class = ProductImporter
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import random
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+
+from api.loadtest import (
+    LOADTEST_SKU_PREFIX,
+    ASGITransport,
+    HTTPTransport,
+    LoadTest,
+    Scenarios,
+    Stats,
+    parse_mix,
+)
+from api.models import Person, Product
+from api.stats import print_table
+
+# Rows sampled up front for the retrieve/update scenarios and product owners.
+SAMPLE_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Fire a concurrent mix of reads and writes at a running server (--url), or at the "
+        "ASGI app in-process as a smoke test (--in-process), and report throughput, "
+        "latency and errors."
+    )
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument(
+            "--url", help="Base URL of a running server, e.g. http://localhost:8000."
+        )
+        target.add_argument(
+            "--in-process",
+            action="store_true",
+            help="Smoke test against core.asgi in this process. Sync views run one at a "
+            "time, so throughput and latency do not reflect concurrency.",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=16, help="Virtual users (default: 16)."
+        )
+        parser.add_argument(
+            "--duration", type=float, default=30, help="Seconds to run (default: 30)."
+        )
+        parser.add_argument(
+            "--requests", type=int, help="Stop after this many requests instead of --duration."
+        )
+        parser.add_argument(
+            "--mix",
+            default="list=90,create=10",
+            help="Weighted scenarios: list, list_filtered, search, persons_list, retrieve, "
+            "create, update (default: list=90,create=10).",
+        )
+        parser.add_argument(
+            "--interval", type=float, default=5, help="Seconds between progress lines."
+        )
+        parser.add_argument(
+            "--timeout", type=float, default=30, help="Per-request timeout in seconds."
+        )
+        parser.add_argument("--seed", type=int, help="Random seed for a repeatable request mix.")
+        parser.add_argument("--output", help="Write the summary to this JSON file.")
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the products created by the run."
+        )
+        parser.add_argument(
+            "--cache",
+            action="store_true",
+            help="With --in-process: keep the list and object caches on (off by default, "
+            "so reads reach the database). With --url the server's settings apply.",
+        )
+
+    def handle(self, *args, **options):
+        if options["concurrency"] < 1:
+            raise CommandError("--concurrency must be a positive integer.")
+        person_ids = list(Person.objects.values_list("id", flat=True)[:SAMPLE_SIZE])
+        product_ids = list(
+            Product.objects.exclude(sku__startswith=LOADTEST_SKU_PREFIX).values_list(
+                "id", flat=True
+            )[:SAMPLE_SIZE]
+        )
+
+        scenarios = Scenarios(person_ids, product_ids, random.Random(options["seed"]))
+        try:
+            mix = parse_mix(options["mix"], scenarios.available)
+        except ValueError as exc:
+            raise CommandError(str(exc)) from exc
+
+        if options["url"]:
+            try:
+                transport = HTTPTransport(options["url"])
+            except ValueError as exc:
+                raise CommandError(str(exc)) from exc
+            target = options["url"]
+        else:
+            from core.asgi import application
+
+            transport = ASGITransport(application)
+            target = "core.asgi (in-process)"
+            self.stderr.write(
+                "Warning: in-process requests are serialized on Django's sync executor; "
+                "use --url against a running server to measure concurrency."
+            )
+
+        caches, cache_ttls = {}, None
+        if not options["url"]:
+            if not options["cache"]:
+                # Repeated reads would be cache hits that never reach the database.
+                caches = {"API_LIST_CACHE_TTL": 0, "API_OBJECT_CACHE_TTL": 0}
+            cache_ttls = {
+                "list": caches.get("API_LIST_CACHE_TTL", settings.API_LIST_CACHE_TTL),
+                "object": caches.get("API_OBJECT_CACHE_TTL", settings.API_OBJECT_CACHE_TTL),
+            }
+
+        self.stdout.write(
+            f"Load testing {target} with {options['concurrency']} virtual users, "
+            f"mix {options['mix']}"
+        )
+        if cache_ttls:
+            self.stdout.write(
+                f"List cache TTL {cache_ttls['list']}s, object cache TTL {cache_ttls['object']}s"
+                + ("" if options["cache"] else " (pass --cache to keep the configured TTLs)")
+            )
+        columns = ["t_s", "requests", "rps", "error_rate", "p50_ms", "p95_ms", "p99_ms"]
+        self.stdout.write("  ".join(column.rjust(10) for column in columns))
+        load = LoadTest(
+            transport,
+            scenarios,
+            mix,
+            concurrency=options["concurrency"],
+            duration=None if options["requests"] else options["duration"],
+            requests=options["requests"],
+            interval=options["interval"],
+            timeout=options["timeout"],
+            report=lambda row: self.stdout.write(
+                "  ".join(str(row[column]).rjust(10) for column in columns)
+            ),
+            seed=options["seed"],
+        )
+        try:
+            with override_settings(**caches):
+                elapsed, stats = asyncio.run(load.run())
+        finally:
+            if not options["keep"]:
+                Product.objects.filter(sku__startswith=LOADTEST_SKU_PREFIX).delete()
+
+        self.print_summary(elapsed, stats, options, cache_ttls)
+
+    def print_summary(self, elapsed, stats, options, cache_ttls=None):
+        rows = []
+        for scenario, samples in sorted(stats.latencies.items()):
+            rows.append(
+                {"scenario": scenario, **Stats.summarize(samples, stats.errors[scenario], elapsed)}
+            )
+        all_samples = [seconds for samples in stats.latencies.values() for seconds in samples]
+        total = {
+            "scenario": "total",
+            **Stats.summarize(all_samples, sum(stats.errors.values()), elapsed),
+        }
+        rows.append(total)
+
+        self.stdout.write(f"\nSummary over {elapsed:.1f}s:")
+        columns = ["scenario", "requests", "rps", "error_rate", "p50_ms", "p95_ms", "p99_ms"]
+        columns.append("max_ms")
+        print_table(rows, columns, write=self.stdout.write)
+
+        histogram = stats.histogram()
+        peak = max((count for _label, count in histogram), default=0) or 1
+        self.stdout.write("\nLatency histogram:")
+        for label, count in histogram:
+            bar = "#" * round(40 * count / peak)
+            self.stdout.write(f"{label:>12}  {count:>8}  {bar}")
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as fh:
+                json.dump(
+                    {
+                        "target": options["url"] or "asgi",
+                        "concurrency": options["concurrency"],
+                        "mix": options["mix"],
+                        # None with --url: the server's cache settings are not known here.
+                        "cache_ttls": cache_ttls,
+                        "elapsed_s": round(elapsed, 2),
+                        "scenarios": rows,
+                        "histogram": dict(histogram),
+                    },
+                    fh,
+                    indent=2,
+                )
+
+        if total["requests"] and sum(stats.errors.values()) == total["requests"]:
+            raise CommandError("Every request failed.")
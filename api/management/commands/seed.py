@@ -0,0 +1,67 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from api.seeding import Seeder
+
+
+class Command(BaseCommand):
+    help = "Generate a deterministic synthetic dataset of persons and products."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--persons", type=int, default=10000, help="Persons to generate.")
+        parser.add_argument("--products", type=int, default=100000, help="Products to generate.")
+        parser.add_argument("--seed", type=int, default=42, help="Random seed (default: 42).")
+        parser.add_argument(
+            "--until",
+            type=datetime.date.fromisoformat,
+            help="Latest created_at date, YYYY-MM-DD (default: today). "
+            "Pass it explicitly for byte-identical datasets on different days.",
+        )
+        parser.add_argument(
+            "--days", type=int, default=365, help="Days of created_at history (default: 365)."
+        )
+        parser.add_argument(
+            "--unowned",
+            type=float,
+            default=0.1,
+            help="Fraction of products without owner (default: 0.1).",
+        )
+        parser.add_argument(
+            "--batch-size", type=int, default=50000, help="Rows per COPY/INSERT batch."
+        )
+
+    def handle(self, *args, **options):
+        if options["persons"] < 0 or options["products"] < 0:
+            raise CommandError("--persons and --products must not be negative.")
+        if not 0 <= options["unowned"] <= 1:
+            raise CommandError("--unowned must be between 0 and 1.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be a positive integer.")
+        self.verbosity = options["verbosity"]
+
+        until = options["until"] or timezone.now().date()
+        seeder = Seeder(
+            seed=options["seed"],
+            until=datetime.datetime.combine(until, datetime.time(), datetime.UTC),
+            days=options["days"],
+            unowned=options["unowned"],
+            batch_size=options["batch_size"],
+        )
+        started = time.perf_counter()
+        persons, products = seeder.run(
+            options["persons"], options["products"], progress=self.progress
+        )
+        seconds = time.perf_counter() - started
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Seeded {persons} persons and {products} products in {seconds:.1f}s "
+                "(rows that already existed were skipped)."
+            )
+        )
+
+    def progress(self, model, inserted):
+        if self.verbosity > 1:
+            self.stderr.write(f"{model._meta.verbose_name_plural}: {inserted} inserted")
@@ -0,0 +1,51 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+# (index name, table, column) served by the ``trgm_icontains`` lookup.
+TRIGRAM_INDEXES = [
+    ("persons_email_trgm_idx", "persons", "email"),
+    ("persons_last_name_trgm_idx", "persons", "last_name"),
+    ("products_sku_trgm_idx", "products", "sku"),
+    ("products_name_trgm_idx", "products", "name"),
+]
+
+
+class PostgresTrigramExtension(TrigramExtension):
+    """``TrigramExtension`` whose backwards step is skipped off PostgreSQL, like its forwards."""
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        if schema_editor.connection.vendor != "postgresql":
+            return
+        super().database_backwards(app_label, schema_editor, from_state, to_state)
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    quote = schema_editor.quote_name
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {quote(name)} "
+            f"ON {quote(table)} USING gin ({quote(column)} gin_trgm_ops)"
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name, _table, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {schema_editor.quote_name(name)}")
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    atomic = False
+
+    dependencies = [
+        ("api", "0001_initial"),
+    ]
+
+    operations = [
+        PostgresTrigramExtension(),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
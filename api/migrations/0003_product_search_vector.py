@@ -0,0 +1,69 @@
+import django.contrib.postgres.search
+from django.db import migrations
+
+CREATE_TRIGGER = """
+CREATE OR REPLACE FUNCTION products_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('simple', coalesce(NEW.name, '')), 'A')
+        || setweight(to_tsvector('simple', coalesce(NEW.sku, '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS products_search_vector_trigger ON products;
+CREATE TRIGGER products_search_vector_trigger
+    BEFORE INSERT OR UPDATE ON products
+    FOR EACH ROW EXECUTE FUNCTION products_search_vector_update();
+"""
+
+BACKFILL = """
+UPDATE products SET search_vector =
+    setweight(to_tsvector('simple', coalesce(name, '')), 'A')
+    || setweight(to_tsvector('simple', coalesce(sku, '')), 'B')
+WHERE search_vector IS NULL;
+"""
+
+CREATE_INDEX = """
+CREATE INDEX CONCURRENTLY IF NOT EXISTS products_search_vector_idx
+    ON products USING gin (search_vector);
+"""
+
+DROP = """
+DROP INDEX CONCURRENTLY IF EXISTS products_search_vector_idx;
+DROP TRIGGER IF EXISTS products_search_vector_trigger ON products;
+DROP FUNCTION IF EXISTS products_search_vector_update();
+"""
+
+
+def create_search_vector_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(CREATE_TRIGGER)
+    schema_editor.execute(BACKFILL)
+    schema_editor.execute(CREATE_INDEX)
+
+
+def drop_search_vector_trigger(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for statement in DROP.strip().splitlines():
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    atomic = False
+
+    dependencies = [
+        ("api", "0002_trigram_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="product",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(create_search_vector_trigger, drop_search_vector_trigger),
+    ]
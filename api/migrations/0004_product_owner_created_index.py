@@ -0,0 +1,35 @@
+from django.db import migrations, models
+
+INDEX = models.Index(fields=["owner", "-created_at", "-id"], name="products_owner_created_idx")
+
+
+def add_index(apps, schema_editor):
+    model = apps.get_model("api", "Product")
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.add_index(model, INDEX, concurrently=True)
+    else:
+        schema_editor.add_index(model, INDEX)
+
+
+def remove_index(apps, schema_editor):
+    model = apps.get_model("api", "Product")
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.remove_index(model, INDEX, concurrently=True)
+    else:
+        schema_editor.remove_index(model, INDEX)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    atomic = False
+
+    dependencies = [
+        ("api", "0003_product_search_vector"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[migrations.AddIndex(model_name="product", index=INDEX)],
+            database_operations=[migrations.RunPython(add_index, remove_index)],
+        ),
+    ]
@@ -0,0 +1,88 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+# (model, index) built before the old indexes are dropped.
+ADDED = [
+    ("person", models.Index(fields=["created_at", "id"], name="persons_created_id_idx")),
+    (
+        "product",
+        models.Index(fields=["created_at", "id", "price"], name="products_created_price_idx"),
+    ),
+    ("product", models.Index(fields=["price", "id"], name="products_price_id_idx")),
+]
+
+# (model, index) superseded by ADDED or by a unique constraint (email, sku).
+REMOVED = [
+    ("person", models.Index(fields=["email"], name="persons_email_768727_idx")),
+    ("person", models.Index(fields=["created_at"], name="persons_created_6ba3d4_idx")),
+    ("product", models.Index(fields=["sku"], name="products_sku_fe2039_idx")),
+    ("product", models.Index(fields=["price"], name="products_price_fe467e_idx")),
+    ("product", models.Index(fields=["created_at"], name="products_created_e1ba5f_idx")),
+]
+
+
+def add_index(schema_editor, model, index):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.add_index(model, index, concurrently=True)
+    else:
+        schema_editor.add_index(model, index)
+
+
+def remove_index(schema_editor, model, index):
+    if schema_editor.connection.vendor == "postgresql":
+        schema_editor.remove_index(model, index, concurrently=True)
+    else:
+        schema_editor.remove_index(model, index)
+
+
+def forwards(apps, schema_editor):
+    for model_name, index in ADDED:
+        add_index(schema_editor, apps.get_model("api", model_name), index)
+    for model_name, index in REMOVED:
+        remove_index(schema_editor, apps.get_model("api", model_name), index)
+
+
+def backwards(apps, schema_editor):
+    for model_name, index in REMOVED:
+        add_index(schema_editor, apps.get_model("api", model_name), index)
+    for model_name, index in ADDED:
+        remove_index(schema_editor, apps.get_model("api", model_name), index)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block.
+    atomic = False
+
+    dependencies = [
+        ("api", "0004_product_owner_created_index"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                *(
+                    migrations.AddIndex(model_name=model_name, index=index)
+                    for model_name, index in ADDED
+                ),
+                *(
+                    migrations.RemoveIndex(model_name=model_name, name=index.name)
+                    for model_name, index in REMOVED
+                ),
+            ],
+            database_operations=[migrations.RunPython(forwards, backwards)],
+        ),
+        # The owner_id index is covered by products_owner_created_idx (leading column).
+        migrations.AlterField(
+            model_name="product",
+            name="owner",
+            field=models.ForeignKey(
+                blank=True,
+                db_index=False,
+                help_text="Optional owner (Person)",
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="products",
+                to="api.person",
+            ),
+        ),
+    ]
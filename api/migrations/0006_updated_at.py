@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-17 21:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("api", "0005_composite_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="person",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name="product",
+            name="updated_at",
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
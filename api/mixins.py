@@ -0,0 +1,290 @@
+"""
+ViewSet mixins for the API app.
+
+Each mixin adds one feature on top of ``api.views.InstrumentedModelViewSet`` by
+overriding its list/retrieve hooks (``read_list_page``, ``serialize_rows``,
+``serialize_object``). The concrete viewsets compose them, most specific first::
+
+    class ProductViewSet(
+        CachedListMixin,
+        ConditionalGetMixin,
+        ObjectCacheMixin,
+        ProjectedListMixin,
+        FieldSelectionMixin,
+        InstrumentedModelViewSet,
+    ):
+"""
+
+from collections import namedtuple
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.serializers import ListSerializer
+
+from health.metrics import api_list_cache_requests_total
+
+from .cache import ResponseCache, get_object_cache
+from .conditional import ConditionalResponse, Validators
+
+# One list page as read from the database: ``page`` is None when the list is not
+# paginated (``rows`` is then the whole queryset); ``projection`` is the
+# ``api.projection`` instance the rows were read with, if any.
+ListPage = namedtuple("ListPage", ["page", "rows", "projection"], defaults=[None])
+
+
+class FieldSelectionMixin:
+    """
+    ``?fields=`` and ``?expand=`` on list and retrieve.
+
+    ``?fields=id,sku`` limits the response to those fields and is pushed down into the
+    retrieve queryset: only their columns are read, and relations are joined only when
+    a field needs them. ``?expand=`` embeds the relations listed in
+    ``expandable_fields``.
+    """
+
+    fields_query_param = "fields"
+    expand_query_param = "expand"
+    # Relations that list/retrieve can embed with ?expand=.
+    expandable_fields = ()
+
+    def get_requested_fields(self, serializer_class=None):
+        """Return the ``?fields=`` names, or None to keep every field."""
+        value = self.request.query_params.get(self.fields_query_param, "")
+        requested = {name.strip() for name in value.split(",") if name.strip()}
+        if not requested:
+            return None
+        serializer_class = serializer_class or self.get_serializer_class()
+        available = [
+            name for name, field in serializer_class().fields.items() if not field.write_only
+        ]
+        unknown = sorted(requested.difference(available))
+        if unknown:
+            raise ValidationError(
+                {
+                    self.fields_query_param: [
+                        f"Unknown field(s): {', '.join(unknown)}. "
+                        f"Available: {', '.join(available)}."
+                    ]
+                }
+            )
+        return [name for name in available if name in requested]
+
+    def get_expanded_fields(self):
+        """Return the set of ``?expand=`` relations requested for list/retrieve."""
+        if self.action not in ("list", "retrieve"):
+            return set()
+        value = self.request.query_params.get(self.expand_query_param, "")
+        requested = {name.strip() for name in value.split(",") if name.strip()}
+        unknown = sorted(requested.difference(self.expandable_fields))
+        if unknown:
+            available = ", ".join(self.expandable_fields) or "none"
+            raise ValidationError(
+                {
+                    self.expand_query_param: [
+                        f"Cannot expand: {', '.join(unknown)}. Available: {available}."
+                    ]
+                }
+            )
+        return requested
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == "retrieve":
+            fields = self.get_requested_fields()
+            if fields is not None:
+                queryset = self.restrict_queryset(queryset, fields)
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        if self.action in ("list", "retrieve"):
+            kwargs.setdefault("fields", self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def get_required_columns(self, model):
+        """Return the columns a restricted queryset loads whatever ``?fields=`` asks for."""
+        return [model._meta.pk.name]
+
+    def restrict_queryset(self, queryset, fields):
+        """Load only the columns and relations behind ``fields``."""
+        serializer_fields = self.get_serializer_class()().fields
+        opts = queryset.model._meta
+        columns, relations = self.get_required_columns(queryset.model), []
+        for name in fields:
+            if isinstance(serializer_fields[name], ListSerializer):
+                # Prefetched separately (?expand=), not a column of this table.
+                continue
+            try:
+                model_field = opts.get_field(serializer_fields[name].source)
+            except FieldDoesNotExist:
+                # Computed from the whole instance; keep every column.
+                return queryset
+            columns.append(model_field.name)
+            if model_field.is_relation:
+                relations.append(model_field.name)
+        queryset = queryset.select_related(None)
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset.only(*columns)
+
+
+class ProjectedListMixin:
+    """
+    List pages read with ``values()`` and serialized by ``list_projection_class``.
+
+    The projection (an ``api.projection`` class) replaces the list serializer; it is
+    built with the ``?fields=`` names, so combine with ``FieldSelectionMixin``.
+    """
+
+    list_projection_class = None
+
+    def get_list_projection(self, fields):
+        """Return the ``api.projection`` instance serializing list pages, or None."""
+        if self.list_projection_class is None:
+            return None
+        return self.list_projection_class(fields)
+
+    def read_list_page(self):
+        projection = self.get_list_projection(self.get_requested_fields())
+        if projection is None:
+            return super().read_list_page()
+        queryset = projection.project(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(queryset)
+        return ListPage(page, queryset if page is None else page, projection)
+
+    def serialize_rows(self, listing):
+        if listing.projection is None:
+            return super().serialize_rows(listing)
+        return listing.projection.serialize(listing.rows)
+
+
+class ObjectCacheMixin:
+    """
+    Plain retrieves (no query parameters besides ``?format=``) read the instance
+    through ``api.cache.ObjectCache`` instead of the queryset.
+    """
+
+    def get_object(self):
+        if self.action != "retrieve" or set(self.request.query_params) - {"format"}:
+            return super().get_object()
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        try:
+            instance = get_object_cache(self.queryset.model).get(self.kwargs[lookup_url_kwarg])
+        except (ObjectDoesNotExist, DjangoValidationError):
+            raise Http404 from None
+        self.check_object_permissions(self.request, instance)
+        return instance
+
+
+class ConditionalGetMixin:
+    """
+    ``ETag``/``Last-Modified`` on list and retrieve (``api.conditional``).
+
+    Validators are computed before serialization, and matching
+    ``If-None-Match``/``If-Modified-Since`` requests are answered with 304. List
+    validators come from the projection's ``row_version``, so only lists read by
+    ``ProjectedListMixin`` are conditional.
+    """
+
+    # auto_now column behind the ETag/Last-Modified validators.
+    last_modified_field = "updated_at"
+
+    def get_required_columns(self, model):
+        return super().get_required_columns(model) + [self.last_modified_field]
+
+    def get_object_validators(self, instance):
+        """
+        Return the datetimes the representation of ``instance`` changes with, or None
+        when the response is not conditional.
+        """
+        return [getattr(instance, self.last_modified_field)]
+
+    def get_list_validators(self, listing):
+        """
+        Return the validator values of a ``ListPage``, or None when it has none.
+
+        They are the ``row_version`` of every row on the page plus the pagination
+        envelope (count and links), so they are known before anything is serialized.
+        """
+        if listing.projection is None:
+            return None
+        values = [listing.projection.row_version(row) for row in listing.rows]
+        if listing.page is not None:
+            envelope = self.get_paginated_response([]).data
+            values.append(sorted(envelope.items()))
+        return values
+
+    def get_list_content(self):
+        """Read and serialize the list page; return ``(validator values, data)``."""
+        listing = self.read_list_page()
+        return self.get_list_validators(listing), self.serialize_list_page(listing)
+
+    def conditional_response(self, values, get_data, modified=None):
+        """
+        Return the 304/412 answering the request's preconditions, or a response with
+        ``get_data()`` and the validators of ``values`` (no validators if None).
+        """
+        if values is None:
+            return Response(get_data())
+        validators = Validators(self.request, values, modified)
+        try:
+            validators.check(self.request)
+        except ConditionalResponse as exc:
+            return exc.response
+        response = Response(get_data())
+        validators.apply(response)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        # Answer 304 from the page rows, before serializing them.
+        listing = self.read_list_page()
+        return self.conditional_response(
+            self.get_list_validators(listing), lambda: self.serialize_list_page(listing)
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        modified = self.get_object_validators(instance)
+        return self.conditional_response(
+            modified, lambda: self.serialize_object(instance), modified
+        )
+
+
+class CachedListMixin:
+    """
+    List responses cached per normalized query string (``api.cache.ResponseCache``)
+    while ``API_LIST_CACHE_TTL`` is set.
+
+    Entries are invalidated by writes to any model in ``list_cache_models`` and the
+    ``X-Cache`` header reports HIT, STALE or MISS. An entry holds the list validators
+    too, so it goes before ``ConditionalGetMixin``, whose ``get_list_content`` and
+    ``conditional_response`` it uses.
+    """
+
+    # Models whose data list responses are built from.
+    list_cache_models = ()
+
+    def get_list_cache_models(self):
+        """Return the models whose writes must invalidate the cached list response."""
+        return self.list_cache_models or (self.queryset.model,)
+
+    def list(self, request, *args, **kwargs):
+        if not settings.API_LIST_CACHE_TTL:
+            return super().list(request, *args, **kwargs)
+        response_cache = ResponseCache(
+            self.basename,
+            self.get_list_cache_models(),
+            settings.API_LIST_CACHE_TTL,
+            settings.API_LIST_CACHE_STALE_TTL,
+        )
+        # Preconditions are checked after fetch() so a conditional miss still fills the
+        # cache (and releases the callers coalesced behind it).
+        (values, data), result = response_cache.fetch(request, self.get_list_content)
+        api_list_cache_requests_total.labels(self.basename, result).inc()
+        response = self.conditional_response(values, lambda: data)
+        if response.status_code == 200:
+            response["X-Cache"] = {"hit": "HIT", "stale": "STALE"}.get(result, "MISS")
+        return response
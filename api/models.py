@@ -4,6 +4,7 @@ Models for the API app.
 
 import uuid
 
+from django.contrib.postgres.search import SearchVectorField
 from django.core.exceptions import ValidationError
 from django.core.validators import MaxLengthValidator, MinLengthValidator, MinValueValidator
 from django.db import models
@@ -40,14 +41,17 @@ class Person(models.Model):
         unique=True, validators=[validate_email], help_text="Unique email address"
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Last-Modified/ETag of the API resources (api.conditional).
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         db_table = "persons"
         ordering = ["-created_at"]
+        # email is already indexed by its unique constraint.
         indexes = [
-            models.Index(fields=["email"]),
             models.Index(fields=["last_name"]),
-            models.Index(fields=["created_at"]),
+            # Default ordering; keyset pages seek on (created_at, id).
+            models.Index(fields=["created_at", "id"], name="persons_created_id_idx"),
         ]
 
     def __str__(self):
@@ -83,18 +87,32 @@ class Product(models.Model):
         null=True,
         blank=True,
         related_name="products",
+        # Indexed by products_owner_created_idx.
+        db_index=False,
         help_text="Optional owner (Person)",
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    # Last-Modified/ETag of the API resources (api.conditional). Also touched when the
+    # owner is deleted, since ON DELETE SET NULL changes the row without saving it.
+    updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by the products_search_vector_update() trigger and indexed with GIN on
+    # PostgreSQL (migration 0003); never written from Python.
+    search_vector = SearchVectorField(null=True, editable=False)
 
     class Meta:
         db_table = "products"
         ordering = ["-created_at"]
+        # sku is already indexed by its unique constraint, and owner lookups use the
+        # leading column of products_owner_created_idx.
         indexes = [
-            models.Index(fields=["sku"]),
-            models.Index(fields=["price"]),
-            models.Index(fields=["created_at"]),
             models.Index(fields=["name"]),
+            # Default ordering; keyset pages seek on (created_at, id). price is part of
+            # the key so price_min/price_max are checked while walking the index in order.
+            models.Index(fields=["created_at", "id", "price"], name="products_created_price_idx"),
+            # ordering=price and price_min/price_max ranges; keyset pages seek on (price, id).
+            models.Index(fields=["price", "id"], name="products_price_id_idx"),
+            # Per-owner listings newest first, resumed by keyset on (created_at, id).
+            models.Index(fields=["owner", "-created_at", "-id"], name="products_owner_created_idx"),
         ]
 
     def __str__(self):
@@ -0,0 +1,270 @@
+"""
+Pagination classes for the API app.
+"""
+
+from base64 import b64decode, b64encode
+from collections import namedtuple
+from urllib import parse
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .cache import get_model_version, normalize_query_params
+from .lookups import RowCompare
+
+Keyset = namedtuple("Keyset", ["ordering", "value", "pk", "reverse"])
+
+
+def estimate_row_count(queryset):
+    """
+    Return the planner's row estimate for the table behind ``queryset``.
+
+    Reads ``pg_class.reltuples``, which PostgreSQL keeps current through autovacuum and
+    ``ANALYZE``. Returns ``None`` on other databases or for tables never analyzed.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+            [connection.ops.quote_name(queryset.model._meta.db_table)],
+        )
+        row = cursor.fetchone()
+    if row is None or row[0] < 0:
+        return None
+    return row[0]
+
+
+class CountedPaginator(DjangoPaginator):
+    """Django paginator that delegates ``count`` to a callable."""
+
+    def __init__(self, object_list, per_page, count_func, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_func = count_func
+
+    @cached_property
+    def count(self):
+        return self.count_func()
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Keyset (seek) pagination over ``(<ordering field>, id)``.
+
+    Each page is fetched with ``WHERE (field, id) < (last_field, last_id)`` instead of
+    ``OFFSET n``. The row value is an index condition on the composite ``(field, id)``
+    indexes, so the scan starts at the cursor: the cost of a page does not depend on how
+    deep the client is, and no ``COUNT(*)`` is issued. The ordering requested by the client (``ordering=price``,
+    ``ordering=-created_at``, ...) is kept as long as it is one of ``keyset_fields``;
+    ``id`` is always appended as a tie-breaker so rows sharing a value are neither
+    skipped nor repeated.
+    """
+
+    keyset_fields = ("created_at", "price")
+    ordering = "-created_at"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.model = queryset.model
+        self.key_ordering = self.get_key_ordering(queryset, view)
+        self.cursor = self.decode_cursor(request)
+
+        field = self.key_ordering.lstrip("-")
+        # Walking backwards (previous page) reads the index in the opposite direction.
+        reverse = self.cursor.reverse if self.cursor else False
+        descending = self.key_ordering.startswith("-") != reverse
+        if self.cursor is not None:
+            queryset = queryset.filter(
+                self.get_seek_filter(field, self.cursor.value, self.cursor.pk, descending)
+            )
+        prefix = "-" if descending else ""
+        queryset = queryset.order_by(f"{prefix}{field}", f"{prefix}id")
+
+        results = list(queryset[: self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[: self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.cursor is not None
+        return self.page
+
+    def get_key_ordering(self, queryset, view):
+        """Return the ordering term the keyset is built on, e.g. ``"-created_at"``."""
+        for term in queryset.query.order_by:
+            if isinstance(term, str) and term.lstrip("-") in self.keyset_fields:
+                return term
+        default = getattr(view, "ordering", None) or self.ordering
+        if not isinstance(default, str):
+            default = default[0]
+        return default
+
+    def get_seek_filter(self, field, value, pk, descending):
+        """Build the row-value comparison ``(field, id) <|> (value, pk)``."""
+        return RowCompare((field, "id"), "lt" if descending else "gt", (value, pk))
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Before the first row: step forward from where this (empty) page started.
+            return self.encode_cursor(self.cursor._replace(reverse=False))
+        return self.encode_cursor(self._keyset_from_row(self.page[-1], reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            # Past the last row: step back from where this (empty) page started.
+            return self.encode_cursor(self.cursor._replace(reverse=True))
+        return self.encode_cursor(self._keyset_from_row(self.page[0], reverse=True))
+
+    def decode_cursor(self, request):
+        """Return the ``Keyset`` carried by the request, or ``None`` for the first page."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            querystring = b64decode(encoded.encode("ascii")).decode("ascii")
+            tokens = parse.parse_qs(querystring, keep_blank_values=True)
+            ordering = tokens["o"][0]
+            if ordering != self.key_ordering:
+                # The cursor was issued for a different ordering; it cannot be resumed.
+                raise ValueError(ordering)
+            reverse = bool(int(tokens.get("r", ["0"])[0]))
+            value = self._get_model_field(ordering.lstrip("-")).to_python(tokens["p"][0])
+            pk = self._get_model_field("id").to_python(tokens["i"][0])
+        except (KeyError, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message) from None
+
+        return Keyset(ordering=ordering, value=value, pk=pk, reverse=reverse)
+
+    def encode_cursor(self, keyset):
+        tokens = {"o": keyset.ordering, "p": str(keyset.value), "i": str(keyset.pk)}
+        if keyset.reverse:
+            tokens["r"] = "1"
+        querystring = parse.urlencode(tokens)
+        encoded = b64encode(querystring.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def _keyset_from_row(self, row, reverse):
+        field = self.key_ordering.lstrip("-")
+        if isinstance(row, dict):
+            value, pk = row[field], row["id"]
+        else:
+            value, pk = getattr(row, field), row.pk
+        return Keyset(ordering=self.key_ordering, value=value, pk=pk, reverse=reverse)
+
+    def _get_model_field(self, name):
+        return self.model._meta.get_field(name)
+
+
+class ApiPagination(PageNumberPagination):
+    """
+    Page-number pagination with an opt-in keyset mode.
+
+    Requests without a ``cursor`` parameter keep the classic ``?page=`` behaviour and
+    response shape. Passing ``?cursor=`` (empty for the first page) switches to
+    ``KeysetPagination``, whose ``next``/``previous`` links carry an opaque cursor.
+
+    In page-number mode the total ``count`` avoids a full ``COUNT(*)`` where possible:
+
+    * unfiltered lists on PostgreSQL report the planner estimate from ``pg_class`` once
+      the table holds at least ``API_COUNT_ESTIMATE_THRESHOLD`` rows;
+    * every other count is cached per normalized filter parameter set for
+      ``API_COUNT_CACHE_TTL`` seconds, and dropped on the next write to the model.
+
+    ``count_approximate`` tells clients whether ``count`` is an estimate.
+    """
+
+    keyset_class = KeysetPagination
+    count_cache_key = "api:count:{label}:{version}:{path}:{params}"
+    # Parameters that change the page but never the number of matching rows.
+    count_ignored_params = ("page", "ordering", "cursor", "format")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.keyset_class.cursor_query_param in request.query_params:
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        self.keyset = None
+        self.request = request
+        self.count_is_exact = True
+        return super().paginate_queryset(queryset, request, view)
+
+    def django_paginator_class(self, queryset, page_size):
+        return CountedPaginator(queryset, page_size, lambda: self.get_count(queryset))
+
+    def get_count(self, queryset):
+        """Return the number of rows in ``queryset``, estimated or cached when possible."""
+        if not queryset.query.where:
+            estimate = estimate_row_count(queryset)
+            if estimate is not None and estimate >= settings.API_COUNT_ESTIMATE_THRESHOLD:
+                self.count_is_exact = False
+                return estimate
+
+        key = self.count_cache_key.format(
+            label=queryset.model._meta.label_lower,
+            version=get_model_version(queryset.model),
+            path=self.request.path,
+            params=normalize_query_params(self.request.query_params, self.count_ignored_params),
+        )
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, settings.API_COUNT_CACHE_TTL)
+        return count
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return Response(
+            {
+                "count": self.page.paginator.count,
+                "count_approximate": not self.count_is_exact,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count_approximate"] = {
+            "type": "boolean",
+            "example": False,
+        }
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append(
+            {
+                "name": self.keyset_class.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": (
+                    "Keyset pagination cursor. Send it empty to start keyset mode; "
+                    "follow the returned next/previous links afterwards."
+                ),
+                "schema": {"type": "string"},
+            }
+        )
+        return parameters
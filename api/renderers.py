@@ -0,0 +1,143 @@
+"""
+Renderers and parsers for the API app.
+"""
+
+import io
+import json
+
+from django.conf import settings
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.settings import api_settings
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Compact, UTF-8 output with the same separators and NaN handling as ``JSONRenderer``.
+_stdlib_encoder = JSONEncoder(
+    ensure_ascii=False, separators=(",", ":"), allow_nan=not api_settings.STRICT_JSON
+)
+# Datetimes go through DRF's encoder (milliseconds, "Z" for UTC), like everything
+# orjson does not serialize natively (Decimal, lazy strings, querysets...).
+_orjson_options = (orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME) if orjson else 0
+
+
+def use_orjson():
+    """Return whether ``dumps``/``loads`` use orjson (installed and opted in)."""
+    return orjson is not None and settings.API_JSON_BACKEND == "orjson"
+
+
+def dumps(data, fast=None):
+    """
+    Encode ``data`` as compact UTF-8 JSON bytes, the way ``JSONRenderer`` does.
+
+    ``fast`` selects orjson (when installed) over the stdlib encoder and defaults to
+    ``use_orjson()``. Values orjson cannot encode (integers wider than 64 bits,
+    unsupported types) fall back to the stdlib encoder. Output is the same bytes except
+    for floats: orjson writes exponents without a sign or zero padding (``1e16``, not
+    ``1e+16``) and small values in decimal notation (``0.00001``, not ``1e-05``), and
+    renders NaN and infinities as ``null`` where ``STRICT_JSON`` makes the stdlib raise.
+    The API's own payloads carry no floats (prices are decimal strings).
+    """
+    if fast is None:
+        fast = use_orjson()
+    if fast and orjson is not None:
+        try:
+            content = orjson.dumps(data, default=_stdlib_encoder.default, option=_orjson_options)
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            # JSONRenderer escapes these so the output is also valid JavaScript.
+            if b"\xe2\x80" in content:
+                content = content.replace(b"\xe2\x80\xa8", b"\\u2028")
+                content = content.replace(b"\xe2\x80\xa9", b"\\u2029")
+            return content
+    content = _stdlib_encoder.encode(data)
+    return content.replace("\u2028", "\\u2028").replace("\u2029", "\\u2029").encode()
+
+
+def loads(content):
+    """Decode JSON ``str``/``bytes``; orjson is tried first when ``use_orjson()``."""
+    if use_orjson():
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(content)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` with orjson doing the encoding (see ``dumps``).
+
+    Selected with ``API_JSON_BACKEND=orjson``. Produces the same bytes as the stock
+    renderer for compact, non-ASCII-escaped output (the defaults) except for floats.
+    Indented output (``Accept: application/json; indent=4``) and non-default
+    ``UNICODE_JSON``/``COMPACT_JSON`` settings are left to the stock renderer, as is
+    everything when orjson is not installed.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is None and self.compact and not self.ensure_ascii:
+            return dumps(data, fast=True)
+        return super().render(data, accepted_media_type, renderer_context)
+
+
+class ORJSONParser(JSONParser):
+    """
+    ``JSONParser`` with orjson doing the decoding.
+
+    Selected with ``API_JSON_BACKEND=orjson``. Bodies that are not UTF-8, or that
+    orjson rejects, go through the stock parser so the parsed data and error messages
+    stay the same.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or encoding.lower().replace("-", "") != "utf8":
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            return super().parse(io.BytesIO(body), media_type, parser_context)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON.
+
+    Export actions stream their rows themselves; this renderer only takes part in
+    content negotiation and renders non-streamed bodies (such as errors) as one line.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return dumps(data) + b"\n"
+
+
+class CSVRenderer(NDJSONRenderer):
+    """
+    Comma-separated values.
+
+    Like ``NDJSONRenderer`` this only negotiates the format of export actions;
+    non-streamed bodies (errors) are written as a JSON line.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
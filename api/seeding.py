@@ -0,0 +1,204 @@
+"""
+Deterministic synthetic data for the API app.
+"""
+
+import math
+import random
+import unicodedata
+import uuid
+from bisect import bisect
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+
+from .cache import bump_model_version
+from .loading import BulkLoader
+from .models import Person, Product
+
+# Namespace for the per-seed offsets of generated primary keys.
+SEED_NAMESPACE = uuid.UUID("6f1c1e84-5b0e-4c8a-9a55-0a3c2f5e7d10")
+# Odd multiplier: ``index * ID_MULTIPLIER`` is a bijection modulo 2**128.
+ID_MULTIPLIER = 0x9E3779B97F4A7C15F39CC0605CEDC835
+ID_MASK = (1 << 128) - 1
+
+FIRST_NAMES = [
+    "María", "José", "Juan", "Ana", "Luis", "Carmen", "Carlos", "Laura", "Jorge", "Lucía",
+    "James", "Mary", "John", "Patricia", "Robert", "Jennifer", "Michael", "Linda", "David",
+    "Elizabeth", "Wei", "Yuki", "Aarav", "Fatima", "Olga", "Pierre", "Giulia", "Hans",
+    "Sofía", "Mateo", "Valentina", "Santiago", "Camila", "Diego", "Isabella", "Emma", "Noah",
+]  # fmt: skip
+
+LAST_NAMES = [
+    "García", "Rodríguez", "González", "Fernández", "López", "Martínez", "Sánchez", "Pérez",
+    "Gómez", "Martín", "Smith", "Johnson", "Williams", "Brown", "Jones", "Miller", "Davis",
+    "Wilson", "Anderson", "Taylor", "Müller", "Rossi", "Dubois", "Silva", "Kowalski",
+    "Nguyen", "Kim", "Tanaka", "Ivanova", "O'Brien", "van der Berg", "Díaz", "Torres",
+]  # fmt: skip
+
+EMAIL_DOMAINS = ["example.com", "example.org", "example.net", "mail.example.com"]
+
+PRODUCT_ADJECTIVES = [
+    "Wireless", "Ergonomic", "Portable", "Compact", "Smart", "Premium", "Ultra", "Pro",
+    "Mini", "Classic", "Gaming", "Rugged", "Slim", "Refurbished", "Eco", "Heavy-Duty",
+]  # fmt: skip
+
+PRODUCT_NOUNS = [
+    "Laptop", "Mouse", "Keyboard", "Monitor", "Desk", "Chair", "Lamp", "Cable", "Charger",
+    "Speaker", "Headset", "Webcam", "Router", "Tablet", "Phone", "Printer", "Backpack",
+    "Microphone", "Dock", "SSD", "Hub", "Stand", "Adapter", "Controller", "Projector",
+]  # fmt: skip
+
+PRODUCT_BRANDS = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Vandelay", "Stark", "Wayne"]
+
+
+def zipf_weights(count, exponent=1.0):
+    """Cumulative weights making the first items of a vocabulary the most common."""
+    total = 0.0
+    cumulative = []
+    for rank in range(1, count + 1):
+        total += 1 / rank**exponent
+        cumulative.append(total)
+    return cumulative
+
+
+class Vocabulary:
+    """Draw words with a Zipf-like skew (rank 1 most frequent)."""
+
+    def __init__(self, words):
+        self.words = words
+        self.cum_weights = zipf_weights(len(words))
+        self.total = self.cum_weights[-1]
+
+    def draw(self, rng):
+        # Same as rng.choices(words, cum_weights=...)[0] without its per-call setup.
+        return self.words[bisect(self.cum_weights, rng.random() * self.total)]
+
+
+class Seeder:
+    """
+    Generate persons and products deterministically and load them with ``BulkLoader``.
+
+    The same ``seed`` always produces the same rows, primary keys included, so a rerun
+    inserts nothing new and datasets can be rebuilt identically on any machine:
+
+    - owners follow a Zipf-like (log-uniform rank) distribution, so a few persons own
+      most products, and ``unowned`` of the products have no owner;
+    - prices are log-normal (median ~35) with most ending in ``.99``;
+    - names come from small vocabularies drawn with Zipf weights;
+    - ``created_at`` is spread uniformly over the ``days`` before ``until``, and rows
+      are seeded as never modified (``updated_at == created_at``).
+    """
+
+    def __init__(self, seed, until, days=365, unowned=0.1, batch_size=50000):
+        self.seed = seed
+        self.until = until
+        self.span_seconds = days * 86400
+        self.unowned = unowned
+        self.batch_size = batch_size
+        self.first_names = Vocabulary(FIRST_NAMES)
+        self.last_names = Vocabulary(LAST_NAMES)
+        self.adjectives = Vocabulary(PRODUCT_ADJECTIVES)
+        self.nouns = Vocabulary(PRODUCT_NOUNS)
+        self.brands = Vocabulary(PRODUCT_BRANDS)
+        self.id_offsets = {}
+
+    def row_id(self, kind, index):
+        # A multiplicative mix instead of uuid5 per row: unique, scattered across the
+        # key space like random UUIDs, recomputable from the index, and much cheaper.
+        offset = self.id_offsets.get(kind)
+        if offset is None:
+            offset = uuid.uuid5(SEED_NAMESPACE, f"{self.seed}:{kind}").int
+            self.id_offsets[kind] = offset
+        return uuid.UUID(int=(index * ID_MULTIPLIER + offset) & ID_MASK)
+
+    def created_at(self, rng):
+        return self.until - timedelta(seconds=rng.random() * self.span_seconds)
+
+    def persons(self, count):
+        rng = random.Random(f"{self.seed}:persons")
+        for index in range(count):
+            first = self.first_names.draw(rng)
+            last = self.last_names.draw(rng)
+            local = ascii_fold(f"{first}.{last}".lower().replace(" ", "").replace("'", ""))
+            domain = EMAIL_DOMAINS[index % len(EMAIL_DOMAINS)]
+            created_at = self.created_at(rng)
+            yield (
+                self.row_id("person", index),
+                first,
+                last,
+                # Index and seed keep emails unique within and across seeded datasets.
+                f"{local}.{index}@s{self.seed}.{domain}",
+                created_at,
+                created_at,
+            )
+
+    def products(self, count, persons):
+        rng = random.Random(f"{self.seed}:products")
+        for index in range(count):
+            owner = None
+            if persons and rng.random() >= self.unowned:
+                # int(persons ** u) is log-uniform over 1..persons: rank k is owned ~1/k.
+                owner = self.row_id("person", int(persons ** rng.random()) - 1)
+            name = f"{self.brands.draw(rng)} {self.adjectives.draw(rng)} {self.nouns.draw(rng)}"
+            price = self.price(rng)
+            created_at = self.created_at(rng)
+            yield (
+                self.row_id("product", index),
+                name,
+                f"S{self.seed}-{index:09d}",
+                price,
+                owner,
+                created_at,
+                created_at,
+            )
+
+    def price(self, rng):
+        value = min(math.exp(rng.gauss(3.55, 1.1)), 99_999_999)
+        if rng.random() < 0.7:
+            return Decimal(f"{max(math.floor(value), 1) - 1}.99")
+        return Decimal(f"{value:.2f}")
+
+    def load(self, model, columns, rows, progress=None):
+        """Load ``rows`` in batches; return how many were inserted."""
+        loader = BulkLoader(model, columns)
+        inserted = 0
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                inserted += loader.load(batch)
+                batch = []
+                if progress:
+                    progress(model, inserted)
+        inserted += loader.load(batch)
+        if progress:
+            progress(model, inserted)
+        if inserted:
+            bump_model_version(model)
+        return inserted
+
+    def run(self, persons, products, progress=None):
+        """Seed ``persons`` persons and ``products`` products; return the inserted counts."""
+        created_persons = self.load(
+            Person,
+            ["id", "first_name", "last_name", "email", "created_at", "updated_at"],
+            self.persons(persons),
+            progress,
+        )
+        created_products = self.load(
+            Product,
+            ["id", "name", "sku", "price", "owner", "created_at", "updated_at"],
+            self.products(products, persons),
+            progress,
+        )
+        if connection.vendor == "postgresql":
+            # Refresh planner statistics (and the row estimate behind list counts).
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE persons, products")
+        return created_persons, created_products
+
+
+def ascii_fold(text):
+    """Strip accents so generated names make valid ASCII email addresses."""
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode("ascii")
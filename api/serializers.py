@@ -2,12 +2,27 @@
 Serializers for the API app.
 """
 
+from contextlib import contextmanager
+
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from rest_framework.validators import UniqueValidator
 
+from .cache import get_object_cache
 from .models import Person, Product
 
 
-class PersonSerializer(serializers.ModelSerializer):
+class SparseFieldsMixin:
+    """Serializer taking a ``fields`` argument that limits the output (``?fields=``)."""
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in [name for name in self.fields if name not in fields]:
+                self.fields.pop(name)
+
+
+class PersonSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Person model."""
 
     class Meta:
@@ -16,7 +31,7 @@ class PersonSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at"]
 
 
-class PersonListSerializer(serializers.ModelSerializer):
+class PersonListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for Person list view."""
 
     class Meta:
@@ -24,7 +39,25 @@ class PersonListSerializer(serializers.ModelSerializer):
         fields = ["id", "first_name", "last_name", "email", "created_at"]
 
 
-class ProductSerializer(serializers.ModelSerializer):
+class PersonProductSerializer(serializers.ModelSerializer):
+    """Product embedded in a person with ``?expand=products``."""
+
+    class Meta:
+        model = Product
+        fields = ["id", "name", "sku", "price", "created_at"]
+
+
+class PersonExpandedSerializer(PersonListSerializer):
+    """Person with their newest products (``?expand=products``)."""
+
+    # Filled by the capped Prefetch(to_attr="newest_products") in PersonViewSet.
+    products = PersonProductSerializer(source="newest_products", many=True, read_only=True)
+
+    class Meta(PersonListSerializer.Meta):
+        fields = PersonListSerializer.Meta.fields + ["products"]
+
+
+class ProductSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer for Product model."""
 
     owner = PersonSerializer(read_only=True)
@@ -34,14 +67,16 @@ class ProductSerializer(serializers.ModelSerializer):
         model = Product
         fields = ["id", "name", "sku", "price", "owner", "owner_id", "created_at"]
         read_only_fields = ["id", "created_at"]
-
-    def validate_sku(self, value):
-        """Validate SKU uniqueness on update."""
-        if self.instance and self.instance.sku == value:
-            return value
-        if Product.objects.filter(sku=value).exists():
-            raise serializers.ValidationError("A product with this SKU already exists.")
-        return value
+        extra_kwargs = {
+            "sku": {
+                "validators": [
+                    UniqueValidator(
+                        queryset=Product.objects.all(),
+                        message="A product with this SKU already exists.",
+                    )
+                ]
+            }
+        }
 
     def validate_price(self, value):
         """Validate price is non-negative."""
@@ -54,13 +89,14 @@ class ProductSerializer(serializers.ModelSerializer):
         owner_id = validated_data.pop("owner_id", None)
         if owner_id:
             try:
-                owner = Person.objects.get(id=owner_id)
+                owner = get_object_cache(Person).get(owner_id)
                 validated_data["owner"] = owner
             except Person.DoesNotExist:
                 raise serializers.ValidationError(
                     {"owner_id": "Person with this ID does not exist."}
                 )
-        return super().create(validated_data)
+        with self.owner_integrity(owner_id):
+            return super().create(validated_data)
 
     def update(self, instance, validated_data):
         """Update product with optional owner."""
@@ -70,7 +106,7 @@ class ProductSerializer(serializers.ModelSerializer):
             owner_id = validated_data.pop("owner_id")
             if owner_id:
                 try:
-                    owner = Person.objects.get(id=owner_id)
+                    owner = get_object_cache(Person).get(owner_id)
                     validated_data["owner"] = owner
                 except Person.DoesNotExist:
                     raise serializers.ValidationError(
@@ -79,10 +115,31 @@ class ProductSerializer(serializers.ModelSerializer):
             else:
                 # owner_id is explicitly None, remove owner
                 validated_data["owner"] = None
+            with self.owner_integrity(owner_id):
+                return super().update(instance, validated_data)
         return super().update(instance, validated_data)
 
-
-class ProductListSerializer(serializers.ModelSerializer):
+    @contextmanager
+    def owner_integrity(self, owner_id):
+        """
+        Report a foreign key violation on ``owner_id`` inside the block as a 400.
+
+        The owner was resolved through the object cache, whose per-process tier can
+        still hold a person another worker has just deleted.
+        """
+        try:
+            with transaction.atomic():
+                yield
+        except IntegrityError:
+            if not owner_id or Person.objects.filter(pk=owner_id).exists():
+                raise
+            get_object_cache(Person).invalidate(owner_id)
+            raise serializers.ValidationError(
+                {"owner_id": "Person with this ID does not exist."}
+            ) from None
+
+
+class ProductListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Lightweight serializer for Product list view."""
 
     owner_name = serializers.SerializerMethodField()
@@ -94,3 +151,30 @@ class ProductListSerializer(serializers.ModelSerializer):
     def get_owner_name(self, obj):
         """Return owner name or None if no owner."""
         return str(obj.owner) if obj.owner else None
+
+
+class BulkRowMixin:
+    """
+    Per-row validation for bulk endpoints.
+
+    Drops the ``UniqueValidator``s that would issue one query per row; the bulk
+    services in ``api.bulk`` check uniqueness for the whole batch in a single query.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for field in fields.values():
+            field.validators = [
+                validator
+                for validator in field.validators
+                if not isinstance(validator, UniqueValidator)
+            ]
+        return fields
+
+
+class PersonBulkSerializer(BulkRowMixin, PersonSerializer):
+    """Validates one row of a bulk person request."""
+
+
+class ProductBulkSerializer(BulkRowMixin, ProductSerializer):
+    """Validates one row of a bulk product request."""
@@ -0,0 +1,48 @@
+"""
+Signal handlers for the API app.
+"""
+
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .cache import bump_model_version, get_object_cache
+from .models import Person, Product
+
+
+def invalidate_objects(model, *pks):
+    """
+    Drop the cached ``model`` instances with ``pks`` now and again once the transaction commits.
+
+    A concurrent request can re-cache the old rows between the write and the commit.
+    """
+    object_cache = get_object_cache(model)
+    object_cache.invalidate(*pks)
+    transaction.on_commit(lambda: object_cache.invalidate(*pks))
+
+
+@receiver(post_save, sender=Person)
+@receiver(post_delete, sender=Person)
+def person_changed(sender, instance, **kwargs):
+    """Invalidate cached data derived from persons."""
+    bump_model_version(Person)
+    invalidate_objects(type(instance), instance.pk)
+
+
+@receiver(pre_delete, sender=Person)
+def person_deleting(sender, instance, **kwargs):
+    """Mark the person's products as modified before ON DELETE SET NULL clears their owner."""
+    pks = list(Product.objects.filter(owner=instance).values_list("pk", flat=True))
+    if pks:
+        Product.objects.filter(pk__in=pks).update(updated_at=timezone.now())
+        bump_model_version(Product)
+        invalidate_objects(Product, *pks)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def product_changed(sender, instance, **kwargs):
+    """Invalidate cached data derived from products."""
+    bump_model_version(Product)
+    invalidate_objects(type(instance), instance.pk)
@@ -0,0 +1,38 @@
+"""
+Latency statistics shared by the load test and the benchmark scripts.
+"""
+
+import math
+import statistics
+
+
+def percentile(sorted_samples, pct):
+    """Return the nearest-rank ``pct`` percentile (0-100) of already sorted samples."""
+    if not sorted_samples:
+        return 0.0
+    index = min(len(sorted_samples) - 1, max(0, math.ceil(pct / 100 * len(sorted_samples)) - 1))
+    return sorted_samples[index]
+
+
+def summarize(samples, digits=3):
+    """Summarize durations in seconds as a dict of millisecond statistics."""
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, digits) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 50) * 1000, digits),
+        "p95_ms": round(percentile(ordered, 95) * 1000, digits),
+        "p99_ms": round(percentile(ordered, 99) * 1000, digits),
+        "max_ms": round(ordered[-1] * 1000, digits) if ordered else 0.0,
+    }
+
+
+def print_table(rows, columns, write=print):
+    """Write ``rows`` (a list of dicts) as an aligned text table, one ``write`` per line."""
+    widths = {
+        column: max([len(column)] + [len(str(row.get(column, ""))) for row in rows])
+        for column in columns
+    }
+    write("  ".join(column.ljust(widths[column]) for column in columns))
+    for row in rows:
+        write("  ".join(str(row.get(column, "")).ljust(widths[column]) for column in columns))
@@ -0,0 +1,201 @@
+"""
+Tests for bulk endpoints.
+"""
+
+import uuid
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.models import Person, Product
+
+
+@pytest.fixture
+def api_client():
+    """Create API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def owner():
+    """Create a product owner."""
+    return Person.objects.create(first_name="John", last_name="Doe", email="john@example.com")
+
+
+@pytest.mark.django_db
+class TestPersonBulkCreate:
+    """Tests for POST /persons/bulk/."""
+
+    def test_bulk_create_persons(self, api_client):
+        """Test creating many persons in one request."""
+        rows = [
+            {"first_name": f"P{i}", "last_name": "Test", "email": f"p{i}@example.com"}
+            for i in range(50)
+        ]
+        response = api_client.post(reverse("person-bulk-create"), rows, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["created"] == 50
+        assert response.data["errors"] == []
+        assert Person.objects.count() == 50
+        ids = {row["id"] for row in response.data["results"]}
+        assert ids == {str(pk) for pk in Person.objects.values_list("id", flat=True)}
+
+    def test_bulk_create_reports_per_row_errors(self, api_client, owner):
+        """Test that invalid rows are reported without failing the batch."""
+        rows = [
+            {"first_name": "Ok", "last_name": "Row", "email": "ok@example.com"},
+            {"first_name": "Bad", "last_name": "Email", "email": "not-an-email"},
+            {"first_name": "Taken", "last_name": "Email", "email": owner.email},
+            {"first_name": "Dup", "last_name": "Row", "email": "ok@example.com"},
+        ]
+        response = api_client.post(reverse("person-bulk-create"), rows, format="json")
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        assert response.data["created"] == 1
+        assert [error["index"] for error in response.data["errors"]] == [1, 2, 3]
+        assert all("email" in error["errors"] for error in response.data["errors"])
+        assert Person.objects.count() == 2
+
+    def test_bulk_create_rejects_non_list(self, api_client):
+        """Test that the body must be a list."""
+        response = api_client.post(
+            reverse("person-bulk-create"), {"first_name": "x"}, format="json"
+        )
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_bulk_create_enforces_max_rows(self, api_client, settings):
+        """Test that oversized batches are rejected up front."""
+        settings.API_BULK_MAX_ROWS = 2
+        rows = [
+            {"first_name": f"P{i}", "last_name": "Test", "email": f"p{i}@example.com"}
+            for i in range(3)
+        ]
+        response = api_client.post(reverse("person-bulk-create"), rows, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert Person.objects.count() == 0
+
+
+@pytest.mark.django_db
+class TestProductBulkCreate:
+    """Tests for POST /products/bulk/."""
+
+    def test_bulk_create_products_in_constant_queries(
+        self, api_client, owner, django_assert_max_num_queries
+    ):
+        """Test that query count does not grow with the batch size."""
+        rows = [
+            {
+                "name": f"Product {i}",
+                "sku": f"SKU-{i:04}",
+                "price": "9.99",
+                "owner_id": str(owner.id),
+            }
+            for i in range(200)
+        ]
+        with django_assert_max_num_queries(6):
+            response = api_client.post(reverse("product-bulk-create"), rows, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.data["created"] == 200
+        assert Product.objects.filter(owner=owner).count() == 200
+
+    def test_bulk_create_products_reports_per_row_errors(self, api_client, owner):
+        """Test SKU, owner and field errors are reported by index."""
+        Product.objects.create(name="Existing", sku="SKU-TAKEN", price="1.00")
+        rows = [
+            {"name": "Ok", "sku": "SKU-OK", "price": "1.00", "owner_id": str(owner.id)},
+            {"name": "Taken", "sku": "SKU-TAKEN", "price": "1.00"},
+            {
+                "name": "Ghost owner",
+                "sku": "SKU-GHOST",
+                "price": "1.00",
+                "owner_id": str(uuid.uuid4()),
+            },
+            {"name": "Negative", "sku": "SKU-NEG", "price": "-1.00"},
+        ]
+        response = api_client.post(reverse("product-bulk-create"), rows, format="json")
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        errors = {error["index"]: error["errors"] for error in response.data["errors"]}
+        assert set(errors) == {1, 2, 3}
+        assert "sku" in errors[1]
+        assert "owner_id" in errors[2]
+        assert "price" in errors[3]
+        assert Product.objects.filter(sku="SKU-OK", owner=owner).exists()
+
+    def test_bulk_create_all_invalid(self, api_client):
+        """Test that a batch without valid rows returns 400."""
+        rows = [{"name": "No price", "sku": "SKU-001"}]
+        response = api_client.post(reverse("product-bulk-create"), rows, format="json")
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert response.data["created"] == 0
+
+    def test_bulk_create_invalidates_list_counts(self, api_client):
+        """Test that cached list counts see rows created in bulk."""
+        url = reverse("product-list")
+        assert api_client.get(url).data["count"] == 0
+
+        rows = [{"name": "Product", "sku": "SKU-001", "price": "1.00"}]
+        api_client.post(reverse("product-bulk-create"), rows, format="json")
+        assert api_client.get(url).data["count"] == 1
+
+
+@pytest.mark.django_db
+class TestProductUpsert:
+    """Tests for POST /products/upsert/."""
+
+    def test_upsert_inserts_and_updates(self, api_client, owner):
+        """Test that existing SKUs are updated and new ones inserted."""
+        existing = Product.objects.create(name="Old", sku="SKU-001", price="1.00", owner=owner)
+        rows = [
+            {"name": "New name", "sku": "SKU-001", "price": "2.50"},
+            {"name": "Brand new", "sku": "SKU-002", "price": "3.00", "owner_id": str(owner.id)},
+        ]
+        response = api_client.post(reverse("product-upsert"), rows, format="json")
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["inserted"] == 1
+        assert response.data["updated"] == 1
+
+        existing.refresh_from_db()
+        assert existing.name == "New name"
+        assert str(existing.price) == "2.50"
+        assert existing.owner == owner  # omitted owner_id keeps the current owner
+        assert Product.objects.get(sku="SKU-002").owner == owner
+
+    def test_upsert_is_idempotent(self, api_client):
+        """Test that replaying a request changes nothing."""
+        rows = [{"name": f"Product {i}", "sku": f"SKU-{i:03}", "price": "1.00"} for i in range(10)]
+        first = api_client.post(reverse("product-upsert"), rows, format="json")
+        created_at = dict(Product.objects.values_list("sku", "created_at"))
+
+        second = api_client.post(reverse("product-upsert"), rows, format="json")
+        assert first.data["inserted"] == 10
+        assert second.data["inserted"] == 0
+        assert second.data["updated"] == 10
+        assert Product.objects.count() == 10
+        assert dict(Product.objects.values_list("sku", "created_at")) == created_at
+
+    def test_upsert_can_clear_owner(self, api_client, owner):
+        """Test that an explicit null owner_id removes the owner."""
+        Product.objects.create(name="Owned", sku="SKU-001", price="1.00", owner=owner)
+        rows = [{"name": "Owned", "sku": "SKU-001", "price": "1.00", "owner_id": None}]
+        api_client.post(reverse("product-upsert"), rows, format="json")
+        assert Product.objects.get(sku="SKU-001").owner is None
+
+    def test_upsert_rejects_duplicate_skus_in_request(self, api_client):
+        """Test that a SKU repeated within one request is reported."""
+        rows = [
+            {"name": "First", "sku": "SKU-001", "price": "1.00"},
+            {"name": "Second", "sku": "SKU-001", "price": "2.00"},
+        ]
+        response = api_client.post(reverse("product-upsert"), rows, format="json")
+        assert response.status_code == status.HTTP_207_MULTI_STATUS
+        assert response.data["errors"][0]["index"] == 1
+        assert Product.objects.get(sku="SKU-001").name == "First"
+
+    def test_upsert_in_batches(self, api_client, settings, django_assert_max_num_queries):
+        """Test that each batch costs a constant number of queries."""
+        settings.API_BULK_BATCH_SIZE = 50
+        rows = [{"name": f"Product {i}", "sku": f"SKU-{i:03}", "price": "1.00"} for i in range(200)]
+        with django_assert_max_num_queries(4 + 2 * 4):
+            response = api_client.post(reverse("product-upsert"), rows, format="json")
+        assert response.data["inserted"] == 200
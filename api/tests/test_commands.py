@@ -0,0 +1,148 @@
+"""
+Tests for management commands.
+"""
+
+import csv
+import io
+import json
+from collections import Counter
+from datetime import UTC, datetime
+from decimal import Decimal
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from api.models import Person, Product
+
+
+@pytest.fixture
+def owner():
+    """Create a person that imported products can reference."""
+    return Person.objects.create(first_name="John", last_name="Doe", email="john@example.com")
+
+
+def write(path, text):
+    path.write_text(text, encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.django_db
+class TestImportCommands:
+    """Tests for import_persons and import_products."""
+
+    def test_import_persons_csv(self, tmp_path):
+        """Test importing persons from CSV."""
+        path = write(
+            tmp_path / "persons.csv",
+            "first_name,last_name,email\nJane,Doe,jane@example.com\n Ann ,Lee,ann@example.com\n",
+        )
+        out = io.StringIO()
+        call_command("import_persons", path, stdout=out)
+        assert set(Person.objects.values_list("first_name", flat=True)) == {"Jane", "Ann"}
+        assert "Imported 2 persons from 2 rows" in out.getvalue()
+
+    def test_import_products_ndjson(self, tmp_path, owner):
+        """Test importing products from NDJSON with and without owner."""
+        rows = [
+            {"name": "Laptop", "sku": "LAP-001", "price": "999.99", "owner_id": str(owner.id)},
+            {"name": "Mouse", "sku": "MOU-001", "price": 19.9},
+        ]
+        path = write(tmp_path / "products.ndjson", "".join(json.dumps(r) + "\n" for r in rows))
+        call_command("import_products", path, stdout=io.StringIO())
+        laptop = Product.objects.get(sku="LAP-001")
+        assert laptop.owner == owner
+        assert laptop.created_at is not None
+        assert Product.objects.get(sku="MOU-001").price == Decimal("19.90")
+
+    def test_import_rejects_invalid_rows(self, tmp_path, owner):
+        """Test that invalid rows are rejected by line without stopping the import."""
+        path = write(
+            tmp_path / "products.csv",
+            "name,sku,price,owner_id\n"
+            "Laptop,LAP-001,999.99,\n"
+            "Bad price,BAD-001,-1,\n"
+            "Short sku,AB,1.00,\n"
+            "Orphan,ORP-001,1.00,00000000-0000-0000-0000-000000000000\n"
+            "Owned,OWN-001,1.00," + str(owner.id) + "\n",
+        )
+        rejects = tmp_path / "rejects.csv"
+        out = io.StringIO()
+        call_command(
+            "import_products", path, "--rejects", str(rejects), "--batch-size", "2", stdout=out
+        )
+        assert set(Product.objects.values_list("sku", flat=True)) == {"LAP-001", "OWN-001"}
+        with open(rejects, newline="", encoding="utf-8") as fh:
+            report = {int(row["line"]): json.loads(row["errors"]) for row in csv.DictReader(fh)}
+        assert set(report) == {3, 4, 5}
+        assert "price" in report[3]
+        assert "sku" in report[4]
+        assert "owner_id" in report[5]
+        assert "3 rejected" in out.getvalue()
+
+    def test_import_skips_existing_rows(self, tmp_path):
+        """Test that rows conflicting with stored unique values are skipped."""
+        Product.objects.create(name="Old", sku="LAP-001", price="1.00")
+        path = write(
+            tmp_path / "products.csv",
+            "name,sku,price\nNew,LAP-001,2.00\nMouse,MOU-001,3.00\nDup,MOU-001,4.00\n",
+        )
+        out = io.StringIO()
+        call_command("import_products", path, stdout=out)
+        assert Product.objects.get(sku="LAP-001").name == "Old"
+        assert Product.objects.get(sku="MOU-001").name == "Mouse"
+        assert "2 skipped" in out.getvalue()
+
+    def test_import_unknown_format(self, tmp_path):
+        """Test that an unknown file extension needs --format."""
+        path = write(tmp_path / "persons.txt", "")
+        with pytest.raises(CommandError):
+            call_command("import_persons", path)
+
+
+@pytest.mark.django_db
+class TestSeedCommand:
+    """Tests for the seed command."""
+
+    def seed(self, *args):
+        call_command(
+            "seed", "--persons", "40", "--products", "400", "--until", "2025-01-01", *args,
+            stdout=io.StringIO(),
+        )  # fmt: skip
+
+    def test_seed_is_deterministic(self):
+        """Test that the same seed generates the same rows and reruns insert nothing."""
+        self.seed()
+        first = sorted(Product.objects.values_list("id", "name", "sku", "price", "owner_id"))
+        assert Person.objects.count() == 40
+        assert len(first) == 400
+
+        self.seed()
+        assert Person.objects.count() == 40
+        assert sorted(Product.objects.values_list("id", "name", "sku", "price", "owner_id")) == (
+            first
+        )
+
+        Product.objects.all().delete()
+        self.seed()
+        assert (
+            sorted(Product.objects.values_list("id", "name", "sku", "price", "owner_id")) == first
+        )
+
+    def test_seed_distributions(self):
+        """Test owner skew, unowned share, prices and created_at range."""
+        self.seed("--unowned", "0.2")
+        owned = Counter(
+            Product.objects.exclude(owner=None).values_list("owner_id", flat=True)
+        ).most_common()
+        # Zipf-like: the top owner has several times the average share.
+        assert owned[0][1] > 4 * (400 / 40)
+        assert 40 < Product.objects.filter(owner=None).count() < 130
+        assert Product.objects.filter(price__lt=0).count() == 0
+        assert not Product.objects.filter(created_at__gt=datetime(2025, 1, 1, tzinfo=UTC)).exists()
+
+    def test_seeds_do_not_collide(self):
+        """Test that datasets generated with different seeds coexist."""
+        self.seed("--seed", "1")
+        self.seed("--seed", "2")
+        assert Person.objects.count() == 80
+        assert Product.objects.count() == 800
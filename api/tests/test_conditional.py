@@ -0,0 +1,195 @@
+"""
+Tests for conditional GET (ETag / Last-Modified) on the API resources.
+"""
+
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.models import Person, Product
+from api.projection import ProductListProjection
+from api.serializers import ProductSerializer
+
+
+@pytest.fixture
+def api_client():
+    """Create API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def product():
+    """Create a product with an owner."""
+    owner = Person.objects.create(first_name="Ada", last_name="Lovelace", email="ada@example.com")
+    return Product.objects.create(name="Engine", sku="COND-001", price="10.00", owner=owner)
+
+
+def revalidate(api_client, url, response, params=None):
+    """Repeat a request with the validators of ``response``."""
+    return api_client.get(url, params, HTTP_IF_NONE_MATCH=response["ETag"])
+
+
+@pytest.mark.django_db
+class TestConditionalRetrieve:
+    """Tests for ETag/Last-Modified on retrieve."""
+
+    def test_not_modified_skips_serializer(self, api_client, product):
+        """Test a matching If-None-Match returns an empty 304 without serializing."""
+        url = reverse("product-detail", kwargs={"pk": product.id})
+        first = api_client.get(url)
+        assert first["Last-Modified"] == http_date(int(product.updated_at.timestamp()))
+        with mock.patch.object(ProductSerializer, "to_representation") as to_representation:
+            response = revalidate(api_client, url, first)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.content == b""
+        assert response["ETag"] == first["ETag"]
+        to_representation.assert_not_called()
+
+    def test_if_modified_since(self, api_client, product):
+        """Test If-Modified-Since at or after Last-Modified returns 304."""
+        url = reverse("person-detail", kwargs={"pk": product.owner_id})
+        first = api_client.get(url)
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+    def test_update_changes_etag(self, api_client, product):
+        """Test saving the product invalidates the client's copy."""
+        url = reverse("product-detail", kwargs={"pk": product.id})
+        first = api_client.get(url)
+        api_client.patch(url, {"price": "11.00"}, format="json")
+        response = revalidate(api_client, url, first)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["price"] == "11.00"
+
+    def test_owner_update_changes_etag(self, api_client, product):
+        """Test renaming the embedded owner invalidates the product's ETag."""
+        url = reverse("product-detail", kwargs={"pk": product.id})
+        first = api_client.get(url)
+        product.owner.first_name = "Augusta"
+        product.owner.save()
+        assert revalidate(api_client, url, first).status_code == status.HTTP_200_OK
+
+    def test_owner_delete_changes_etag(self, api_client, product):
+        """Test ON DELETE SET NULL moves the product's updated_at forward."""
+        url = reverse("product-detail", kwargs={"pk": product.id})
+        first = api_client.get(url)
+        product.owner.delete()
+        assert Product.objects.get(pk=product.pk).updated_at > product.updated_at
+        assert revalidate(api_client, url, first).json()["owner"] is None
+
+    def test_owner_delete_refreshes_cached_product(self, api_client, product):
+        """Test a cached product is not confirmed with 304 after its owner is deleted."""
+        # Last-Modified has second precision; start from rows written an hour ago.
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        Person.objects.filter(pk=product.owner_id).update(updated_at=an_hour_ago)
+        Product.objects.filter(pk=product.pk).update(updated_at=an_hour_ago)
+        url = reverse("product-detail", kwargs={"pk": product.id})
+        first = api_client.get(url)
+        product.owner.delete()
+        response = api_client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["owner"] is None
+        updated_at = Product.objects.get(pk=product.pk).updated_at
+        assert response["Last-Modified"] == http_date(int(updated_at.timestamp()))
+
+    def test_fields_are_part_of_etag(self, api_client, product):
+        """Test each ?fields= selection gets its own ETag."""
+        url = reverse("product-detail", kwargs={"pk": product.id})
+        full = api_client.get(url)
+        sparse = api_client.get(url, {"fields": "sku"})
+        assert full["ETag"] != sparse["ETag"]
+        assert revalidate(api_client, url, sparse).status_code == status.HTTP_200_OK
+        response = revalidate(api_client, url, sparse, {"fields": "sku"})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.django_db
+class TestConditionalList:
+    """Tests for ETags on list pages."""
+
+    def test_not_modified_skips_serialization(self, api_client, product):
+        """Test a matching If-None-Match returns 304 before the page is serialized."""
+        url = reverse("product-list")
+        first = api_client.get(url, {"cursor": ""}, format="json")
+        assert "Last-Modified" not in first
+        with mock.patch.object(ProductListProjection, "serialize") as serialize:
+            response = revalidate(api_client, url, first, {"cursor": ""})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        serialize.assert_not_called()
+
+    def test_not_modified_miss_fills_cache(self, api_client, product, django_assert_num_queries):
+        """Test a 304 answered on a cache miss still stores the page for the next poll."""
+        url = reverse("product-list")
+        first = api_client.get(url)
+        cache.clear()
+        response = revalidate(api_client, url, first)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        with django_assert_num_queries(0):
+            response = revalidate(api_client, url, first)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert api_client.get(url)["X-Cache"] == "HIT"
+
+    def test_not_modified_without_response_cache(self, api_client, product, settings):
+        """Test lists answer 304 from the page rows when the response cache is off."""
+        settings.API_LIST_CACHE_TTL = 0
+        url = reverse("product-list")
+        first = api_client.get(url)
+        with mock.patch.object(ProductListProjection, "serialize") as serialize:
+            response = revalidate(api_client, url, first)
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        serialize.assert_not_called()
+
+    def test_row_changes_change_etag(self, api_client, product, settings):
+        """Test updates, owner renames, inserts and deletes all change the ETag."""
+        settings.API_LIST_CACHE_TTL = 0
+        url = reverse("product-list")
+        etags = [api_client.get(url)["ETag"]]
+
+        product.price = "12.00"
+        product.save()
+        etags.append(api_client.get(url)["ETag"])
+
+        product.owner.first_name = "Augusta"
+        product.owner.save()
+        etags.append(api_client.get(url)["ETag"])
+
+        Product.objects.create(name="Wheel", sku="COND-002", price="1.00")
+        etags.append(api_client.get(url)["ETag"])
+
+        product.delete()
+        etags.append(api_client.get(url)["ETag"])
+        assert len(set(etags)) == len(etags)
+
+    def test_count_is_part_of_etag(self, api_client, settings):
+        """Test a row deleted outside the page still changes the page-number ETag."""
+        settings.API_LIST_CACHE_TTL = 0
+        Product.objects.bulk_create(
+            Product(name="Item", sku=f"COND-1{i:02d}", price="1.00") for i in range(25)
+        )
+        url = reverse("product-list")
+        first = api_client.get(url)
+        last = Product.objects.order_by("created_at", "id").first()
+        last.delete()
+        response = revalidate(api_client, url, first)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["count"] == 24
+
+    def test_expanded_list_has_no_etag(self, api_client, product):
+        """Test ?expand=products, which embeds another table, is not conditional."""
+        response = api_client.get(reverse("person-list"), {"expand": "products"})
+        assert "ETag" not in response
+
+    def test_expanded_retrieve_has_no_validators(self, api_client, product):
+        """Test ?expand=products on retrieve is not conditional either."""
+        url = reverse("person-detail", args=[product.owner_id])
+        response = api_client.get(url, {"expand": "products"})
+        assert response.status_code == status.HTTP_200_OK
+        assert "ETag" not in response
+        assert "Last-Modified" not in response
@@ -0,0 +1,115 @@
+"""
+Tests for embedding a person's products (?expand=products).
+"""
+
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.cache import bump_model_version
+from api.models import Person, Product
+
+
+@pytest.fixture
+def api_client():
+    """Create API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def owners():
+    """Create a big owner (15 products), a small one (2) and one without products."""
+    big = Person.objects.create(first_name="Big", last_name="Owner", email="big@example.com")
+    small = Person.objects.create(first_name="Small", last_name="Owner", email="small@example.com")
+    Person.objects.create(first_name="No", last_name="Products", email="none@example.com")
+    Product.objects.bulk_create(
+        Product(name=f"Big {i}", sku=f"BIG-{i:03d}", price="1.00", owner=big) for i in range(15)
+    )
+    # created_at is auto_now_add; spread it so BIG-000 is the newest.
+    now = timezone.now()
+    for i in range(15):
+        Product.objects.filter(sku=f"BIG-{i:03d}").update(created_at=now - timedelta(minutes=i))
+    Product.objects.bulk_create(
+        Product(name=f"Small {i}", sku=f"SMALL-{i:03d}", price="2.50", owner=small)
+        for i in range(2)
+    )
+    return {"big": big, "small": small}
+
+
+@pytest.mark.django_db
+class TestExpandProducts:
+    """Tests for ?expand=products on the person endpoints."""
+
+    def test_list_embeds_capped_products(self, api_client, owners, settings):
+        """Test each person carries at most API_EXPAND_MAX_PRODUCTS, newest first."""
+        settings.API_EXPAND_MAX_PRODUCTS = 5
+        response = api_client.get(reverse("person-list"), {"expand": "products"})
+        assert response.status_code == status.HTTP_200_OK
+        persons = {row["email"]: row for row in response.json()["results"]}
+        big = [product["sku"] for product in persons["big@example.com"]["products"]]
+        assert big == [f"BIG-{i:03d}" for i in range(5)]
+        assert len(persons["small@example.com"]["products"]) == 2
+        assert persons["none@example.com"]["products"] == []
+        assert set(persons["small@example.com"]["products"][0]) == {
+            "id",
+            "name",
+            "sku",
+            "price",
+            "created_at",
+        }
+
+    def test_list_query_count_is_constant(self, api_client, owners):
+        """Test a page costs the same queries (one for products) however many persons."""
+        url = reverse("person-list")
+        with CaptureQueriesContext(connection) as before:
+            api_client.get(url, {"expand": "products"})
+
+        extra = Person.objects.bulk_create(
+            Person(first_name="Extra", last_name=str(i), email=f"extra{i}@example.com")
+            for i in range(10)
+        )
+        Product.objects.bulk_create(
+            Product(name="Extra", sku=f"EXTRA-{i:03d}", price="1.00", owner=extra[i])
+            for i in range(10)
+        )
+        # bulk_create skips the signals that invalidate the cached list count.
+        bump_model_version(Person)
+        with CaptureQueriesContext(connection) as after:
+            response = api_client.get(url, {"expand": "products"})
+        assert response.json()["count"] == 13
+        assert len(after) == len(before)
+        product_queries = [q for q in after.captured_queries if '"products"' in q["sql"]]
+        assert len(product_queries) == 1
+
+    def test_retrieve_embeds_products(self, api_client, owners, django_assert_num_queries):
+        """Test the detail endpoint embeds products with one extra query."""
+        url = reverse("person-detail", kwargs={"pk": owners["small"].id})
+        with django_assert_num_queries(2):
+            response = api_client.get(url, {"expand": "products"})
+        skus = {product["sku"] for product in response.json()["products"]}
+        assert skus == {"SMALL-000", "SMALL-001"}
+
+    def test_expand_with_sparse_fields(self, api_client, owners):
+        """Test ?fields= can select products alongside other fields."""
+        url = reverse("person-detail", kwargs={"pk": owners["small"].id})
+        response = api_client.get(url, {"expand": "products", "fields": "email,products"})
+        body = response.json()
+        assert set(body) == {"email", "products"}
+        assert len(body["products"]) == 2
+
+    def test_without_expand_has_no_products(self, api_client, owners):
+        """Test the default response shape is unchanged."""
+        response = api_client.get(reverse("person-list"))
+        assert "products" not in response.json()["results"][0]
+
+    def test_unknown_expand_is_rejected(self, api_client, owners):
+        """Test unknown relations return 400."""
+        response = api_client.get(reverse("person-list"), {"expand": "orders"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "orders" in response.json()["expand"][0]
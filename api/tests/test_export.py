@@ -0,0 +1,85 @@
+"""
+Tests for streaming exports.
+"""
+
+import csv
+import io
+import json
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.models import Person, Product
+
+
+@pytest.fixture
+def api_client():
+    """Create API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def catalog():
+    """Create products with and without an owner."""
+    owner = Person.objects.create(first_name="John", last_name="Doe", email="john@example.com")
+    Product.objects.create(name="Laptop", sku="LAP-001", price="999.99", owner=owner)
+    Product.objects.create(name="Mouse, wireless", sku="MOU-001", price="19.90")
+    return owner
+
+
+def read(response):
+    return b"".join(response.streaming_content).decode("utf-8")
+
+
+@pytest.mark.django_db
+class TestExport:
+    """Tests for the export actions."""
+
+    def test_export_products_ndjson_matches_list(self, api_client, catalog):
+        """Test that NDJSON rows are identical to the list endpoint results."""
+        response = api_client.get(reverse("product-export"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert response.streaming
+
+        rows = [json.loads(line) for line in read(response).splitlines()]
+        listed = api_client.get(reverse("product-list")).json()["results"]
+        assert rows == listed
+
+    def test_export_products_csv(self, api_client, catalog):
+        """Test CSV export selected with ?format=csv."""
+        response = api_client.get(reverse("product-export"), {"format": "csv"})
+        assert response.status_code == status.HTTP_200_OK
+        assert response["Content-Type"] == "text/csv"
+        assert 'filename="products.csv"' in response["Content-Disposition"]
+
+        rows = list(csv.DictReader(io.StringIO(read(response))))
+        assert [row["sku"] for row in rows] == ["MOU-001", "LAP-001"]
+        assert rows[0]["name"] == "Mouse, wireless"
+        assert rows[0]["owner_name"] == ""
+        assert rows[1]["owner_name"] == str(catalog)
+
+    def test_export_csv_with_accept_header(self, api_client, catalog):
+        """Test that the format can be negotiated with the Accept header."""
+        response = api_client.get(reverse("person-export"), HTTP_ACCEPT="text/csv")
+        assert response["Content-Type"] == "text/csv"
+        assert read(response).splitlines()[0] == "id,first_name,last_name,email,created_at"
+
+    def test_export_honors_filters(self, api_client, catalog):
+        """Test that list filters apply to the export."""
+        response = api_client.get(reverse("product-export"), {"price_min": "100"})
+        rows = [json.loads(line) for line in read(response).splitlines()]
+        assert [row["sku"] for row in rows] == ["LAP-001"]
+
+    def test_export_streams_in_one_query(self, api_client, settings, django_assert_num_queries):
+        """Test that the export is a single query regardless of size."""
+        settings.API_EXPORT_CHUNK_SIZE = 7
+        for i in range(30):
+            Person.objects.create(first_name=f"P{i}", last_name="Test", email=f"p{i}@example.com")
+
+        with django_assert_num_queries(1):
+            response = api_client.get(reverse("person-export"))
+            lines = read(response).splitlines()
+        assert len(lines) == 30
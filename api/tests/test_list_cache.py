@@ -0,0 +1,157 @@
+"""
+Tests for the cached list responses.
+"""
+
+import time
+
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework.test import APIClient
+
+from api.models import Person, Product
+
+
+def sample(resource, result):
+    labels = {"resource": resource, "result": result}
+    return REGISTRY.get_sample_value("api_list_cache_requests_total", labels) or 0.0
+
+
+@pytest.fixture
+def api_client():
+    """Create API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def product():
+    """Create a product with an owner."""
+    owner = Person.objects.create(first_name="Ada", last_name="Lovelace", email="ada@example.com")
+    return Product.objects.create(name="Engine", sku="CACHE-001", price="10.00", owner=owner)
+
+
+@pytest.mark.django_db
+class TestListResponseCache:
+    """Tests for the list response cache of persons and products."""
+
+    def test_second_request_is_served_from_cache(
+        self, api_client, product, django_assert_num_queries
+    ):
+        """Test a repeated list request is a HIT and runs no queries."""
+        url = reverse("product-list")
+        first = api_client.get(url)
+        assert first["X-Cache"] == "MISS"
+        with django_assert_num_queries(0):
+            second = api_client.get(url)
+        assert second["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+
+    def test_key_is_the_normalized_query_string(self, api_client, product):
+        """Test parameter order does not matter but parameter values do."""
+        url = reverse("product-list")
+        api_client.get(url + "?price_min=1&ordering=price")
+        assert api_client.get(url + "?ordering=price&price_min=1")["X-Cache"] == "HIT"
+        assert api_client.get(url + "?ordering=price&price_min=2")["X-Cache"] == "MISS"
+
+    def test_repeated_values_keep_their_order(self, api_client, product, settings):
+        """Test ?a=1&a=2 and ?a=2&a=1 are different entries (the last value wins)."""
+        url = reverse("product-list")
+        assert api_client.get(url + "?price_min=50&price_min=1").json()["count"] == 1
+        response = api_client.get(url + "?price_min=1&price_min=50")
+        assert response["X-Cache"] == "MISS"
+        assert response.json()["count"] == 0
+
+        # Cached counts are keyed the same way.
+        settings.API_LIST_CACHE_TTL = 0
+        assert api_client.get(url + "?price_min=50&price_min=1").json()["count"] == 1
+        assert api_client.get(url + "?price_min=1&price_min=50").json()["count"] == 0
+
+    def test_bare_cursor_is_a_different_entry(self, api_client, product):
+        """Test ?cursor= (keyset mode) does not reuse the page-number response."""
+        url = reverse("product-list")
+        api_client.get(url)
+        response = api_client.get(url, {"cursor": ""})
+        assert response["X-Cache"] == "MISS"
+        assert "count" not in response.json()
+
+    def test_product_write_invalidates(self, api_client, product):
+        """Test saving a product drops the cached product list."""
+        url = reverse("product-list")
+        api_client.get(url)
+        product.price = "12.50"
+        product.save()
+        response = api_client.get(url)
+        assert response["X-Cache"] == "MISS"
+        assert response.json()["results"][0]["price"] == "12.50"
+
+    def test_owner_write_invalidates_product_list(self, api_client, product):
+        """Test renaming an owner refreshes the owner_name embedded in product rows."""
+        url = reverse("product-list")
+        api_client.get(url)
+        product.owner.last_name = "King"
+        product.owner.save()
+        response = api_client.get(url)
+        assert response["X-Cache"] == "MISS"
+        assert response.json()["results"][0]["owner_name"] == "Ada King (ada@example.com)"
+
+    def test_product_write_keeps_plain_person_list(self, api_client, product):
+        """Test product writes invalidate person lists only when products are expanded."""
+        url = reverse("person-list")
+        api_client.get(url)
+        api_client.get(url, {"expand": "products"})
+        Product.objects.create(name="Wheel", sku="CACHE-002", price="1.00", owner=product.owner)
+        assert api_client.get(url)["X-Cache"] == "HIT"
+        expanded = api_client.get(url, {"expand": "products"})
+        assert expanded["X-Cache"] == "MISS"
+        assert len(expanded.json()["results"][0]["products"]) == 2
+
+    def test_stale_while_revalidate(self, api_client, product, settings, monkeypatch):
+        """Test an expired entry is served stale while another request refreshes it."""
+        settings.API_LIST_CACHE_TTL = 30
+        url = reverse("person-list")
+        api_client.get(url)
+        # Bulk writes skip the signals, so only the TTL bounds their staleness.
+        Person.objects.bulk_create(
+            [Person(first_name="Alan", last_name="Turing", email="alan@example.com")]
+        )
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now + 31)
+
+        # Another request holds the refresh lock.
+        with monkeypatch.context() as patch:
+            patch.setattr(cache, "add", lambda *args, **kwargs: False)
+            stale = api_client.get(url)
+        assert stale["X-Cache"] == "STALE"
+        assert stale.json()["count"] == 1
+
+        revalidating = sample("person", "revalidate")
+        refreshed = api_client.get(url)
+        assert refreshed["X-Cache"] == "MISS"
+        assert refreshed.json()["count"] == 2
+        assert sample("person", "revalidate") == revalidating + 1
+        assert api_client.get(url)["X-Cache"] == "HIT"
+
+    def test_disabled(self, api_client, product, settings):
+        """Test API_LIST_CACHE_TTL=0 turns the cache off."""
+        settings.API_LIST_CACHE_TTL = 0
+        url = reverse("product-list")
+        api_client.get(url)
+        response = api_client.get(url)
+        assert "X-Cache" not in response
+
+    def test_errors_are_not_cached(self, api_client, product):
+        """Test invalid requests are rejected every time."""
+        url = reverse("product-list")
+        assert api_client.get(url, {"fields": "secret"}).status_code == 400
+        assert api_client.get(url, {"fields": "secret"}).status_code == 400
+
+    def test_metrics(self, api_client, product):
+        """Test hits and misses are counted per resource."""
+        url = reverse("product-list")
+        hits, misses = sample("product", "hit"), sample("product", "miss")
+        api_client.get(url)
+        api_client.get(url)
+        api_client.get(url)
+        assert sample("product", "miss") == misses + 1
+        assert sample("product", "hit") == hits + 2
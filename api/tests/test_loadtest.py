@@ -0,0 +1,98 @@
+"""
+Tests for the load generator.
+"""
+
+import asyncio
+import random
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from api.loadtest import (
+    ASGITransport,
+    HTTPConnection,
+    LoadTest,
+    Scenarios,
+    Stats,
+    parse_mix,
+)
+from api.stats import percentile, summarize
+
+
+async def echo_app(scope, receive, send):
+    """ASGI app answering 201 for POST, 200 otherwise, echoing the request body."""
+    message = await receive()
+    status = 201 if scope["method"] == "POST" else 200
+    await send({"type": "http.response.start", "status": status, "headers": []})
+    await send({"type": "http.response.body", "body": message["body"]})
+
+
+class TestLoadTest:
+    """Tests for the load test building blocks."""
+
+    def test_parse_mix(self):
+        """Test parsing of weighted scenario mixes."""
+        available = ["list", "create"]
+        assert parse_mix("list=90,create=10", available) == [("list", 90.0), ("create", 10.0)]
+        assert parse_mix("list", available) == [("list", 1.0)]
+        with pytest.raises(ValueError):
+            parse_mix("list=90,delete=10", available)
+        with pytest.raises(ValueError):
+            parse_mix("list=0", available)
+
+    def test_percentiles_match_benchmarks(self):
+        """Test the load test reports the same nearest-rank percentiles as the benchmarks."""
+        samples = [i / 1000 for i in range(1, 21)]
+        assert percentile(samples, 50) == 0.010
+        assert percentile(samples, 95) == 0.019
+        assert percentile(samples, 99) == 0.020
+        benchmark = summarize(samples, digits=2)
+        load = Stats.summarize(samples, errors=1, seconds=2)
+        assert {key: load[key] for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")} == {
+            key: benchmark[key] for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")
+        }
+        assert load["requests"] == 20 and load["rps"] == 10.0 and load["error_rate"] == "5.00%"
+
+    def test_asgi_transport(self):
+        """Test that requests are passed to the ASGI app in-process."""
+        transport = ASGITransport(echo_app)
+        status, body = asyncio.run(transport.request("POST", "/api/v1/products/", {"a": 1}))
+        assert status == 201
+        assert body == b'{"a": 1}'
+
+    def test_http_connection_reads_chunked_response(self):
+        """Test that the HTTP client decodes chunked bodies."""
+
+        async def fetch():
+            reader = asyncio.StreamReader()
+            reader.feed_data(
+                b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+                b"5\r\nhello\r\n6\r\n world\r\n0\r\n\r\n"
+            )
+            connection = HTTPConnection("localhost", 80)
+            connection.reader = reader
+            return await connection.read_response()
+
+        assert asyncio.run(fetch()) == (200, b"hello world")
+
+    def test_run_stops_after_requests(self):
+        """Test a run bounded by a request count, with per-scenario stats."""
+        scenarios = Scenarios(["p1"], ["x1"], random.Random(1))
+        mix = parse_mix("list=3,create=1", scenarios.available)
+        load = LoadTest(ASGITransport(echo_app), scenarios, mix, concurrency=4, requests=40, seed=1)
+
+        elapsed, stats = asyncio.run(load.run())
+
+        assert sum(len(samples) for samples in stats.latencies.values()) == 40
+        assert set(stats.latencies) == {"list", "create"}
+        assert not stats.errors
+        assert sum(count for _label, count in stats.histogram()) == 40
+        assert Stats.summarize(stats.latencies["list"], 0, elapsed)["error_rate"] == "0.00%"
+
+    def test_command_requires_a_target(self):
+        """Test the command needs --url, or --in-process for a serialized smoke test."""
+        with pytest.raises(CommandError, match="--url --in-process"):
+            call_command("loadtest")
+        with pytest.raises(CommandError, match="not allowed with"):
+            call_command("loadtest", "--url", "http://localhost:8000", "--in-process")
@@ -0,0 +1,155 @@
+"""
+Tests for the two-tier object cache (retrieve and owner lookups).
+"""
+
+import uuid
+
+import pytest
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.cache import clear_object_caches, get_object_cache
+from api.models import Person, Product
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.fixture
+def api_client():
+    """Create API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def product():
+    """Create a product with an owner."""
+    owner = Person.objects.create(first_name="Ada", last_name="Lovelace", email="ada@example.com")
+    return Product.objects.create(name="Engine", sku="OBJ-001", price="10.00", owner=owner)
+
+
+@pytest.mark.django_db
+class TestObjectCache:
+    """Tests for api.cache.ObjectCache and its use by the views."""
+
+    def test_retrieve_is_read_through(self, api_client, product, django_assert_num_queries):
+        """Test the first retrieve loads product and owner in one query, the next in none."""
+        url = reverse("product-detail", kwargs={"pk": product.id})
+        with django_assert_num_queries(1):
+            first = api_client.get(url)
+        with django_assert_num_queries(0):
+            second = api_client.get(url)
+        assert second.json() == first.json()
+        assert second.json()["owner"]["email"] == "ada@example.com"
+
+    def test_shared_tier_serves_other_processes(self, product, django_assert_num_queries):
+        """Test an empty local tier falls back to the Django cache."""
+        object_cache = get_object_cache(Product)
+        object_cache.get(product.id)
+        clear_object_caches()
+        before = sample("api_object_cache_requests_total", model="api.product", result="shared")
+        with django_assert_num_queries(0):
+            cached = object_cache.get(product.id)
+        assert cached.owner.email == "ada@example.com"
+        after = sample("api_object_cache_requests_total", model="api.product", result="shared")
+        assert after == before + 1
+
+    def test_product_write_invalidates(self, api_client, product):
+        """Test an update through the API is visible on the next retrieve."""
+        url = reverse("product-detail", kwargs={"pk": product.id})
+        api_client.get(url)
+        api_client.patch(url, {"price": "15.00"}, format="json")
+        assert api_client.get(url).json()["price"] == "15.00"
+
+    def test_owner_write_invalidates_embedded_owner(self, api_client, product):
+        """Test the owner is cached on its own, so renaming it refreshes the product."""
+        url = reverse("product-detail", kwargs={"pk": product.id})
+        api_client.get(url)
+        product.owner.last_name = "King"
+        product.owner.save()
+        assert api_client.get(url).json()["owner"]["last_name"] == "King"
+
+    def test_deleted_owner(self, api_client, product):
+        """Test a cached product whose owner was deleted (SET NULL) shows no owner."""
+        url = reverse("product-detail", kwargs={"pk": product.id})
+        api_client.get(url)
+        product.owner.delete()
+        assert api_client.get(url).json()["owner"] is None
+
+    def test_upsert_invalidates(self, api_client, product):
+        """Test bulk upserts, which send no signals, drop the updated products."""
+        url = reverse("product-detail", kwargs={"pk": product.id})
+        api_client.get(url)
+        rows = [{"name": "Engine", "sku": "OBJ-001", "price": "20.00"}]
+        api_client.post(reverse("product-upsert"), rows, format="json")
+        assert api_client.get(url).json()["price"] == "20.00"
+
+    def test_callers_get_copies(self, product):
+        """Test mutating a returned instance does not change the cached one."""
+        object_cache = get_object_cache(Product)
+        object_cache.get(product.id).name = "Changed"
+        assert object_cache.get(product.id).name == "Engine"
+
+    def test_owner_resolution_is_cached(self, api_client, product, django_assert_num_queries):
+        """Test creating products for a cached owner does not look the owner up again."""
+        get_object_cache(Person).get(product.owner_id)
+        data = {"name": "Wheel", "sku": "OBJ-002", "price": "1.00", "owner_id": product.owner_id}
+        # SKU check and INSERT, inside a savepoint (ProductSerializer.owner_integrity).
+        with django_assert_num_queries(4):
+            response = api_client.post(reverse("product-list"), data, format="json")
+        assert response.status_code == status.HTTP_201_CREATED
+        assert response.json()["owner"]["email"] == "ada@example.com"
+
+    def test_missing_and_invalid_ids(self, api_client, product):
+        """Test unknown and malformed ids still return 404."""
+        for pk in (uuid.uuid4(), "not-a-uuid"):
+            url = reverse("product-detail", kwargs={"pk": pk})
+            assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_local_tier_is_bounded(self, settings):
+        """Test the LRU tier evicts the least recently used objects and counts them."""
+        settings.API_OBJECT_CACHE_LOCAL_SIZE = 2
+        persons = [
+            Person.objects.create(first_name="P", last_name=str(i), email=f"p{i}@example.com")
+            for i in range(3)
+        ]
+        before = sample("api_object_cache_evictions_total", model="api.person")
+        object_cache = get_object_cache(Person)
+        for person in persons:
+            object_cache.get(person.id)
+        assert sample("api_object_cache_evictions_total", model="api.person") == before + 1
+        assert object_cache.local.get(object_cache.get_key(persons[0].id)) is None
+
+    def test_disabled(self, api_client, product, settings, django_assert_num_queries):
+        """Test API_OBJECT_CACHE_TTL=0 reads the database every time."""
+        settings.API_OBJECT_CACHE_TTL = 0
+        url = reverse("product-detail", kwargs={"pk": product.id})
+        api_client.get(url)
+        with django_assert_num_queries(1):
+            api_client.get(url)
+
+
+@pytest.mark.django_db(transaction=True)
+class TestStaleOwner:
+    """Tests for owners another worker deleted while this one still caches them."""
+
+    def test_deleted_owner_is_a_validation_error(self, api_client):
+        """Test a stale cached owner makes create/update fail with 400, not 500."""
+        owner = Person.objects.create(first_name="Ada", last_name="Lovelace", email="a@x.com")
+        product = Product.objects.create(name="Engine", sku="OBJ-010", price="1.00")
+        owner_id = owner.pk
+        owner.delete()
+        # What another worker's per-process tier still holds.
+        owner.pk = owner_id
+        get_object_cache(Person).prime(owner)
+        data = {"name": "Wheel", "sku": "OBJ-011", "price": "1.00", "owner_id": owner_id}
+        created = api_client.post(reverse("product-list"), data, format="json")
+        url = reverse("product-detail", kwargs={"pk": product.id})
+        updated = api_client.patch(url, {"owner_id": owner_id}, format="json")
+        for response in (created, updated):
+            assert response.status_code == status.HTTP_400_BAD_REQUEST
+            assert "owner_id" in response.json()
+        assert not Product.objects.filter(sku="OBJ-011").exists()
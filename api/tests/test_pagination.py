@@ -0,0 +1,164 @@
+"""
+Tests for API pagination.
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.models import Person, Product
+
+
+@pytest.fixture
+def api_client():
+    """Create API client."""
+    return APIClient()
+
+
+def walk(api_client, url, params, direction="next"):
+    """Follow keyset links until exhausted and return every page."""
+    response = api_client.get(url, params)
+    assert response.status_code == status.HTTP_200_OK
+    pages = [response.data]
+    while pages[-1][direction]:
+        response = api_client.get(pages[-1][direction])
+        assert response.status_code == status.HTTP_200_OK
+        pages.append(response.data)
+    return pages
+
+
+@pytest.mark.django_db
+class TestKeysetPagination:
+    """Tests for the opt-in keyset (cursor) pagination mode."""
+
+    def test_page_number_mode_is_default(self, api_client):
+        """Test that requests without a cursor keep the count/page response."""
+        Person.objects.create(first_name="John", last_name="Doe", email="john@example.com")
+
+        response = api_client.get(reverse("person-list"))
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["count"] == 1
+
+    def test_cursor_mode_walks_all_persons(self, api_client):
+        """Test that following next links returns every row exactly once."""
+        for i in range(45):
+            Person.objects.create(first_name=f"P{i}", last_name="Test", email=f"p{i}@example.com")
+
+        pages = walk(api_client, reverse("person-list"), {"cursor": ""})
+        assert "count" not in pages[0]
+        assert [len(page["results"]) for page in pages] == [20, 20, 5]
+        assert pages[0]["previous"] is None
+
+        emails = [row["email"] for page in pages for row in page["results"]]
+        assert len(set(emails)) == 45
+        expected = list(
+            Person.objects.order_by("-created_at", "-id").values_list("email", flat=True)
+        )
+        assert emails == expected
+
+    def test_cursor_mode_by_price_with_ties(self, api_client):
+        """Test that rows sharing a price are neither skipped nor repeated."""
+        for i in range(30):
+            Product.objects.create(name=f"Product {i}", sku=f"SKU-{i:03}", price=Decimal(i % 3))
+
+        pages = walk(api_client, reverse("product-list"), {"cursor": "", "ordering": "price"})
+        skus = [row["sku"] for page in pages for row in page["results"]]
+        prices = [Decimal(row["price"]) for page in pages for row in page["results"]]
+        assert len(set(skus)) == 30
+        assert prices == sorted(prices)
+
+    def test_cursor_mode_previous_link(self, api_client):
+        """Test that previous links return the same pages in reverse."""
+        for i in range(45):
+            Product.objects.create(name=f"Product {i}", sku=f"SKU-{i:03}", price="10.00")
+
+        forward = walk(api_client, reverse("product-list"), {"cursor": ""})
+        response = api_client.get(forward[-1]["previous"])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.data["results"] == forward[-2]["results"]
+        assert response.data["next"] is not None
+
+    def test_cursor_mode_respects_filters(self, api_client):
+        """Test that keyset pages only contain filtered rows."""
+        for i in range(25):
+            Product.objects.create(name=f"Product {i}", sku=f"SKU-{i:03}", price=str(i))
+
+        pages = walk(api_client, reverse("product-list"), {"cursor": "", "price_min": "10"})
+        prices = [Decimal(row["price"]) for page in pages for row in page["results"]]
+        assert len(prices) == 15
+        assert min(prices) >= 10
+
+    def test_invalid_cursor(self, api_client):
+        """Test that a malformed cursor returns 404."""
+        response = api_client.get(reverse("product-list"), {"cursor": "not-a-cursor"})
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+    def test_cursor_from_another_ordering_is_rejected(self, api_client):
+        """Test that a cursor cannot be resumed under a different ordering."""
+        for i in range(25):
+            Product.objects.create(name=f"Product {i}", sku=f"SKU-{i:03}", price=str(i))
+
+        first = api_client.get(reverse("product-list"), {"cursor": "", "ordering": "price"})
+        next_url = first.data["next"].replace("ordering=price", "ordering=-created_at")
+        response = api_client.get(next_url)
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+class TestListCounts:
+    """Tests for estimated and cached list counts."""
+
+    def test_count_is_exact_by_default(self, api_client):
+        """Test that small tables report an exact count."""
+        Product.objects.create(name="Product", sku="SKU-001", price="10.00")
+
+        response = api_client.get(reverse("product-list"))
+        assert response.data["count"] == 1
+        assert response.data["count_approximate"] is False
+
+    def test_count_is_cached_per_filter_set(self, api_client, django_assert_num_queries):
+        """Test that a repeated filter set skips the COUNT query."""
+        for i in range(3):
+            Product.objects.create(name=f"Product {i}", sku=f"SKU-{i:03}", price=str(i))
+
+        url = reverse("product-list")
+        with django_assert_num_queries(2):
+            api_client.get(url, {"price_min": "1", "ordering": "price"})
+        with django_assert_num_queries(1):
+            response = api_client.get(url, {"ordering": "-price", "price_min": "1"})
+        assert response.data["count"] == 2
+
+    def test_cached_count_is_dropped_on_write(self, api_client):
+        """Test that creating a row invalidates cached counts."""
+        Product.objects.create(name="Product", sku="SKU-001", price="10.00")
+        url = reverse("product-list")
+        assert api_client.get(url).data["count"] == 1
+
+        Product.objects.create(name="Another", sku="SKU-002", price="10.00")
+        assert api_client.get(url).data["count"] == 2
+
+    def test_unfiltered_count_uses_estimate(self, api_client, monkeypatch, settings):
+        """Test that large unfiltered lists report the planner estimate."""
+        settings.API_COUNT_ESTIMATE_THRESHOLD = 1000
+        monkeypatch.setattr("api.pagination.estimate_row_count", lambda queryset: 5000)
+        Product.objects.create(name="Product", sku="SKU-001", price="10.00")
+
+        response = api_client.get(reverse("product-list"))
+        assert response.data["count"] == 5000
+        assert response.data["count_approximate"] is True
+
+        response = api_client.get(reverse("product-list"), {"price_min": "1"})
+        assert response.data["count"] == 1
+        assert response.data["count_approximate"] is False
+
+    def test_small_estimate_falls_back_to_exact_count(self, api_client, monkeypatch):
+        """Test that estimates below the threshold are not used."""
+        monkeypatch.setattr("api.pagination.estimate_row_count", lambda queryset: 10)
+        Product.objects.create(name="Product", sku="SKU-001", price="10.00")
+
+        response = api_client.get(reverse("product-list"))
+        assert response.data["count"] == 1
+        assert response.data["count_approximate"] is False
@@ -0,0 +1,95 @@
+"""
+Tests for the owner-scoped product listing (/persons/{id}/products/).
+"""
+
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.models import Person, Product
+
+
+@pytest.fixture
+def api_client():
+    """Create API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def owner():
+    """Create a person owning 25 products (OWN-000 newest) and someone else's product."""
+    person = Person.objects.create(
+        first_name="Grace", last_name="Hopper", email="grace@example.com"
+    )
+    other = Person.objects.create(first_name="Alan", last_name="Turing", email="alan@example.com")
+    Product.objects.bulk_create(
+        Product(name=f"Item {i}", sku=f"OWN-{i:03d}", price="5.00", owner=person) for i in range(25)
+    )
+    Product.objects.create(name="Other", sku="OTHER-001", price="1.00", owner=other)
+    # created_at is auto_now_add; spread it so OWN-000 is the newest.
+    now = timezone.now()
+    for i in range(25):
+        Product.objects.filter(sku=f"OWN-{i:03d}").update(created_at=now - timedelta(minutes=i))
+    return person
+
+
+def walk(api_client, url, params=None):
+    """Follow next links and return every page."""
+    pages = [api_client.get(url, params).json()]
+    while pages[-1]["next"]:
+        pages.append(api_client.get(pages[-1]["next"]).json())
+    return pages
+
+
+@pytest.mark.django_db
+class TestPersonProducts:
+    """Tests for GET /api/v1/persons/{id}/products/."""
+
+    def test_lists_only_the_owners_products_newest_first(self, api_client, owner):
+        """Test keyset pages cover the owner's products once, newest first."""
+        pages = walk(api_client, reverse("person-products", kwargs={"pk": owner.id}))
+        skus = [row["sku"] for page in pages for row in page["results"]]
+        assert skus == [f"OWN-{i:03d}" for i in range(25)]
+        assert len(pages) == 2
+        assert "count" not in pages[0]
+        assert set(pages[0]["results"][0]) == {"id", "name", "sku", "price", "created_at"}
+
+    def test_previous_link(self, api_client, owner):
+        """Test the previous link of the second page returns the first page."""
+        url = reverse("person-products", kwargs={"pk": owner.id})
+        first = api_client.get(url).json()
+        second = api_client.get(first["next"]).json()
+        back = api_client.get(second["previous"]).json()
+        assert back["results"] == first["results"]
+
+    def test_sparse_fields(self, api_client, owner):
+        """Test ?fields= limits the listed product fields."""
+        url = reverse("person-products", kwargs={"pk": owner.id})
+        response = api_client.get(url, {"fields": "sku,price"})
+        assert response.json()["results"][0] == {"sku": "OWN-000", "price": "5.00"}
+
+    def test_query_count(self, api_client, owner, django_assert_num_queries):
+        """Test a page costs the person lookup plus one products query."""
+        url = reverse("person-products", kwargs={"pk": owner.id})
+        with django_assert_num_queries(2):
+            api_client.get(url)
+
+    def test_unknown_person(self, api_client, owner):
+        """Test a missing person returns 404."""
+        url = reverse("person-products", kwargs={"pk": uuid.uuid4()})
+        assert api_client.get(url).status_code == status.HTTP_404_NOT_FOUND
+
+    def test_listing_uses_owner_index(self, owner):
+        """Test the listing query is answered from products_owner_created_idx."""
+        queryset = Product.objects.filter(owner=owner).order_by("-created_at", "-id")[:21]
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                # A tiny test table would otherwise be scanned sequentially.
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        assert "products_owner_created_idx" in queryset.explain()
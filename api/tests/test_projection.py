@@ -0,0 +1,92 @@
+"""
+Tests for the values()-based list serialization.
+"""
+
+from decimal import Decimal
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from api.models import Person, Product
+from api.projection import PersonListProjection, ProductListProjection
+from api.serializers import PersonListSerializer, ProductListSerializer
+
+
+@pytest.fixture
+def api_client():
+    """Create API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def catalog():
+    """Create products with and without owner, including non-ASCII text."""
+    owner = Person.objects.create(first_name="José", last_name="Núñez", email="jose@example.com")
+    Product.objects.create(name="Laptop Pro", sku="PRJ-001", price=Decimal("1299.90"), owner=owner)
+    Product.objects.create(name="Café « crème »", sku="PRJ-002", price=Decimal("0.50"))
+    Product.objects.create(name="Mouse", sku="PRJ-003", price=Decimal("10"), owner=owner)
+    return owner
+
+
+@pytest.mark.django_db
+class TestValuesProjection:
+    """Tests that projections serialize exactly like the list serializers."""
+
+    def test_product_rows_match_serializer(self, catalog):
+        """Test product projection output equals ProductListSerializer output."""
+        queryset = Product.objects.select_related("owner").order_by("sku")
+        projection = ProductListProjection()
+        expected = ProductListSerializer(queryset, many=True).data
+        assert projection.serialize(projection.project(queryset)) == expected
+
+    def test_person_rows_match_serializer(self, catalog):
+        """Test person projection output equals PersonListSerializer output."""
+        Person.objects.create(first_name="Ana", last_name="Li", email="ana@example.com")
+        queryset = Person.objects.order_by("email")
+        projection = PersonListProjection()
+        expected = PersonListSerializer(queryset, many=True).data
+        assert projection.serialize(projection.project(queryset)) == expected
+
+    def test_datetimes_follow_active_timezone(self, catalog):
+        """Test created_at is rendered in the active timezone like the serializer."""
+        queryset = Person.objects.all()
+        with timezone.override("America/Bogota"):
+            projection = PersonListProjection()
+            expected = PersonListSerializer(queryset, many=True).data
+            rows = projection.serialize(projection.project(queryset))
+        assert rows == expected
+        assert rows[0]["created_at"].endswith("-05:00")
+
+    def test_owner_name_is_computed_in_sql(self, catalog, django_assert_num_queries):
+        """Test owner_name comes from the same single query as the row."""
+        projection = ProductListProjection()
+        with django_assert_num_queries(1):
+            rows = list(projection.project(Product.objects.order_by("sku")))
+        assert rows[0]["owner_name"] == "José Núñez (jose@example.com)"
+        assert rows[1]["owner_name"] is None
+
+
+@pytest.mark.django_db
+class TestProjectedListEndpoints:
+    """Tests that list responses are unchanged by the projection."""
+
+    def test_product_list_body_matches_serializer(self, api_client, catalog):
+        """Test product list JSON is identical to serializing model instances."""
+        response = api_client.get(reverse("product-list"), {"ordering": "price"})
+        queryset = Product.objects.select_related("owner").order_by("price", "id")
+        expected = ProductListSerializer(queryset, many=True).data
+        assert response.json()["results"] == [dict(row) for row in expected]
+
+    def test_product_cursor_pages_use_projection(self, api_client, catalog):
+        """Test keyset pages serialize projected rows and keep a working cursor."""
+        Product.objects.bulk_create(
+            Product(name=f"Item {i}", sku=f"PRJ-1{i:02d}", price=Decimal(i)) for i in range(20)
+        )
+        first = api_client.get(reverse("product-list"), {"cursor": ""}).json()
+        second = api_client.get(first["next"]).json()
+        rows = first["results"] + second["results"]
+        assert len(rows) == 23
+        assert len({row["id"] for row in rows}) == 23
+        assert set(rows[0]) == {"id", "name", "sku", "price", "owner_name", "created_at"}
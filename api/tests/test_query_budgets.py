@@ -0,0 +1,185 @@
+"""
+Query budgets for every API endpoint.
+
+Each action runs against a realistically sized catalog and must not exceed its
+budget, so an N+1 (e.g. losing ``select_related("owner")``) or an extra lookup on a
+hot path fails the build. Budgets are exact for the current implementation: lower
+one when an endpoint gets cheaper.
+"""
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.models import Person, Product
+from api.urls import router
+
+PERSONS = 50
+PRODUCTS = 200
+
+
+@pytest.fixture
+def api_client():
+    """Create API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def catalog():
+    """Create persons and products, a quarter of the products without owner."""
+    persons = Person.objects.bulk_create(
+        Person(first_name=f"First{i}", last_name=f"Last{i}", email=f"person{i}@example.com")
+        for i in range(PERSONS)
+    )
+    products = Product.objects.bulk_create(
+        Product(
+            name=f"Product {i}",
+            sku=f"SKU-{i:05d}",
+            price=f"{i}.99",
+            owner=persons[i % PERSONS] if i % 4 else None,
+        )
+        for i in range(PRODUCTS)
+    )
+    return {"person": persons[1], "product": products[1]}
+
+
+def person_rows(count):
+    return [
+        {"first_name": "Bulk", "last_name": "Row", "email": f"bulk{i}@example.com"}
+        for i in range(count)
+    ]
+
+
+def product_rows(count, owner_id=None, prefix="BULK"):
+    return [
+        {"name": "Bulk", "sku": f"{prefix}-{i:05d}", "price": "1.00", "owner_id": owner_id}
+        for i in range(count)
+    ]
+
+
+# (route name, HTTP method, query string, payload builder, budget, planner estimates).
+# ``estimates`` counts the pg_class row estimate that unfiltered page-number lists read
+# on PostgreSQL only; budgets below include it. Writes that set owner_id run in a
+# savepoint inside the test transaction (SAVEPOINT/RELEASE; free under autocommit).
+CASES = [
+    ("person-list", "get", "", None, 3, 1),
+    ("person-list", "get", "?email=person1&ordering=created_at", None, 2, 0),
+    ("person-list", "get", "?cursor=", None, 1, 0),
+    ("person-list", "get", "?cursor=&expand=products", None, 2, 0),
+    ("person-detail", "get", "", None, 1, 0),
+    ("person-detail", "get", "?expand=products", None, 2, 0),
+    ("person-products", "get", "", None, 2, 0),
+    (
+        "person-list",
+        "post",
+        "",
+        lambda objs: {"first_name": "New", "last_name": "Person", "email": "new@example.com"},
+        2,
+        0,
+    ),
+    (
+        "person-detail",
+        "put",
+        "",
+        lambda objs: {
+            "first_name": "Changed",
+            "last_name": "Person",
+            "email": objs["person"].email,
+        },
+        3,
+        0,
+    ),
+    ("person-detail", "patch", "", lambda objs: {"first_name": "Changed"}, 2, 0),
+    ("person-detail", "delete", "", None, 5, 0),
+    ("person-bulk-create", "post", "", lambda objs: person_rows(100), 4, 0),
+    ("person-export", "get", "", None, 1, 0),
+    ("product-list", "get", "", None, 3, 1),
+    ("product-list", "get", "?q=Product&price_min=10&ordering=price", None, 2, 0),
+    ("product-list", "get", "?search=product", None, 2, 0),
+    ("product-list", "get", "?cursor=&ordering=price", None, 1, 0),
+    ("product-list", "get", "?cursor=&fields=id,sku,price", None, 1, 0),
+    ("product-detail", "get", "", None, 1, 0),
+    ("product-detail", "get", "?fields=sku,owner", None, 1, 0),
+    (
+        "product-list",
+        "post",
+        "",
+        lambda objs: {
+            "name": "New",
+            "sku": "NEW-00001",
+            "price": "1.00",
+            "owner_id": str(objs["person"].id),
+        },
+        5,
+        0,
+    ),
+    (
+        "product-detail",
+        "put",
+        "",
+        lambda objs: {
+            "name": "Changed",
+            "sku": objs["product"].sku,
+            "price": "2.00",
+            "owner_id": str(objs["person"].id),
+        },
+        6,
+        0,
+    ),
+    ("product-detail", "patch", "", lambda objs: {"price": "2.00"}, 2, 0),
+    ("product-detail", "delete", "", None, 2, 0),
+    (
+        "product-bulk-create",
+        "post",
+        "",
+        lambda objs: product_rows(100, str(objs["person"].id)),
+        5,
+        0,
+    ),
+    (
+        "product-upsert",
+        "post",
+        "",
+        lambda objs: product_rows(50, prefix="SKU") + product_rows(50, prefix="UPS"),
+        4,
+        0,
+    ),
+    ("product-export", "get", "", None, 1, 0),
+]
+
+
+# Routes that take the object's pk (``-detail`` and ``@action(detail=True)``).
+DETAIL_ROUTES = {url.name for url in router.urls if "pk" in url.pattern.regex.groupindex}
+
+
+def case_id(case):
+    name, method, query = case[:3]
+    return f"{method.upper()} {name}{query}"
+
+
+@pytest.mark.django_db
+class TestQueryBudgets:
+    """Tests that every endpoint stays within its query budget."""
+
+    @pytest.mark.parametrize("case", CASES, ids=case_id)
+    def test_query_budget(self, api_client, catalog, django_assert_max_num_queries, case):
+        """Test that the action does not exceed its query budget."""
+        name, method, query, payload, budget, estimates = case
+        if connection.vendor != "postgresql":
+            budget -= estimates
+        args = [catalog[name.split("-")[0]].pk] if name in DETAIL_ROUTES else []
+        url = reverse(name, args=args) + query
+        data = payload(catalog) if payload else None
+
+        with django_assert_max_num_queries(budget):
+            response = getattr(api_client, method)(url, data, format="json")
+            if response.streaming:
+                b"".join(response.streaming_content)
+
+        assert 200 <= response.status_code < 300, response.content
+
+    def test_every_route_has_a_budget(self):
+        """Test that new router endpoints get a budget too."""
+        routes = {url.name for url in router.urls} - {"api-root"}
+        assert routes == {case[0] for case in CASES}
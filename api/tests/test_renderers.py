@@ -0,0 +1,151 @@
+"""
+Tests for the orjson renderer/parser pair and the shared JSON encoder.
+"""
+
+import io
+import uuid
+from datetime import UTC, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from django.urls import reverse
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api.models import Person, Product
+from api.renderers import ORJSONParser, ORJSONRenderer, dumps, loads
+from api.views import ProductViewSet
+
+PAYLOADS = [
+    {"id": uuid.UUID("6f1c2a7e-9d4b-4c1e-8a55-0b9d2e7f3c10"), "price": Decimal("1234.50")},
+    {"created_at": datetime(2026, 3, 1, 12, 30, 45, 123456, tzinfo=UTC)},
+    {"created_at": datetime(2026, 3, 1, 12, 30, tzinfo=timezone(timedelta(hours=-5)))},
+    {"name": "Café ☕ ñandú", "line": "a\u2028b\u2029c", "none": None, "flag": True},
+    {"nested": [{"count": 2**40, "ratio": 0.5}, ()], 1: "int key"},
+    {"huge": 2**80},
+]
+
+
+@pytest.fixture
+def api_client():
+    """Create API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def product():
+    """Create a product with an owner."""
+    owner = Person.objects.create(first_name="Zoë", last_name="Ñúñez", email="zoe@example.com")
+    return Product.objects.create(name="Café", sku="JSON-001", price="1234.50", owner=owner)
+
+
+class TestORJSONRenderer:
+    """Tests for api.renderers.ORJSONRenderer and dumps."""
+
+    @pytest.mark.parametrize("data", PAYLOADS)
+    def test_same_bytes_as_stock_renderer(self, data):
+        """Test UUIDs, Decimals, aware datetimes and escapes render byte for byte."""
+        assert ORJSONRenderer().render(data) == JSONRenderer().render(data)
+
+    def test_indent_uses_stock_renderer(self):
+        """Test indented output is still honoured."""
+        media_type = "application/json; indent=2"
+        expected = JSONRenderer().render(PAYLOADS[0], media_type)
+        assert ORJSONRenderer().render(PAYLOADS[0], media_type) == expected
+        assert b"\n  " in expected
+
+    @pytest.mark.parametrize("backend", ["stdlib", "orjson"])
+    def test_dumps_follows_backend(self, settings, backend):
+        """Test dumps() matches JSONRenderer with either API_JSON_BACKEND."""
+        settings.API_JSON_BACKEND = backend
+        for data in PAYLOADS:
+            assert dumps(data) == JSONRenderer().render(data)
+
+    def test_float_notation_differs(self):
+        """Test the documented float differences: exponent and small-value notation."""
+        data = {"large": 1e16, "small": 1e-05, "plain": 0.5}
+        assert ORJSONRenderer().render(data) == b'{"large":1e16,"small":0.00001,"plain":0.5}'
+        assert JSONRenderer().render(data) == b'{"large":1e+16,"small":1e-05,"plain":0.5}'
+
+    def test_non_finite_floats_differ(self):
+        """Test NaN renders as null with orjson where STRICT_JSON makes the stdlib raise."""
+        data = {"ratio": float("nan"), "limit": float("inf")}
+        assert ORJSONRenderer().render(data) == b'{"ratio":null,"limit":null}'
+        with pytest.raises(ValueError):
+            JSONRenderer().render(data)
+        with pytest.raises(ValueError):
+            dumps(data, fast=False)
+
+
+class TestORJSONParser:
+    """Tests for api.renderers.ORJSONParser and loads."""
+
+    def test_same_data_as_stock_parser(self):
+        """Test both parsers return the same data."""
+        body = b'{"name": "Caf\\u00e9 \xe2\x98\x95", "price": 12.5, "tags": [1, null, true]}'
+        expected = JSONParser().parse(io.BytesIO(body))
+        assert ORJSONParser().parse(io.BytesIO(body)) == expected
+        assert loads(body) == expected
+
+    def test_falls_back_for_what_orjson_refuses(self):
+        """Test integers wider than 64 bits still parse."""
+        assert ORJSONParser().parse(io.BytesIO(b'{"n": %d}' % 2**80)) == {"n": 2**80}
+
+    def test_errors_match_stock_parser(self):
+        """Test malformed and non-finite input raise the stock ParseError."""
+        for body in (b'{"name": ', b'{"price": NaN}'):
+            with pytest.raises(ParseError) as stock:
+                JSONParser().parse(io.BytesIO(body))
+            with pytest.raises(ParseError) as fast:
+                ORJSONParser().parse(io.BytesIO(body))
+            assert str(fast.value) == str(stock.value)
+
+    def test_other_encodings_use_stock_parser(self):
+        """Test non-UTF-8 bodies are decoded with their declared charset."""
+        body = '{"name": "Café"}'.encode("latin-1")
+        parsed = ORJSONParser().parse(io.BytesIO(body), parser_context={"encoding": "latin-1"})
+        assert parsed == {"name": "Café"}
+
+
+@pytest.fixture
+def orjson_backend(settings):
+    """Opt the product endpoints and the shared encoder in to orjson."""
+    settings.API_JSON_BACKEND = "orjson"
+    with (
+        mock.patch.object(ProductViewSet, "renderer_classes", [ORJSONRenderer]),
+        mock.patch.object(ProductViewSet, "parser_classes", [ORJSONParser]),
+    ):
+        yield
+
+
+@pytest.mark.django_db
+class TestJSONBackendEndpoints:
+    """Tests that the endpoints behave the same with API_JSON_BACKEND=orjson."""
+
+    def test_list_and_retrieve(self, api_client, product, settings):
+        """Test list pages and detail responses are identical byte for byte."""
+        settings.API_LIST_CACHE_TTL = 0
+        urls = [reverse("product-list"), reverse("product-detail", kwargs={"pk": product.id})]
+        stock = [api_client.get(url).content for url in urls]
+        with mock.patch.object(ProductViewSet, "renderer_classes", [ORJSONRenderer]):
+            assert [api_client.get(url).content for url in urls] == stock
+        assert b'"price":"1234.50"' in stock[0]
+
+    def test_bulk_create(self, api_client, orjson_backend):
+        """Test request bodies are parsed by ORJSONParser."""
+        rows = [{"name": "Café", "sku": "JSON-002", "price": "9.99"}]
+        with mock.patch.object(ORJSONParser, "parse", wraps=ORJSONParser().parse) as parse:
+            response = api_client.post(reverse("product-bulk-create"), rows, format="json")
+        assert response.status_code == 201
+        parse.assert_called_once()
+        assert Product.objects.get(sku="JSON-002").name == "Café"
+
+    def test_ndjson_export(self, api_client, product, orjson_backend):
+        """Test export lines use the shared encoder."""
+        response = api_client.get(reverse("product-export"))
+        content = b"".join(response.streaming_content)
+        assert content.endswith(b"\n")
+        assert loads(content.splitlines()[0])["sku"] == "JSON-001"
@@ -0,0 +1,179 @@
+"""
+Tests for substring and full-text search.
+"""
+
+from importlib import import_module
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.models import Person, Product
+
+
+@pytest.fixture
+def api_client():
+    """Create API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def postgres_connection():
+    """A PostgreSQL connection wrapper used only to compile SQL (never opened)."""
+    from django.db.backends.postgresql.base import DatabaseWrapper
+
+    return DatabaseWrapper({**connection.settings_dict, "ENGINE": "django.db.backends.postgresql"})
+
+
+@pytest.fixture
+def search_vector_trigger():
+    """Install the search_vector trigger of migration 0003, which --nomigrations skips."""
+    if connection.vendor != "postgresql":
+        return
+    migration = import_module("api.migrations.0003_product_search_vector")
+    with connection.cursor() as cursor:
+        cursor.execute(migration.CREATE_TRIGGER)
+        cursor.execute(migration.BACKFILL)
+
+
+class TestTrigramLookup:
+    """Tests for the trgm_icontains lookup."""
+
+    def test_compiles_to_ilike_on_postgresql(self, postgres_connection):
+        """Test that PostgreSQL gets an ILIKE that pg_trgm indexes can serve."""
+        queryset = Product.objects.filter(name__trgm_icontains="50%_off")
+        sql, params = queryset.query.get_compiler(connection=postgres_connection).as_sql()
+        assert '"products"."name" ILIKE %s' in sql
+        assert "UPPER" not in sql
+        assert params == ("%50\\%\\_off%",)
+
+    @pytest.mark.skipif(connection.vendor == "postgresql", reason="compiled to ILIKE there")
+    def test_falls_back_to_icontains_elsewhere(self):
+        """Test that other databases get the stock icontains SQL."""
+        trigram = Product.objects.filter(name__trgm_icontains="abc")
+        stock = Product.objects.filter(name__icontains="abc")
+        assert str(trigram.query) == str(stock.query)
+
+    @pytest.mark.django_db
+    @pytest.mark.skipif(connection.vendor != "postgresql", reason="pg_trgm is PostgreSQL-only")
+    def test_served_by_trigram_index_on_postgresql(self, trigram_indexes):
+        """Test that the ILIKE is answered from the pg_trgm index, unlike icontains."""
+        Product.objects.create(name="Gaming Laptop", sku="LP-001", price="999.99")
+        with connection.cursor() as cursor:
+            # A tiny test table would otherwise be scanned sequentially.
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+        trigram = Product.objects.filter(name__trgm_icontains="laptop")
+        stock = Product.objects.filter(name__icontains="laptop")
+        assert '"products"."name" ILIKE' in str(trigram.query)
+        assert "products_name_trgm_idx" in trigram.explain()
+        assert "products_name_trgm_idx" not in stock.explain()
+
+
+@pytest.mark.django_db
+class TestSubstringSearch:
+    """Tests for filters backed by trgm_icontains."""
+
+    def test_search_products_by_name_is_case_insensitive(self, api_client):
+        """Test searching products with ?search=."""
+        Product.objects.create(name="Laptop Computer", sku="LP-001", price="999.99")
+        Product.objects.create(name="Mouse", sku="MS-001", price="29.99")
+
+        response = api_client.get(reverse("product-list"), {"search": "LAPTOP"})
+        assert response.status_code == status.HTTP_200_OK
+        assert [row["sku"] for row in response.data["results"]] == ["LP-001"]
+
+    def test_search_matches_partial_words(self, api_client):
+        """Test that ?search= matches substrings, not only whole words."""
+        Product.objects.create(name="Gaming Laptop", sku="LP-001", price="999.99")
+        Product.objects.create(name="Mouse", sku="MS-001", price="29.99")
+
+        response = api_client.get(reverse("product-list"), {"search": "lapt"})
+        assert [row["sku"] for row in response.data["results"]] == ["LP-001"]
+
+    def test_filter_products_by_partial_sku(self, api_client):
+        """Test that the sku filter matches substrings."""
+        Product.objects.create(name="Product 1", sku="ABC-001", price="1.00")
+        Product.objects.create(name="Product 2", sku="XYZ-001", price="1.00")
+
+        response = api_client.get(reverse("product-list"), {"sku": "bc-0"})
+        assert [row["sku"] for row in response.data["results"]] == ["ABC-001"]
+
+    def test_search_escapes_wildcards(self, api_client):
+        """Test that LIKE wildcards in the term are matched literally."""
+        Product.objects.create(name="50% off", sku="OFF-001", price="1.00")
+        Product.objects.create(name="500 units", sku="UNI-001", price="1.00")
+
+        response = api_client.get(reverse("product-list"), {"q": "50%"})
+        assert [row["sku"] for row in response.data["results"]] == ["OFF-001"]
+
+    def test_filter_persons_by_partial_email(self, api_client):
+        """Test that the person email filter matches substrings."""
+        Person.objects.create(first_name="John", last_name="Doe", email="john.doe@example.com")
+        Person.objects.create(first_name="Jane", last_name="Roe", email="jane@example.org")
+
+        response = api_client.get(reverse("person-list"), {"email": "EXAMPLE.ORG"})
+        assert [row["email"] for row in response.data["results"]] == ["jane@example.org"]
+
+
+@pytest.mark.django_db
+class TestFullTextSearch:
+    """Tests for the ranked full-text ?fulltext= backend."""
+
+    def test_fulltext_matches_words(self, api_client, search_vector_trigger):
+        """Test that ?fulltext= filters by name on every database."""
+        Product.objects.create(name="Gaming Laptop", sku="LP-001", price="999.99")
+        Product.objects.create(name="Mouse", sku="MS-001", price="29.99")
+
+        response = api_client.get(reverse("product-list"), {"fulltext": "laptop"})
+        assert [row["sku"] for row in response.data["results"]] == ["LP-001"]
+
+    def test_fulltext_orders_by_rank_on_postgresql(self, postgres_connection, monkeypatch):
+        """Test that the PostgreSQL query matches the stored vector and sorts by rank."""
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+
+        from api.filters import FullTextSearchFilter
+
+        monkeypatch.setattr(FullTextSearchFilter, "is_full_text_available", lambda self, qs: True)
+        terms = '"gaming laptop" -refurbished'
+        request = Request(APIRequestFactory().get("/", {"fulltext": terms}))
+        queryset = FullTextSearchFilter().filter_queryset(request, Product.objects.all(), None)
+
+        sql, params = queryset.query.get_compiler(connection=postgres_connection).as_sql()
+        assert '"products"."search_vector" @@ (websearch_to_tsquery(' in sql
+        assert "ts_rank(" in sql
+        assert queryset.query.order_by == ("-search_rank", "-created_at")
+        assert terms in params
+
+    def test_explicit_ordering_wins_over_rank(self, postgres_connection, monkeypatch):
+        """Test that ?ordering= keeps precedence over relevance ordering."""
+        from rest_framework.request import Request
+        from rest_framework.test import APIRequestFactory
+
+        from api.filters import FullTextSearchFilter
+
+        monkeypatch.setattr(FullTextSearchFilter, "is_full_text_available", lambda self, qs: True)
+        request = Request(APIRequestFactory().get("/", {"fulltext": "laptop", "ordering": "price"}))
+        queryset = Product.objects.order_by("price")
+        queryset = FullTextSearchFilter().filter_queryset(request, queryset, None)
+        assert queryset.query.order_by == ("price",)
+
+    def test_fulltext_with_cursor_requires_ordering(self, api_client, search_vector_trigger):
+        """Test that keyset pages of a full-text search must name their ordering."""
+        Product.objects.create(name="Gaming Laptop", sku="LP-001", price="999.99")
+        url = reverse("product-list")
+
+        response = api_client.get(url, {"fulltext": "laptop", "cursor": ""})
+        assert response.status_code == 400
+        assert "fulltext" in response.data
+
+        response = api_client.get(url, {"fulltext": "laptop", "cursor": "", "ordering": "price"})
+        assert response.status_code == 200
+        assert [row["sku"] for row in response.data["results"]] == ["LP-001"]
+
+        # Substring search keeps its order, so it pages by cursor as before.
+        response = api_client.get(url, {"search": "lapt", "cursor": ""})
+        assert response.status_code == 200
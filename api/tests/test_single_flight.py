@@ -0,0 +1,161 @@
+"""
+Tests for request coalescing (single-flight) in the API caches.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+from django.core.cache import cache, caches
+from django.core.cache.backends.filebased import FileBasedCache
+from prometheus_client import REGISTRY
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from api.cache import ObjectCache, ResponseCache, SingleFlight
+from api.models import Person
+
+CALLERS = 8
+
+
+def coalesced(name, scope):
+    labels = {"cache": name, "scope": scope}
+    return REGISTRY.get_sample_value("api_coalesced_requests_total", labels) or 0.0
+
+
+@pytest.fixture
+def atomic_add():
+    """Treat the test cache like a backend whose add() is atomic across workers."""
+    with mock.patch.object(SingleFlight, "uses_shared_lock", return_value=True):
+        yield
+
+
+class SlowComputation:
+    """Counts calls and blocks each one until ``release`` is set."""
+
+    def __init__(self, result="value", error=None):
+        self.calls = 0
+        self.result = result
+        self.error = error
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self, *args):
+        with self._lock:
+            self.calls += 1
+        self.started.set()
+        self.release.wait(5)
+        if self.error is not None and self.calls == 1:
+            raise self.error
+        return self.result
+
+
+def run_concurrently(function, callers=CALLERS, compute=None):
+    """Call ``function`` from ``callers`` threads; release ``compute`` once they all wait."""
+    with ThreadPoolExecutor(callers) as pool:
+        futures = [pool.submit(function) for _ in range(callers)]
+        if compute is not None:
+            compute.started.wait(5)
+            # Let the followers reach the in-flight call before the leader returns.
+            time.sleep(0.1)
+            compute.release.set()
+        return [future.exception() or future.result() for future in futures]
+
+
+class TestSingleFlight:
+    """Tests for api.cache.SingleFlight."""
+
+    def test_concurrent_callers_share_one_computation(self):
+        """Test callers with the same key wait for the leader instead of computing."""
+        flight = SingleFlight("test")
+        compute = SlowComputation()
+        before = coalesced("test", "process")
+        results = run_concurrently(lambda: flight.do("key", compute, cache.get), compute=compute)
+        assert results == ["value"] * CALLERS
+        assert compute.calls == 1
+        assert coalesced("test", "process") == before + CALLERS - 1
+
+    def test_different_keys_do_not_wait(self):
+        """Test unrelated keys are computed independently."""
+        flight = SingleFlight("test")
+        results = [flight.do(key, lambda k=key: k.upper(), cache.get) for key in ("a", "b")]
+        assert results == ["A", "B"]
+
+    def test_failures_are_not_shared(self):
+        """Test followers of a failed leader compute on their own."""
+        flight = SingleFlight("test")
+        compute = SlowComputation(error=LookupError("leader only"))
+        results = run_concurrently(lambda: flight.do("key", compute, cache.get), compute=compute)
+        assert sum(isinstance(result, LookupError) for result in results) == 1
+        assert results.count("value") == CALLERS - 1
+        assert flight._calls == {}
+
+    def test_waits_for_another_worker(self, atomic_add):
+        """Test a caller that sees another worker's lock polls the shared cache."""
+        flight = SingleFlight("test")
+        cache.add("key:flight", 1, 5)
+        threading.Timer(0.05, lambda: cache.set("key", "from another worker")).start()
+        compute = mock.Mock(return_value="computed")
+        before = coalesced("test", "shared")
+        assert flight.do("key", compute, lambda: cache.get("key")) == "from another worker"
+        compute.assert_not_called()
+        assert coalesced("test", "shared") == before + 1
+
+    def test_computes_when_the_other_worker_gives_up(self, atomic_add):
+        """Test a released lock without a result makes the caller compute itself."""
+        flight = SingleFlight("test")
+        cache.add("key:flight", 1, 5)
+        threading.Timer(0.05, lambda: cache.delete("key:flight")).start()
+        assert flight.do("key", lambda: "computed", lambda: cache.get("key")) == "computed"
+
+    def test_lock_is_released(self, atomic_add):
+        """Test the cross-worker lock is dropped once the leader finishes."""
+        flight = SingleFlight("test")
+        with mock.patch.object(cache, "add", wraps=cache.add) as add:
+            flight.do("key", lambda: "value", cache.get)
+        add.assert_called_once()
+        assert cache.get("key:flight") is None
+
+    def test_no_shared_lock_without_atomic_add(self, settings, tmp_path):
+        """Test the file and locmem backends skip the cross-worker lock."""
+        flight = SingleFlight("test")
+        assert not flight.uses_shared_lock()
+        cache.add("key:flight", 1, 5)
+        assert flight.do("key", lambda: "computed", lambda: cache.get("key")) == "computed"
+
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": str(tmp_path),
+            }
+        }
+        assert isinstance(caches["default"], FileBasedCache)
+        assert not flight.uses_shared_lock()
+
+
+class TestCoalescedCaches:
+    """Tests that the list and object caches coalesce concurrent misses."""
+
+    def test_list_misses(self):
+        """Test identical list requests on a cold cache compute the response once."""
+        request = Request(APIRequestFactory().get("/api/v1/persons/", {"page": "2"}))
+        response_cache = ResponseCache("person", [Person], ttl=30, stale_ttl=30)
+        compute = SlowComputation(result=(None, {"results": []}))
+        results = run_concurrently(lambda: response_cache.fetch(request, compute), compute=compute)
+        assert compute.calls == 1
+        assert results == [((None, {"results": []}), "miss")] * CALLERS
+
+    def test_object_misses(self):
+        """Test concurrent lookups of an uncached object run one query."""
+        person = Person(id=uuid.uuid4(), first_name="Ada", last_name="Lovelace")
+        load = SlowComputation(result=person)
+        object_cache = ObjectCache(Person)
+        with mock.patch.object(object_cache, "load", load):
+            results = run_concurrently(lambda: object_cache.get(person.id), compute=load)
+        assert load.calls == 1
+        assert {result.first_name for result in results} == {"Ada"}
+        assert len({id(result) for result in results}) == CALLERS
@@ -0,0 +1,120 @@
+"""
+Tests for sparse fieldsets (?fields=).
+"""
+
+import json
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from api.models import Person, Product
+
+
+@pytest.fixture
+def api_client():
+    """Create API client."""
+    return APIClient()
+
+
+@pytest.fixture
+def product():
+    """Create a product with an owner."""
+    owner = Person.objects.create(first_name="Ada", last_name="Lovelace", email="ada@example.com")
+    return Product.objects.create(name="Engine", sku="SPARSE-001", price="99.90", owner=owner)
+
+
+def capture(api_client, url, params):
+    """Return the response and the SQL statements it issued."""
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.get(url, params)
+    return response, [query["sql"] for query in queries.captured_queries]
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+    """Tests for the ?fields= parameter on list, retrieve and export."""
+
+    def test_product_list_returns_only_requested_fields(self, api_client, product):
+        """Test product list rows contain only the requested fields, in serializer order."""
+        response = api_client.get(reverse("product-list"), {"fields": "price,id,sku"})
+        assert response.status_code == status.HTTP_200_OK
+        row = response.json()["results"][0]
+        assert list(row) == ["id", "sku", "price"]
+        assert row == {"id": str(product.id), "sku": "SPARSE-001", "price": "99.90"}
+
+    def test_product_list_skips_owner_join(self, api_client, product):
+        """Test the owner join and unrequested columns are not read."""
+        _response, queries = capture(api_client, reverse("product-list"), {"fields": "id,sku"})
+        page_query = queries[-1]
+        assert "JOIN" not in page_query
+        assert '"products"."name"' not in page_query
+
+        _response, queries = capture(
+            api_client, reverse("product-list"), {"fields": "id,owner_name"}
+        )
+        assert "JOIN" in queries[-1]
+
+    def test_product_list_owner_name(self, api_client, product):
+        """Test computed fields can be requested on their own."""
+        response = api_client.get(reverse("product-list"), {"fields": "owner_name"})
+        assert response.json()["results"] == [{"owner_name": "Ada Lovelace (ada@example.com)"}]
+
+    def test_cursor_pages_without_ordering_field(self, api_client):
+        """Test keyset cursors still work when the ordering field is not requested."""
+        Product.objects.bulk_create(
+            Product(name=f"Item {i}", sku=f"SPARSE-1{i:02d}", price=i) for i in range(25)
+        )
+        params = {"cursor": "", "ordering": "price", "fields": "sku"}
+        first = api_client.get(reverse("product-list"), params).json()
+        second = api_client.get(first["next"]).json()
+        skus = [row["sku"] for row in first["results"] + second["results"]]
+        assert skus == [f"SPARSE-1{i:02d}" for i in range(25)]
+        assert set(first["results"][0]) == {"sku"}
+
+    def test_person_list(self, api_client, product):
+        """Test person list honours ?fields=."""
+        response = api_client.get(reverse("person-list"), {"fields": "email"})
+        assert response.json()["results"] == [{"email": "ada@example.com"}]
+
+    def test_product_retrieve_without_owner(self, api_client, product):
+        """Test retrieve returns the requested fields and skips the owner join."""
+        url = reverse("product-detail", kwargs={"pk": product.id})
+        response, queries = capture(api_client, url, {"fields": "sku,price"})
+        assert response.json() == {"sku": "SPARSE-001", "price": "99.90"}
+        assert len(queries) == 1
+        assert "JOIN" not in queries[0]
+        assert '"products"."name"' not in queries[0]
+
+    def test_product_retrieve_with_owner(self, api_client, product):
+        """Test requesting the nested owner keeps the join in a single query."""
+        url = reverse("product-detail", kwargs={"pk": product.id})
+        response, queries = capture(api_client, url, {"fields": "sku,owner"})
+        assert response.json()["owner"]["email"] == "ada@example.com"
+        assert len(queries) == 1
+
+    def test_export_honours_fields(self, api_client, product):
+        """Test exports contain only the requested columns."""
+        response = api_client.get(reverse("product-export"), {"fields": "sku,owner_name"})
+        rows = [json.loads(line) for line in b"".join(response.streaming_content).splitlines()]
+        assert rows == [{"sku": "SPARSE-001", "owner_name": "Ada Lovelace (ada@example.com)"}]
+
+    def test_unknown_field_is_rejected(self, api_client, product):
+        """Test unknown field names return 400 listing the available fields."""
+        response = api_client.get(reverse("product-list"), {"fields": "sku,secret"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert "secret" in response.json()["fields"][0]
+
+    def test_write_only_field_is_not_selectable(self, api_client, product):
+        """Test write-only fields cannot be requested on retrieve."""
+        url = reverse("product-detail", kwargs={"pk": product.id})
+        response = api_client.get(url, {"fields": "owner_id"})
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+    def test_empty_fields_returns_everything(self, api_client, product):
+        """Test a blank ?fields= is ignored."""
+        response = api_client.get(reverse("product-list"), {"fields": ""})
+        assert len(response.json()["results"][0]) == 6
@@ -2,60 +2,236 @@
 Views for the API app.
 """
 
+from django.conf import settings
+from django.db.models import Prefetch
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import viewsets
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
+from rest_framework.response import Response
 
-from .filters import PersonFilter, ProductFilter
+from health.instrumentation import phase
+
+from .bulk import PersonBulkCreate, ProductBulkCreate, ProductUpsert
+from .export import PersonExport, ProductExport
+from .filters import FullTextSearchFilter, PersonFilter, ProductFilter, TrigramSearchFilter
+from .mixins import (
+    CachedListMixin,
+    ConditionalGetMixin,
+    FieldSelectionMixin,
+    ListPage,
+    ObjectCacheMixin,
+    ProjectedListMixin,
+)
 from .models import Person, Product
+from .pagination import ApiPagination, KeysetPagination
+from .projection import PersonListProjection, PersonProductProjection, ProductListProjection
+from .renderers import CSVRenderer, NDJSONRenderer
 from .serializers import (
+    PersonExpandedSerializer,
     PersonListSerializer,
+    PersonProductSerializer,
     PersonSerializer,
     ProductListSerializer,
     ProductSerializer,
 )
 
 
-class PersonViewSet(viewsets.ModelViewSet):
+class InstrumentedModelViewSet(viewsets.ModelViewSet):
+    """
+    ModelViewSet whose list and retrieve report serialization time.
+
+    Same behaviour as the DRF actions, with serialization timed as the ``serialize``
+    phase of the ``Server-Timing`` header (DB time excluded). Reading and serializing
+    are separate hooks so the ``api.mixins`` can change either one.
+    """
+
+    def read_list_page(self):
+        """Read the list page into a ``ListPage``."""
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        return ListPage(page, queryset if page is None else page)
+
+    def serialize_rows(self, listing):
+        """Serialize the rows of a ``ListPage``."""
+        return self.get_serializer(listing.rows, many=True).data
+
+    def serialize_list_page(self, listing):
+        """Serialize a ``ListPage`` into the response data, pagination envelope included."""
+        with phase("serialize"):
+            data = self.serialize_rows(listing)
+        if listing.page is not None:
+            data = self.get_paginated_response(data).data
+        return data
+
+    def serialize_object(self, instance):
+        with phase("serialize"):
+            return self.get_serializer(instance).data
+
+    def list(self, request, *args, **kwargs):
+        return Response(self.serialize_list_page(self.read_list_page()))
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.serialize_object(self.get_object()))
+
+
+class PersonViewSet(
+    CachedListMixin,
+    ConditionalGetMixin,
+    ObjectCacheMixin,
+    ProjectedListMixin,
+    FieldSelectionMixin,
+    InstrumentedModelViewSet,
+):
     """
     ViewSet for Person CRUD operations.
 
-    list: List all persons with pagination and filters (email, last_name, ordering by created_at)
+    list: List all persons with pagination and filters (email, last_name, ordering by created_at).
+        Pass ?cursor= to switch to keyset pagination on (created_at, id).
+        ?fields=id,email limits the fields returned (also on retrieve and export).
+        ?expand=products embeds each person's newest products (also on retrieve).
     retrieve: Get a specific person by ID
     create: Create a new person
     update: Update a person (PUT)
     partial_update: Partially update a person (PATCH)
     destroy: Delete a person
+    bulk_create: Create up to API_BULK_MAX_ROWS persons in one request, with per-row errors
+    products: List one person's products newest first, with keyset pagination
+    export: Stream every person matching the list filters as NDJSON (default) or CSV
     """
 
     queryset = Person.objects.all()
     filter_backends = [DjangoFilterBackend, OrderingFilter]
     filterset_class = PersonFilter
+    pagination_class = ApiPagination
+    list_projection_class = PersonListProjection
+    expandable_fields = ("products",)
     ordering_fields = ["created_at"]
     ordering = ["-created_at"]
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if "products" in self.get_expanded_fields():
+            # A sliced Prefetch is run as one ROW_NUMBER() OVER (PARTITION BY owner_id)
+            # query for the whole page, so each person carries at most N products.
+            products = Product.objects.only("owner", *PersonProductSerializer.Meta.fields).order_by(
+                "-created_at", "-id"
+            )
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "products",
+                    queryset=products[: settings.API_EXPAND_MAX_PRODUCTS],
+                    to_attr="newest_products",
+                )
+            )
+        return queryset
+
     def get_serializer_class(self):
         """Use different serializers for list and detail views."""
+        if self.action == "products":
+            return PersonProductSerializer
+        if "products" in self.get_expanded_fields():
+            return PersonExpandedSerializer
         if self.action == "list":
             return PersonListSerializer
         return PersonSerializer
 
+    def get_list_cache_models(self):
+        if "products" in self.get_expanded_fields():
+            return (Person, Product)
+        return (Person,)
+
+    def get_object_validators(self, instance):
+        # Embedded products are not covered by the person's updated_at.
+        if "products" in self.get_expanded_fields():
+            return None
+        return super().get_object_validators(instance)
+
+    def get_list_projection(self, fields):
+        # Embedded products need model instances to prefetch into.
+        if "products" in self.get_expanded_fields():
+            return None
+        return super().get_list_projection(fields)
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_create(self, request):
+        """
+        Bulk create persons.
+        POST /api/v1/persons/bulk/ with a JSON list of person objects.
+        """
+        data, status_code = PersonBulkCreate(
+            request.data, context=self.get_serializer_context()
+        ).save()
+        return Response(data, status=status_code)
+
+    @action(detail=True, methods=["get"])
+    def products(self, request, pk=None):
+        """
+        List a person's products, newest first.
+        GET /api/v1/persons/{id}/products/ (follow next/previous for keyset pages)
+        """
+        person = self.get_object()
+        projection = PersonProductProjection(self.get_requested_fields())
+        # Served by products_owner_created_idx: (owner_id, created_at DESC, id DESC).
+        queryset = projection.project(
+            Product.objects.filter(owner=person).order_by("-created_at", "-id")
+        )
+        paginator = KeysetPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        with phase("serialize"):
+            data = projection.serialize(page)
+        return paginator.get_paginated_response(data)
 
-class ProductViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=["get"], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """
+        Export persons.
+        GET /api/v1/persons/export/?format=ndjson|csv (plus any list filter)
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        fields = self.get_requested_fields(PersonListSerializer)
+        return PersonExport(queryset, fields).response(request.accepted_renderer.format)
+
+
+class ProductViewSet(
+    CachedListMixin,
+    ConditionalGetMixin,
+    ObjectCacheMixin,
+    ProjectedListMixin,
+    FieldSelectionMixin,
+    InstrumentedModelViewSet,
+):
     """
     ViewSet for Product CRUD operations.
 
-    list: List all products with pagination and filters (sku, price_min, price_max, q for name search, ordering by price/created_at)
+    list: List all products with pagination and filters (sku, price_min, price_max, q for name search, ordering by price/created_at).
+        ?search= matches name substrings; ?fulltext= runs a relevance-ranked full-text
+        search over name and SKU.
+        Pass ?cursor= to switch to keyset pagination on (created_at, id) or (price, id).
+        ?fields=id,sku,price limits the fields returned (also on retrieve and export).
     retrieve: Get a specific product by ID
     create: Create a new product
     update: Update a product (PUT)
     partial_update: Partially update a product (PATCH)
     destroy: Delete a product
+    bulk_create: Create up to API_BULK_MAX_ROWS products in one request, with per-row errors
+    upsert: Insert or update up to API_BULK_MAX_ROWS products keyed on SKU
+    export: Stream every product matching the list filters as NDJSON (default) or CSV
     """
 
     queryset = Product.objects.select_related("owner").all()
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    # FullTextSearchFilter sorts by relevance, so it has to run after OrderingFilter.
+    filter_backends = [
+        DjangoFilterBackend,
+        TrigramSearchFilter,
+        OrderingFilter,
+        FullTextSearchFilter,
+    ]
     filterset_class = ProductFilter
+    pagination_class = ApiPagination
+    list_projection_class = ProductListProjection
+    # Rows embed owner_name, so owner changes invalidate cached lists too.
+    list_cache_models = (Product, Person)
     search_fields = ["name"]
     ordering_fields = ["price", "created_at"]
     ordering = ["-created_at"]
@@ -65,3 +241,42 @@ class ProductViewSet(viewsets.ModelViewSet):
         if self.action == "list":
             return ProductListSerializer
         return ProductSerializer
+
+    def get_object_validators(self, instance):
+        validators = super().get_object_validators(instance)
+        # The owner is only loaded when it is part of the response.
+        if Product.owner.is_cached(instance):
+            validators.append(instance.owner.updated_at if instance.owner else None)
+        return validators
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk_create(self, request):
+        """
+        Bulk create products.
+        POST /api/v1/products/bulk/ with a JSON list of product objects.
+        """
+        data, status_code = ProductBulkCreate(
+            request.data, context=self.get_serializer_context()
+        ).save()
+        return Response(data, status=status_code)
+
+    @action(detail=False, methods=["post"], url_path="upsert")
+    def upsert(self, request):
+        """
+        Insert or update products by SKU.
+        POST /api/v1/products/upsert/ with a JSON list of product objects.
+        """
+        data, status_code = ProductUpsert(
+            request.data, context=self.get_serializer_context()
+        ).save()
+        return Response(data, status=status_code)
+
+    @action(detail=False, methods=["get"], renderer_classes=[NDJSONRenderer, CSVRenderer])
+    def export(self, request):
+        """
+        Export products.
+        GET /api/v1/products/export/?format=ndjson|csv (plus any list filter)
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        fields = self.get_requested_fields(ProductListSerializer)
+        return ProductExport(queryset, fields).response(request.accepted_renderer.format)
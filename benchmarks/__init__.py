@@ -0,0 +1,7 @@
+"""
+Performance benchmarks for django-microservice.
+
+Each module is runnable with ``python -m benchmarks.<name> --help``. Benchmarks talk to
+the database configured by ``DATABASE_URL``; point it at a disposable PostgreSQL
+instance, never at production.
+"""
@@ -0,0 +1,37 @@
+"""
+Shared helpers for the benchmark scripts (statistics live in ``api.stats``).
+"""
+
+import os
+import time
+
+
+def setup_django(settings_module="core.settings.dev", response_caches=True):
+    """
+    Configure Django for a standalone benchmark run (SQL logging and DEBUG off).
+
+    ``response_caches=False`` sets the list and object cache TTLs to 0, so repeated
+    requests reach the database instead of being served from the cache.
+    """
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", settings_module)
+    os.environ.setdefault("DEBUG", "False")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    if not response_caches:
+        os.environ["API_LIST_CACHE_TTL"] = "0"
+        os.environ["API_OBJECT_CACHE_TTL"] = "0"
+
+    import django
+
+    django.setup()
+
+
+def measure(func, repeat, warmup=1):
+    """Call ``func`` ``warmup`` + ``repeat`` times and return the timed durations."""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
@@ -0,0 +1,350 @@
+"""
+Endpoint latency baseline: every API action driven through the WSGI app in-process.
+
+Calls ``core.wsgi.application`` directly (no HTTP server, no network) against the
+data already in ``DATABASE_URL`` (see ``manage.py seed``), so the numbers cover the
+whole Django stack: middleware, routing, filters, pagination, serialization and SQL.
+For each case it reports latency percentiles plus the queries and DB time per request
+taken from the ``Server-Timing`` header, and can save the run as JSON and compare it
+against a previous run.
+
+The list and object caches are off unless ``--cache`` is given: after warm-up every
+read would be a cache hit, hiding the queries and latency the baseline is meant to
+track. The TTLs used are recorded in the results' ``meta``.
+
+Usage:
+    python manage.py seed --persons 100000 --products 1000000
+    python -m benchmarks.endpoints --output baseline.json
+    python -m benchmarks.endpoints --compare baseline.json --output after.json
+"""
+
+import argparse
+import io
+import itertools
+import json
+import re
+import subprocess
+import sys
+import time
+from datetime import UTC, datetime
+
+from api.stats import percentile, print_table, summarize
+from benchmarks.common import setup_django
+
+# SKU prefix of the rows created by the write cases (deleted at the end of a run).
+BENCH_SKU_PREFIX = "BENCHAPI-"
+
+PERSON_FILTERS = {"email": "maria", "last_name": "garcia"}
+PRODUCT_FILTERS = {
+    "sku": "-0000012",
+    "q": "laptop",
+    "price": {"price_min": "20", "price_max": "100"},
+}
+
+_SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries"')
+
+
+class WSGIDriver:
+    """Issue requests straight into a WSGI callable."""
+
+    def __init__(self, application, host="localhost"):
+        self.application = application
+        self.host = host
+
+    def request(self, method, path, body=None):
+        """Return ``(status, headers, body bytes)``."""
+        path, _, query = path.partition("?")
+        payload = json.dumps(body).encode("utf-8") if body is not None else b""
+        environ = {
+            "REQUEST_METHOD": method,
+            "PATH_INFO": path,
+            "QUERY_STRING": query,
+            "SERVER_NAME": self.host,
+            "SERVER_PORT": "80",
+            "SERVER_PROTOCOL": "HTTP/1.1",
+            "HTTP_HOST": self.host,
+            "HTTP_ACCEPT": "application/json",
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(payload)),
+            "wsgi.version": (1, 0),
+            "wsgi.url_scheme": "http",
+            "wsgi.input": io.BytesIO(payload),
+            "wsgi.errors": sys.stderr,
+            "wsgi.multithread": False,
+            "wsgi.multiprocess": False,
+            "wsgi.run_once": False,
+        }
+        started = {}
+
+        def start_response(status, headers, exc_info=None):
+            started["status"] = int(status.split(" ", 1)[0])
+            started["headers"] = dict(headers)
+
+        result = self.application(environ, start_response)
+        try:
+            content = b"".join(result)
+        finally:
+            if hasattr(result, "close"):
+                result.close()
+        return started["status"], started["headers"], content
+
+
+def filter_combinations(filters):
+    """Yield ``(label, query string)`` for every non-empty combination of ``filters``."""
+    names = list(filters)
+    for size in range(1, len(names) + 1):
+        for combo in itertools.combinations(names, size):
+            params = {}
+            for name in combo:
+                value = filters[name]
+                params.update(value if isinstance(value, dict) else {name: value})
+            yield "+".join(combo), "&".join(f"{key}={value}" for key, value in params.items())
+
+
+def deep_cursor(model, path, offset, ordering="-created_at"):
+    """Return a keyset cursor URL resuming after row ``offset`` in ``ordering``."""
+    from api.pagination import Keyset, KeysetPagination
+
+    field = ordering.lstrip("-")
+    row = model.objects.order_by(ordering, f"{'-' if ordering[0] == '-' else ''}id").values(
+        field, "id"
+    )[offset]
+    paginator = KeysetPagination()
+    paginator.base_url = f"{path}?cursor="
+    url = paginator.encode_cursor(
+        Keyset(ordering=ordering, value=row[field], pk=row["id"], reverse=False)
+    )
+    return url if ordering == "-created_at" else f"{url}&ordering={ordering}"
+
+
+def build_cases(depth):
+    """Return the benchmark cases as ``(name, method, path or callable, body callable)``."""
+    from api.models import Person, Product
+
+    person = Person.objects.order_by("created_at").first()
+    product = Product.objects.order_by("created_at").first()
+    counter = itertools.count()
+    persons_offset = min(depth, Person.objects.count() - 1)
+    products_offset = min(depth, Product.objects.count() - 1)
+
+    cases = [("persons list", "GET", "/api/v1/persons/", None)]
+    for label, query in filter_combinations(PERSON_FILTERS):
+        cases.append((f"persons list {label}", "GET", f"/api/v1/persons/?{query}", None))
+    cases += [
+        (
+            f"persons page offset {persons_offset}",
+            "GET",
+            f"/api/v1/persons/?page={persons_offset // 20 + 1}",
+            None,
+        ),
+        (
+            f"persons cursor after {persons_offset}",
+            "GET",
+            deep_cursor(Person, "/api/v1/persons/", persons_offset),
+            None,
+        ),
+        ("persons retrieve", "GET", f"/api/v1/persons/{person.pk}/", None),
+        (
+            "persons create",
+            "POST",
+            "/api/v1/persons/",
+            lambda: {
+                "first_name": "Bench",
+                "last_name": "Mark",
+                "email": f"bench.{time.time_ns()}.{next(counter)}@benchmark.example.com",
+            },
+        ),
+        ("products list", "GET", "/api/v1/products/", None),
+    ]
+    for label, query in filter_combinations(PRODUCT_FILTERS):
+        cases.append((f"products list {label}", "GET", f"/api/v1/products/?{query}", None))
+    cases += [
+        ("products list ordering=price", "GET", "/api/v1/products/?ordering=price", None),
+        ("products search", "GET", "/api/v1/products/?search=wireless%20laptop", None),
+        ("products fulltext", "GET", "/api/v1/products/?fulltext=wireless%20laptop", None),
+        (
+            f"products page offset {products_offset}",
+            "GET",
+            f"/api/v1/products/?page={products_offset // 20 + 1}",
+            None,
+        ),
+        (
+            f"products cursor after {products_offset}",
+            "GET",
+            deep_cursor(Product, "/api/v1/products/", products_offset),
+            None,
+        ),
+        (
+            f"products cursor price after {products_offset}",
+            "GET",
+            deep_cursor(Product, "/api/v1/products/", products_offset, ordering="price"),
+            None,
+        ),
+        ("products retrieve", "GET", f"/api/v1/products/{product.pk}/", None),
+        (
+            "products create",
+            "POST",
+            "/api/v1/products/",
+            lambda: {
+                "name": "Benchmark product",
+                "sku": f"{BENCH_SKU_PREFIX}{time.time_ns() % 10**12}{next(counter)}",
+                "price": "10.00",
+                "owner_id": str(person.pk),
+            },
+        ),
+        (
+            "products update",
+            "PATCH",
+            f"/api/v1/products/{product.pk}/",
+            lambda: {"price": str(product.price)},
+        ),
+        ("readyz", "GET", "/readyz/", None),
+        ("metrics", "GET", "/metrics/", None),
+    ]
+    return cases
+
+
+def run_case(driver, method, path, body, repeat, warmup):
+    durations, queries, db_ms = [], [], []
+    status = None
+    for iteration in range(warmup + repeat):
+        payload = body() if body else None
+        start = time.perf_counter()
+        status, headers, _content = driver.request(method, path, payload)
+        elapsed = time.perf_counter() - start
+        if iteration < warmup:
+            continue
+        durations.append(elapsed)
+        match = _SERVER_TIMING_DB.search(headers.get("Server-Timing", ""))
+        if match:
+            db_ms.append(float(match.group(1)))
+            queries.append(int(match.group(2)))
+    stats = summarize(durations)
+    stats["status"] = status
+    stats["queries"] = max(queries) if queries else None
+    stats["db_p50_ms"] = percentile(sorted(db_ms), 50) if db_ms else None
+    return stats
+
+
+def cleanup():
+    from api.models import Person, Product
+
+    Product.objects.filter(sku__startswith=BENCH_SKU_PREFIX).delete()
+    Person.objects.filter(email__endswith="@benchmark.example.com").delete()
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(baseline, current, threshold):
+    """Return comparison rows and whether any case regressed beyond ``threshold``."""
+    previous = {row["case"]: row for row in baseline["results"]}
+    rows, regressed = [], False
+    for row in current["results"]:
+        old = previous.get(row["case"])
+        if old is None:
+            continue
+        delta = (row["p95_ms"] - old["p95_ms"]) / old["p95_ms"] if old["p95_ms"] else 0.0
+        more_queries = (row["queries"] or 0) > (old["queries"] or 0)
+        flag = "REGRESSION" if delta > threshold or more_queries else ""
+        regressed = regressed or bool(flag)
+        rows.append(
+            {
+                "case": row["case"],
+                "p50_ms": f"{old['p50_ms']} -> {row['p50_ms']}",
+                "p95_ms": f"{old['p95_ms']} -> {row['p95_ms']}",
+                "p95_change": f"{delta:+.1%}",
+                "queries": f"{old['queries']} -> {row['queries']}",
+                "flag": flag,
+            }
+        )
+    return rows, regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=50, help="Timed requests per case")
+    parser.add_argument("--warmup", type=int, default=5, help="Untimed requests per case")
+    parser.add_argument("--depth", type=int, default=10000, help="Row offset of deep pages")
+    parser.add_argument("--filter", help="Only run cases whose name contains this text")
+    parser.add_argument("--output", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Compare against a previous JSON results file")
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="Keep the list and object caches on (reads after warm-up become cache hits)",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.10,
+        help="p95 slowdown reported as a regression when comparing (default: 0.10)",
+    )
+    args = parser.parse_args()
+
+    setup_django(response_caches=args.cache)
+    from django.conf import settings
+    from django.db import connection
+
+    from api.models import Person, Product
+    from core.wsgi import application
+
+    persons, products = Person.objects.count(), Product.objects.count()
+    if not persons or not products:
+        parser.error("the database is empty; run `python manage.py seed` first")
+
+    driver = WSGIDriver(application)
+    results = []
+    try:
+        for name, method, path, body in build_cases(args.depth):
+            if args.filter and args.filter not in name:
+                continue
+            stats = run_case(driver, method, path, body, args.repeat, args.warmup)
+            results.append({"case": name, "method": method, "path": path, **stats})
+            print(f"{name}: p50 {stats['p50_ms']} ms", file=sys.stderr)
+    finally:
+        cleanup()
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now(UTC).isoformat(),
+            "revision": git_revision(),
+            "database": connection.vendor,
+            "persons": persons,
+            "products": products,
+            "repeat": args.repeat,
+            "list_cache_ttl": settings.API_LIST_CACHE_TTL,
+            "object_cache_ttl": settings.API_OBJECT_CACHE_TTL,
+        },
+        "results": results,
+    }
+    print(f"\n{persons} persons, {products} products on {connection.vendor}\n")
+    print_table(
+        results,
+        ["case", "status", "p50_ms", "p95_ms", "p99_ms", "max_ms", "queries", "db_p50_ms"],
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2, default=str)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        rows, regressed = compare(baseline, report, args.threshold)
+        print(f"\nCompared with {args.compare} ({baseline['meta'].get('revision')}):\n")
+        for key in ("list_cache_ttl", "object_cache_ttl"):
+            if baseline["meta"].get(key) != report["meta"][key]:
+                print(f"warning: {key} differs from the baseline; results are not comparable\n")
+        print_table(rows, ["case", "p50_ms", "p95_ms", "p95_change", "queries", "flag"])
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Per-request overhead of ``health.middleware.PrometheusMiddleware``.
+
+Calls a trivial view directly and through the middleware (no database, no network)
+and reports the added cost per request in microseconds, for a resolved detail
+route and for an unmatched path.
+
+Usage:
+    python -m benchmarks.middleware --calls 100000
+"""
+
+import argparse
+
+from api.stats import print_table, summarize
+from benchmarks.common import measure, setup_django
+
+
+def run(calls, repeat):
+    from django.http import HttpResponse
+    from django.test import RequestFactory
+    from django.urls import resolve
+
+    from health.middleware import PrometheusMiddleware
+
+    factory = RequestFactory()
+    body = b'{"status": "ok"}'
+    resolved = factory.get("/api/v1/persons/3fa85f64-5717-4562-b3fc-2c963f66afa6/")
+    resolved.resolver_match = resolve(resolved.path)
+    unmatched = factory.get("/does-not-exist/")
+    unmatched.resolver_match = None
+
+    def view(request):
+        return HttpResponse(body, content_type="application/json")
+
+    instrumented = PrometheusMiddleware(view)
+
+    def loop(handler, request):
+        def call():
+            for _ in range(calls):
+                handler(request)
+
+        return call
+
+    cases = [
+        ("bare view", view, resolved),
+        ("middleware, resolved route", instrumented, resolved),
+        ("middleware, unmatched path", instrumented, unmatched),
+    ]
+    results = []
+    baseline = None
+    for name, handler, request in cases:
+        stats = summarize(measure(loop(handler, request), repeat))
+        per_call_us = round(stats["p50_ms"] * 1000 / calls, 3)
+        baseline = per_call_us if baseline is None else baseline
+        results.append(
+            {
+                "case": name,
+                "us_per_request": per_call_us,
+                "overhead_us": round(per_call_us - baseline, 3),
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=100_000, help="Requests per timed run")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case")
+    args = parser.parse_args()
+
+    setup_django()
+    print(f"Median of {args.repeat} runs of {args.calls} requests.\n")
+    print_table(run(args.calls, args.repeat), ["case", "us_per_request", "overhead_us"])
+
+
+if __name__ == "__main__":
+    main()
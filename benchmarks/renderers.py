@@ -0,0 +1,95 @@
+"""
+JSON rendering of list pages: stock ``JSONRenderer`` vs. ``ORJSONRenderer``.
+
+Builds person and product list pages (the paginated envelope around
+``api.projection`` rows, as ``PersonViewSet`` and ``ProductViewSet`` return them) from
+the data already in ``DATABASE_URL`` (see ``manage.py seed``), then times rendering each
+page with both renderers and parsing the result back with both parsers. Both renderers
+are checked to produce the same bytes.
+
+Usage:
+    python manage.py seed --persons 20000 --products 200000
+    python -m benchmarks.renderers --page-size 20 --page-size 100 --page-size 1000
+"""
+
+import argparse
+import io
+
+from api.stats import print_table, summarize
+from benchmarks.common import measure, setup_django
+
+
+def run(page_sizes, repeat):
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+
+    from api.models import Person, Product
+    from api.projection import PersonListProjection, ProductListProjection
+    from api.renderers import ORJSONParser, ORJSONRenderer, orjson
+
+    if orjson is None:
+        raise SystemExit("orjson is not installed (pip install orjson)")
+
+    resources = [
+        ("persons", Person.objects.all(), PersonListProjection()),
+        ("products", Product.objects.select_related("owner"), ProductListProjection()),
+    ]
+    renderers = [
+        ("stock", JSONRenderer(), JSONParser()),
+        ("orjson", ORJSONRenderer(), ORJSONParser()),
+    ]
+    results = []
+    for page_size in page_sizes:
+        for name, queryset, projection in resources:
+            page = queryset.order_by("-created_at", "-id")[:page_size]
+            rows = projection.serialize(projection.project(page))
+            data = {"count": len(rows), "next": None, "previous": None, "results": rows}
+            rendered = {path: renderer.render(data) for path, renderer, _ in renderers}
+            if rendered["stock"] != rendered["orjson"]:
+                raise SystemExit(f"{name}: ORJSONRenderer output differs from JSONRenderer")
+
+            timings = {}
+            for path, renderer, parser in renderers:
+                render = summarize(
+                    measure(lambda r=renderer, d=data: r.render(d), repeat, warmup=5)
+                )
+                content = rendered[path]
+                parse = summarize(
+                    measure(lambda p=parser, c=content: p.parse(io.BytesIO(c)), repeat, warmup=5)
+                )
+                timings[path] = (render["p50_ms"], parse["p50_ms"])
+                results.append(
+                    {
+                        "case": f"{name} x{len(rows)} {path}",
+                        "bytes": len(content),
+                        "render_ms": render["p50_ms"],
+                        "parse_ms": parse["p50_ms"],
+                    }
+                )
+            speedup = timings["stock"][0] / timings["orjson"][0]
+            results[-1]["render_speedup"] = f"{speedup:.1f}x"
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        action="append",
+        dest="page_sizes",
+        help="Rows per page (repeatable; default: 20, 100 and 1000)",
+    )
+    parser.add_argument("--repeat", type=int, default=200, help="Timed runs per case")
+    args = parser.parse_args()
+
+    setup_django()
+    print(f"Median of {args.repeat} runs.\n")
+    print_table(
+        run(args.page_sizes or [20, 100, 1000], args.repeat),
+        ["case", "bytes", "render_ms", "parse_ms", "render_speedup"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Substring search latency: stock ``icontains`` vs. trigram-indexed ``trgm_icontains``.
+
+Tops the ``products`` table up to ``--rows`` synthetic rows (SKU prefix ``BENCH-``),
+then times the two queries a filtered list page issues (page of 20 + ``COUNT(*)``) for
+each lookup and search term.
+
+Usage:
+    DATABASE_URL=postgres://... python -m benchmarks.search --rows 1000000
+    DATABASE_URL=postgres://... python -m benchmarks.search --cleanup
+"""
+
+import argparse
+import sys
+
+from api.stats import print_table, summarize
+from benchmarks.common import measure, setup_django
+
+BENCH_SKU_PREFIX = "BENCH-"
+DEFAULT_TERMS = ["laptop", "ergo", "pro 12", "BENCH-0042", "zzqx"]
+
+WORDS = [
+    "Laptop", "Mouse", "Keyboard", "Monitor", "Desk", "Chair", "Lamp", "Cable", "Charger",
+    "Speaker", "Headset", "Webcam", "Router", "Tablet", "Phone", "Printer", "Scanner",
+    "Ergonomic", "Wireless", "Portable", "Pro", "Mini", "Ultra", "Compact", "Smart",
+]  # fmt: skip
+
+
+def seed(rows):
+    """Insert synthetic products until ``rows`` benchmark rows exist."""
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT count(*) FROM products WHERE sku LIKE %s", [BENCH_SKU_PREFIX + "%"])
+        existing = cursor.fetchone()[0]
+        if existing >= rows:
+            return existing
+        print(f"Inserting {rows - existing} products...", file=sys.stderr)
+        cursor.execute(
+            """
+            INSERT INTO products (id, name, sku, price, owner_id, created_at, updated_at)
+            SELECT gen_random_uuid(),
+                   (%(words)s::text[])[1 + (i * 7) %% %(n)s] || ' '
+                       || (%(words)s::text[])[1 + (i * 13) %% %(n)s] || ' ' || (i %% 1000),
+                   %(prefix)s || lpad(i::text, 8, '0'),
+                   round((random() * 1000)::numeric, 2),
+                   NULL,
+                   now() - make_interval(secs => i),
+                   now() - make_interval(secs => i)
+            FROM generate_series(%(start)s, %(stop)s) AS i
+            """,
+            {
+                "words": WORDS,
+                "n": len(WORDS),
+                "prefix": BENCH_SKU_PREFIX,
+                "start": existing + 1,
+                "stop": rows,
+            },
+        )
+        cursor.execute("ANALYZE products")
+    return rows
+
+
+def cleanup():
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute("DELETE FROM products WHERE sku LIKE %s", [BENCH_SKU_PREFIX + "%"])
+        print(f"Deleted {cursor.rowcount} benchmark products.", file=sys.stderr)
+        cursor.execute("ANALYZE products")
+
+
+def run(terms, repeat):
+    from api.models import Product
+
+    results = []
+    for term in terms:
+        for lookup in ("icontains", "trgm_icontains"):
+            queryset = Product.objects.filter(**{f"name__{lookup}": term})
+            page = summarize(measure(lambda qs=queryset: list(qs[:20]), repeat))
+            count = summarize(measure(lambda qs=queryset: qs.count(), repeat))
+            results.append(
+                {
+                    "term": term,
+                    "lookup": lookup,
+                    "matches": queryset.count(),
+                    "page_p50_ms": page["p50_ms"],
+                    "page_p95_ms": page["p95_ms"],
+                    "count_p50_ms": count["p50_ms"],
+                    "count_p95_ms": count["p95_ms"],
+                }
+            )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Benchmark rows to ensure")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per query")
+    parser.add_argument("--term", action="append", dest="terms", help="Search term (repeatable)")
+    parser.add_argument("--cleanup", action="store_true", help="Delete benchmark rows and exit")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+
+    if connection.vendor != "postgresql":
+        parser.error("this benchmark needs PostgreSQL with the pg_trgm indexes (run migrate)")
+
+    if args.cleanup:
+        cleanup()
+        return
+
+    total = seed(args.rows)
+    print(f"Benchmarking against {total} benchmark products.\n")
+    print_table(
+        run(args.terms or DEFAULT_TERMS, args.repeat),
+        ["term", "lookup", "matches", "page_p50_ms", "page_p95_ms", "count_p50_ms", "count_p95_ms"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+List page serialization: model serializers vs. ``values()`` projections.
+
+Times fetching and serializing one list page the way ``PersonViewSet`` and
+``ProductViewSet`` used to (model instances through ``PersonListSerializer`` /
+``ProductListSerializer``) and the way they do now (``api.projection``), against the
+data already in ``DATABASE_URL`` (see ``manage.py seed``). Fetch and serialization are
+reported separately, and both paths are checked to produce the same output.
+
+Usage:
+    python manage.py seed --persons 20000 --products 200000
+    python -m benchmarks.serialization --page-size 20 --page-size 100
+"""
+
+import argparse
+
+from api.stats import print_table, summarize
+from benchmarks.common import measure, setup_django
+
+
+def run(page_sizes, repeat):
+    from api.models import Person, Product
+    from api.projection import PersonListProjection, ProductListProjection
+    from api.serializers import PersonListSerializer, ProductListSerializer
+
+    resources = [
+        ("persons", Person.objects.all(), PersonListSerializer, PersonListProjection()),
+        (
+            "products",
+            Product.objects.select_related("owner"),
+            ProductListSerializer,
+            ProductListProjection(),
+        ),
+    ]
+    results = []
+    for page_size in page_sizes:
+        for name, queryset, serializer_class, projection in resources:
+            page = queryset.order_by("-created_at", "-id")[:page_size]
+            instances = list(page)
+            rows = list(projection.project(page))
+            if serializer_class(instances, many=True).data != projection.serialize(rows):
+                raise SystemExit(f"{name}: projection output differs from the serializer")
+
+            cases = [
+                ("serializer", lambda p=page: list(p.all()), None),
+                ("serializer", None, lambda s=serializer_class, i=instances: s(i, many=True).data),
+                ("projection", lambda pr=projection, p=page: list(pr.project(p)), None),
+                ("projection", None, lambda pr=projection, r=rows: pr.serialize(r)),
+            ]
+            timings = {}
+            for path, fetch, serialize in cases:
+                stage = "fetch" if fetch else "serialize"
+                stats = summarize(measure(fetch or serialize, repeat, warmup=5))
+                timings[(path, stage)] = stats["p50_ms"]
+            for path in ("serializer", "projection"):
+                results.append(
+                    {
+                        "case": f"{name} x{page_size} {path}",
+                        "fetch_ms": timings[(path, "fetch")],
+                        "serialize_ms": timings[(path, "serialize")],
+                        "total_ms": round(
+                            timings[(path, "fetch")] + timings[(path, "serialize")], 3
+                        ),
+                    }
+                )
+            speedup = timings[("serializer", "serialize")] / timings[("projection", "serialize")]
+            results[-1]["serialize_speedup"] = f"{speedup:.1f}x"
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--page-size",
+        type=int,
+        action="append",
+        dest="page_sizes",
+        help="Rows per page (repeatable; default: 20 and 100)",
+    )
+    parser.add_argument("--repeat", type=int, default=200, help="Timed runs per case")
+    args = parser.parse_args()
+
+    setup_django()
+    print(f"Median of {args.repeat} runs.\n")
+    print_table(
+        run(args.page_sizes or [20, 100], args.repeat),
+        ["case", "fetch_ms", "serialize_ms", "total_ms", "serialize_speedup"],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+"""
+Shared pytest fixtures.
+"""
+
+from importlib import import_module
+
+import pytest
+from django.core.cache import cache
+from django.db import connection
+
+from api.cache import clear_object_caches
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Start every test with empty caches so cached API data never leaks between tests."""
+    cache.clear()
+    clear_object_caches()
+    yield
+    cache.clear()
+    clear_object_caches()
+
+
+@pytest.fixture
+def trigram_indexes(db):
+    """Create the pg_trgm GIN indexes of migration 0002, which --nomigrations skips."""
+    if connection.vendor != "postgresql":
+        return
+    migration = import_module("api.migrations.0002_trigram_indexes")
+    quote = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        for name, table, column in migration.TRIGRAM_INDEXES:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {quote(name)} "
+                f"ON {quote(table)} USING gin ({quote(column)} gin_trgm_ops)"
+            )
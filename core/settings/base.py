@@ -35,6 +35,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "health.middleware.PrometheusMiddleware",
+    "health.middleware.QueryInstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "corsheaders.middleware.CorsMiddleware",
@@ -74,6 +76,22 @@ DATABASES = {
     )
 }
 
+# Cache: "locmem" is per process; "file" is shared by every gunicorn worker on the host,
+# so a write handled by one worker invalidates the cached lists of all of them.
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "locmem")
+CACHES = {
+    "default": {
+        "BACKEND": {
+            "locmem": "django.core.cache.backends.locmem.LocMemCache",
+            "file": "django.core.cache.backends.filebased.FileBasedCache",
+        }[CACHE_BACKEND],
+        "LOCATION": os.getenv(
+            "CACHE_LOCATION", "/tmp/django-cache" if CACHE_BACKEND == "file" else "api"
+        ),
+        "OPTIONS": {"MAX_ENTRIES": int(os.getenv("CACHE_MAX_ENTRIES", "10000"))},
+    }
+}
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -104,6 +122,10 @@ STATIC_ROOT = BASE_DIR / "staticfiles"
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # REST Framework
+# JSON encoding of API responses, request bodies and NDJSON exports/imports: "stdlib"
+# (DRF's stock renderer/parser) or, opt-in, "orjson" (faster; used when installed)
+API_JSON_BACKEND = os.getenv("API_JSON_BACKEND", "stdlib")
+
 REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 20,
@@ -113,11 +135,20 @@ REST_FRAMEWORK = {
         "django_filters.rest_framework.DjangoFilterBackend",
     ],
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    # API_JSON_BACKEND=orjson renders/parses the same JSON faster (api.renderers)
     "DEFAULT_RENDERER_CLASSES": [
-        "rest_framework.renderers.JSONRenderer",
+        (
+            "api.renderers.ORJSONRenderer"
+            if API_JSON_BACKEND == "orjson"
+            else "rest_framework.renderers.JSONRenderer"
+        ),
     ],
     "DEFAULT_PARSER_CLASSES": [
-        "rest_framework.parsers.JSONParser",
+        (
+            "api.renderers.ORJSONParser"
+            if API_JSON_BACKEND == "orjson"
+            else "rest_framework.parsers.JSONParser"
+        ),
     ],
     # JWT Authentication (optional, can be enabled via env)
     "DEFAULT_AUTHENTICATION_CLASSES": (
@@ -135,6 +166,40 @@ REST_FRAMEWORK = {
     ],
 }
 
+# API list pagination
+# Exact list counts are cached per filter set for this many seconds (and dropped on writes)
+API_COUNT_CACHE_TTL = int(os.getenv("API_COUNT_CACHE_TTL", "30"))
+# Unfiltered lists report the PostgreSQL planner estimate once a table reaches this size
+API_COUNT_ESTIMATE_THRESHOLD = int(os.getenv("API_COUNT_ESTIMATE_THRESHOLD", "100000"))
+
+# List response cache: fresh for API_LIST_CACHE_TTL seconds (0 disables it), then served
+# stale for up to API_LIST_CACHE_STALE_TTL more seconds while one request refreshes it
+API_LIST_CACHE_TTL = int(os.getenv("API_LIST_CACHE_TTL", "30"))
+API_LIST_CACHE_STALE_TTL = int(os.getenv("API_LIST_CACHE_STALE_TTL", "300"))
+
+# Object cache used by retrieve and owner lookups: shared tier TTL (0 disables the
+# cache), and size/TTL of the per-process LRU tier in front of it
+API_OBJECT_CACHE_TTL = int(os.getenv("API_OBJECT_CACHE_TTL", "300"))
+API_OBJECT_CACHE_LOCAL_SIZE = int(os.getenv("API_OBJECT_CACHE_LOCAL_SIZE", "1000"))
+API_OBJECT_CACHE_LOCAL_TTL = int(os.getenv("API_OBJECT_CACHE_LOCAL_TTL", "5"))
+
+# Concurrent identical cache misses wait up to this many seconds for the request
+# already computing the value (also the TTL of the cross-worker lock)
+API_COALESCE_TIMEOUT = int(os.getenv("API_COALESCE_TIMEOUT", "5"))
+
+# Bulk endpoints
+API_BULK_MAX_ROWS = int(os.getenv("API_BULK_MAX_ROWS", "5000"))
+API_BULK_BATCH_SIZE = int(os.getenv("API_BULK_BATCH_SIZE", "1000"))
+
+# ?expand=products: newest products embedded per person
+API_EXPAND_MAX_PRODUCTS = int(os.getenv("API_EXPAND_MAX_PRODUCTS", "10"))
+
+# Streaming exports: rows fetched per server-side cursor round trip
+API_EXPORT_CHUNK_SIZE = int(os.getenv("API_EXPORT_CHUNK_SIZE", "2000"))
+
+# Request instrumentation: queries slower than this are logged with their route
+SLOW_QUERY_THRESHOLD_MS = int(os.getenv("SLOW_QUERY_THRESHOLD_MS", "200"))
+
 # CORS
 CORS_ALLOWED_ORIGINS = os.getenv("CORS_ALLOWED_ORIGINS", "http://localhost:3000").split(",")
 
@@ -0,0 +1,33 @@
+"""
+Gunicorn configuration.
+
+Sets up prometheus_client multiprocess mode: the metrics directory is emptied when
+the master starts, and the live-gauge files of each worker are removed when it exits
+so ``/metrics`` only sums ``http_requests_in_progress`` over running workers.
+"""
+
+import os
+import shutil
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("GUNICORN_WORKERS", "4"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+accesslog = "-"
+errorlog = "-"
+
+
+def on_starting(server):
+    path = os.environ.get("PROMETHEUS_MULTIPROC_DIR")
+    if not path:
+        return
+    # Files left by a previous run would be added to this run's totals.
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return
+    from prometheus_client import multiprocess
+
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,98 @@
+"""
+Per-request timing of database queries and response phases.
+
+``QueryInstrumentationMiddleware`` opens a ``RequestTimings`` scope for each request;
+``record_query`` (installed with ``connection.execute_wrapper``) adds every query to
+it and ``phase()`` adds the time spent in a named phase such as serialization.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from .routes import get_endpoint
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar("request_timings", default=None)
+
+# Longest SQL text written to the slow query log.
+MAX_LOGGED_SQL = 2000
+
+
+class RequestTimings:
+    """Query count, DB time and phase durations (seconds) of one request."""
+
+    def __init__(self, request, slow_query_seconds):
+        self.request = request
+        self.slow_query_seconds = slow_query_seconds
+        self.queries = 0
+        self.db = 0.0
+        self.phases = {}
+
+    def add_phase(self, name, seconds):
+        self.phases[name] = self.phases.get(name, 0.0) + seconds
+
+    def server_timing(self):
+        """Format the timings as a ``Server-Timing`` header value (milliseconds)."""
+        entries = [f'db;dur={self.db * 1000:.1f};desc="{self.queries} queries"']
+        entries += [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.phases.items()]
+        return ", ".join(entries)
+
+
+def current_timings():
+    """Return the ``RequestTimings`` of the request being handled, if any."""
+    return _current.get()
+
+
+@contextmanager
+def timing_scope(timings):
+    token = _current.set(timings)
+    try:
+        yield timings
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def phase(name):
+    """
+    Add the time spent in the block to the ``name`` phase of the current request.
+
+    Database time spent inside the block is excluded, since it is already reported
+    as ``db``. Outside a request this is a no-op.
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    db_start = timings.db
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start - (timings.db - db_start)
+        timings.add_phase(name, max(elapsed, 0.0))
+
+
+def record_query(execute, sql, params, many, context):
+    """``execute_wrapper`` counting and timing queries, and logging slow ones."""
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        timings.queries += 1
+        timings.db += elapsed
+        if elapsed >= timings.slow_query_seconds:
+            logger.warning(
+                "Slow query route=%s method=%s duration_ms=%.1f sql=%s",
+                get_endpoint(timings.request),
+                timings.request.method,
+                elapsed * 1000,
+                sql[:MAX_LOGGED_SQL],
+            )
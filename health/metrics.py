@@ -0,0 +1,88 @@
+"""
+Prometheus metrics of the service.
+
+Under gunicorn every worker is a separate process with its own in-memory values.
+When ``PROMETHEUS_MULTIPROC_DIR`` is set (before ``prometheus_client`` is imported)
+each process writes its samples to memory-mapped files in that directory instead,
+and ``get_registry()`` aggregates the files of all workers at scrape time.
+"""
+
+import os
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram
+from prometheus_client.multiprocess import MultiProcessCollector
+
+http_requests_total = Counter(
+    "http_requests_total", "Total HTTP requests", ["method", "endpoint", "status"]
+)
+
+http_request_duration_seconds = Histogram(
+    "http_request_duration_seconds", "HTTP request duration in seconds", ["method", "endpoint"]
+)
+
+http_response_size_bytes = Histogram(
+    "http_response_size_bytes",
+    "HTTP response body size in bytes (streaming responses are not observed)",
+    ["method", "endpoint"],
+    buckets=(100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000),
+)
+
+http_requests_in_progress = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests currently being processed",
+    # Summed over live workers; files of dead workers are removed by child_exit.
+    multiprocess_mode="livesum",
+)
+
+http_request_db_queries = Histogram(
+    "http_request_db_queries",
+    "Database queries executed per HTTP request",
+    ["method", "endpoint"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+
+http_request_db_duration_seconds = Histogram(
+    "http_request_db_duration_seconds",
+    "Cumulative database time per HTTP request in seconds",
+    ["method", "endpoint"],
+)
+
+api_list_cache_requests_total = Counter(
+    "api_list_cache_requests_total",
+    "List responses by cache result (hit, stale, revalidate, miss)",
+    ["resource", "result"],
+)
+
+api_object_cache_requests_total = Counter(
+    "api_object_cache_requests_total",
+    "Object cache lookups by the tier that answered (local, shared) or miss",
+    ["model", "result"],
+)
+
+api_object_cache_evictions_total = Counter(
+    "api_object_cache_evictions_total",
+    "Objects evicted from the per-process LRU tier because it was full",
+    ["model"],
+)
+
+api_coalesced_requests_total = Counter(
+    "api_coalesced_requests_total",
+    "Requests served by an identical in-flight computation instead of their own",
+    # cache: "list" or the object cache's model; scope: "process" or "shared" (other worker)
+    ["cache", "scope"],
+)
+
+_multiprocess_registry = None
+
+
+def get_registry():
+    """Return the registry to expose: all workers' files in multiprocess mode."""
+    global _multiprocess_registry
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        return REGISTRY
+    if _multiprocess_registry is None:
+        # The collector re-reads the directory on every collect(), so it is built once.
+        registry = CollectorRegistry()
+        MultiProcessCollector(registry)
+        _multiprocess_registry = registry
+    return _multiprocess_registry
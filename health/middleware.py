@@ -0,0 +1,117 @@
+"""
+Request instrumentation middleware.
+"""
+
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+from .instrumentation import RequestTimings, current_timings, record_query, timing_scope
+from .metrics import (
+    http_request_db_duration_seconds,
+    http_request_db_queries,
+    http_request_duration_seconds,
+    http_requests_in_progress,
+    http_requests_total,
+    http_response_size_bytes,
+)
+from .routes import get_endpoint, get_method
+
+
+class PrometheusMiddleware:
+    """
+    Record request count, latency, response size and in-flight requests.
+
+    Requests are labelled by the resolved route template rather than the raw path so
+    the number of time series stays bounded. Place it first in ``MIDDLEWARE`` so the
+    measured latency covers the other middleware too.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        # ``labels()`` validates and locks on every call; the label combinations are
+        # bounded (routes x methods x statuses), so the children are cached here.
+        self._series = {}
+        self._counters = {}
+
+    def __call__(self, request):
+        http_requests_in_progress.inc()
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            http_requests_in_progress.dec()
+        duration = time.perf_counter() - start
+
+        method = get_method(request)
+        endpoint = get_endpoint(request)
+        status = response.status_code
+        counter = self._counters.get((method, endpoint, status))
+        if counter is None:
+            counter = http_requests_total.labels(method, endpoint, status)
+            self._counters[method, endpoint, status] = counter
+        series = self._series.get((method, endpoint))
+        if series is None:
+            series = (
+                http_request_duration_seconds.labels(method, endpoint),
+                http_response_size_bytes.labels(method, endpoint),
+            )
+            self._series[method, endpoint] = series
+
+        counter.inc()
+        series[0].observe(duration)
+        if not response.streaming:
+            series[1].observe(len(response.content))
+        return response
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Measure database work and response phases of each request.
+
+    Every query on every configured connection is counted and timed through
+    ``connection.execute_wrapper``; the totals are observed in Prometheus histograms
+    and returned, with the ``serialize`` and ``render`` phases, in a ``Server-Timing``
+    header. Queries slower than ``SLOW_QUERY_THRESHOLD_MS`` are logged with their
+    route.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.slow_query_seconds = settings.SLOW_QUERY_THRESHOLD_MS / 1000
+        self._series = {}
+
+    def __call__(self, request):
+        timings = RequestTimings(request, self.slow_query_seconds)
+        with ExitStack() as stack:
+            stack.enter_context(timing_scope(timings))
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(record_query))
+            response = self.get_response(request)
+
+        method = get_method(request)
+        endpoint = get_endpoint(request)
+        series = self._series.get((method, endpoint))
+        if series is None:
+            series = (
+                http_request_db_queries.labels(method, endpoint),
+                http_request_db_duration_seconds.labels(method, endpoint),
+            )
+            self._series[method, endpoint] = series
+        series[0].observe(timings.queries)
+        series[1].observe(timings.db)
+        response["Server-Timing"] = timings.server_timing()
+        return response
+
+    def process_template_response(self, request, response):
+        # Listed before other template-response middleware, this hook runs last, right
+        # before the handler renders the response.
+        timings = current_timings()
+        if timings is not None:
+            start = time.perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: timings.add_phase("render", time.perf_counter() - start)
+            )
+        return response
@@ -0,0 +1,41 @@
+"""
+Bounded-cardinality labels for requests.
+"""
+
+import re
+from functools import lru_cache
+
+# Label for requests that did not resolve to a URL pattern (404s, e.g. scanners).
+UNMATCHED = "<unmatched>"
+
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
+_NAMED_GROUP = re.compile(r"\(\?P<(\w+)>[^)]*\)")
+
+
+@lru_cache(maxsize=512)
+def normalize_route(route):
+    """
+    Turn a resolver route into a readable template.
+
+    DRF routers register regex patterns, so ``api/v1/persons/(?P<pk>[^/.]+)/$``
+    becomes ``/api/v1/persons/<pk>/`` like the ``path()`` routes.
+    """
+    route = _NAMED_GROUP.sub(r"<\1>", route)
+    route = route.replace("^", "").replace("$", "").replace("\\", "")
+    if route.endswith("/?"):
+        route = route[:-2]
+    return "/" + route
+
+
+def get_endpoint(request):
+    """Return the route template label for ``request``."""
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return UNMATCHED
+    return normalize_route(match.route)
+
+
+def get_method(request):
+    """Return the method label for ``request``; unusual methods share one label."""
+    return request.method if request.method in KNOWN_METHODS else "other"
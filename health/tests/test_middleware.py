@@ -0,0 +1,109 @@
+"""
+Tests for the Prometheus request middleware.
+"""
+
+import pytest
+from django.test import Client
+from prometheus_client import REGISTRY
+
+from api.models import Person
+from health.routes import normalize_route
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.django_db
+class TestPrometheusMiddleware:
+    """Tests for request instrumentation."""
+
+    def test_counts_requests_by_route_template(self):
+        """Test that detail requests share one series labelled by the route template."""
+        person = Person.objects.create(first_name="John", last_name="Doe", email="j@example.com")
+        labels = {"method": "GET", "endpoint": "/api/v1/persons/<pk>/", "status": "200"}
+        before = sample("http_requests_total", **labels)
+
+        client = Client()
+        client.get(f"/api/v1/persons/{person.id}/")
+        client.get(f"/api/v1/persons/{person.id}/")
+
+        assert sample("http_requests_total", **labels) == before + 2
+
+    def test_records_duration_and_size(self):
+        """Test that latency and response size are observed."""
+        labels = {"method": "GET", "endpoint": "/healthz/"}
+        duration_before = sample("http_request_duration_seconds_count", **labels)
+        size_before = sample("http_response_size_bytes_sum", **labels)
+
+        response = Client().get("/healthz/")
+
+        assert sample("http_request_duration_seconds_count", **labels) == duration_before + 1
+        assert sample("http_response_size_bytes_sum", **labels) == size_before + len(
+            response.content
+        )
+
+    def test_unmatched_paths_share_one_label(self):
+        """Test that unresolved paths do not create a series per path."""
+        labels = {"method": "GET", "endpoint": "<unmatched>", "status": "404"}
+        before = sample("http_requests_total", **labels)
+
+        client = Client()
+        client.get("/does-not-exist/")
+        client.get("/wp-login.php")
+
+        assert sample("http_requests_total", **labels) == before + 2
+
+    def test_in_progress_gauge_returns_to_zero(self):
+        """Test that the in-flight gauge is decremented after the response."""
+        Client().get("/healthz/")
+        assert sample("http_requests_in_progress") == 0
+
+    def test_normalize_route(self):
+        """Test conversion of router regexes into route templates."""
+        assert normalize_route("api/v1/persons/$") == "/api/v1/persons/"
+        assert normalize_route("api/v1/persons/(?P<pk>[^/.]+)/$") == "/api/v1/persons/<pk>/"
+        assert (
+            normalize_route("api/v1/persons\\.(?P<format>[a-z0-9]+)/?$")
+            == "/api/v1/persons.<format>"
+        )
+        assert normalize_route("healthz/") == "/healthz/"
+
+
+@pytest.mark.django_db
+class TestQueryInstrumentationMiddleware:
+    """Tests for per-request query instrumentation."""
+
+    def test_server_timing_header(self):
+        """Test that list responses report db, serialize and render phases."""
+        Person.objects.create(first_name="John", last_name="Doe", email="j@example.com")
+
+        response = Client().get("/api/v1/persons/")
+
+        timing = response["Server-Timing"]
+        assert timing.startswith("db;dur=")
+        assert "serialize;dur=" in timing
+        assert "render;dur=" in timing
+
+    def test_records_query_count(self):
+        """Test that the number of queries of a request is observed."""
+        person = Person.objects.create(first_name="John", last_name="Doe", email="j@example.com")
+        labels = {"method": "GET", "endpoint": "/api/v1/persons/<pk>/"}
+        count_before = sample("http_request_db_queries_count", **labels)
+        sum_before = sample("http_request_db_queries_sum", **labels)
+
+        response = Client().get(f"/api/v1/persons/{person.id}/")
+
+        assert sample("http_request_db_queries_count", **labels) == count_before + 1
+        assert sample("http_request_db_queries_sum", **labels) == sum_before + 1
+        assert 'desc="1 queries"' in response["Server-Timing"]
+
+    def test_logs_slow_queries_with_route(self, settings, caplog):
+        """Test that queries over the threshold are logged with their route."""
+        settings.SLOW_QUERY_THRESHOLD_MS = 0
+
+        with caplog.at_level("WARNING", logger="health.instrumentation"):
+            Client().get("/api/v1/persons/?email=john")
+
+        messages = [record.getMessage() for record in caplog.records]
+        assert any("route=/api/v1/persons/" in message for message in messages)
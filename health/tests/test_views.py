@@ -35,3 +35,56 @@ class TestHealthViews:
         assert response.status_code == 200
         assert "text/plain" in response["Content-Type"]
         assert b"http_requests_total" in response.content
+
+
+@pytest.fixture
+def multiproc_dir(tmp_path, monkeypatch):
+    """Enable prometheus_client multiprocess mode on a temporary directory."""
+    from health import metrics
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    monkeypatch.setattr(metrics, "_multiprocess_registry", None)
+    return tmp_path
+
+
+def write_worker_sample(pid, typ, name, value, mode=""):
+    """Write one sample the way a gunicorn worker with ``pid`` would."""
+    from prometheus_client.values import MultiProcessValue
+
+    value_class = MultiProcessValue(process_identifier=lambda: pid)
+    sample = value_class(typ, name, name, (), (), "", multiprocess_mode=mode)
+    if typ == "gauge":
+        sample.set(value)
+    else:
+        sample.inc(value)
+
+
+@pytest.mark.django_db
+class TestMultiprocessMetrics:
+    """Tests for metrics aggregated across gunicorn workers."""
+
+    def test_metrics_sums_all_workers(self, multiproc_dir):
+        """Test that /metrics reports totals over every worker's files."""
+        write_worker_sample(101, "counter", "bench_jobs_total", 2)
+        write_worker_sample(102, "counter", "bench_jobs_total", 3)
+
+        response = Client().get("/metrics/")
+
+        assert response.status_code == 200
+        assert b"bench_jobs_total 5.0" in response.content
+
+    def test_child_exit_removes_live_gauges(self, multiproc_dir):
+        """Test that the gunicorn child_exit hook drops a dead worker's live gauges."""
+        import runpy
+        from types import SimpleNamespace
+
+        from django.conf import settings
+
+        write_worker_sample(101, "gauge", "bench_in_progress", 1, mode="livesum")
+        write_worker_sample(102, "gauge", "bench_in_progress", 1, mode="livesum")
+        config = runpy.run_path(str(settings.BASE_DIR / "gunicorn.conf.py"))
+
+        config["child_exit"](None, SimpleNamespace(pid=101))
+
+        response = Client().get("/metrics/")
+        assert b"bench_in_progress 1.0" in response.content
@@ -7,18 +7,12 @@ import logging
 from django.db import connection
 from django.http import HttpResponse, JsonResponse
 from django.views.decorators.http import require_http_methods
-from prometheus_client import CONTENT_TYPE_LATEST, Counter, Histogram, generate_latest
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 
-logger = logging.getLogger(__name__)
-
-# Prometheus metrics
-http_requests_total = Counter(
-    "http_requests_total", "Total HTTP requests", ["method", "endpoint", "status"]
-)
+# Metric definitions live in health.metrics; re-exported for existing imports.
+from .metrics import get_registry, http_request_duration_seconds, http_requests_total  # noqa: F401
 
-http_request_duration_seconds = Histogram(
-    "http_request_duration_seconds", "HTTP request duration in seconds", ["method", "endpoint"]
-)
+logger = logging.getLogger(__name__)
 
 
 @require_http_methods(["GET"])
@@ -52,7 +46,7 @@ def readyz(request):
 @require_http_methods(["GET"])
 def metrics(request):
     """
-    Prometheus metrics endpoint.
+    Prometheus metrics endpoint, aggregated across gunicorn workers in multiprocess mode.
     GET /metrics
     """
-    return HttpResponse(generate_latest(), content_type=CONTENT_TYPE_LATEST)
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)